@@ -0,0 +1,77 @@
+"""
+Time of the corpus analytics over a synthetic corpus of n pieces, on the
+columns of a PuzzleArray, against the same counts gathered from Tangram
+objects. The exact bounding boxes are checked against the piece vertices on
+a sample of the figures. Run from the repository root:
+
+    python benchmarks/bench_analytics.py [n_pieces] [seed]
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import islice
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.analyser import CorpusAnalytics
+from tangram.generator import write_corpus
+from tangram.parser import iter_environments
+
+# Figures the bounding boxes are checked on, working them out from vertices is slow
+SAMPLE = 2000
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(n_pieces: int = 1_000_000, seed: int = 0):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'corpus.tex'
+        n_pieces = write_corpus(path, n_pieces // 7, seed=seed)
+
+        stats, elapsed = timed(lambda: CorpusAnalytics.from_source(path))
+        print(f'{n_pieces} pieces in {stats.table.n_puzzles} figures, columns {stats.table.nbytes / 2**20:.1f} MiB')
+        print(f'{"parse to columns":22} {elapsed:8.3f} s')
+        for name in ['group_by', 'rotation_histogram', 'flip_rates', 'measures', 'puzzle_areas', 'bounding_boxes']:
+            _, elapsed = timed(getattr(stats, name))
+            print(f'{name:22} {elapsed * 1e3:8.1f} ms')
+
+        def from_objects():
+            groups = Counter()
+            for tangrams in iter_environments(path):
+                for gram in tangrams:
+                    groups[(gram.tangram_type, gram.rotate, gram.xflip, gram.yflip)] += 1
+            return groups
+        groups, elapsed = timed(from_objects)
+        print(f'{"group_by on Tangrams":22} {elapsed:8.3f} s (including the parse)')
+        assert groups == Counter(stats.group_by()), 'grouped counts differ'
+
+        boxes = Counter()
+        for tangrams in islice(iter_environments(path), SAMPLE):
+            xs = [x for gram in tangrams for x, _ in gram.vertices]
+            ys = [y for gram in tangrams for _, y in gram.vertices]
+            boxes[(max(xs) - min(xs), max(ys) - min(ys))] += 1
+        sample = CorpusAnalytics.from_source(_head(path, SAMPLE)).bounding_boxes()
+        assert boxes == Counter(sample), 'bounding boxes differ'
+
+
+def _head(path: Path, n_puzzles: int) -> Path:
+    """A copy of the first n_puzzles environments of a corpus"""
+    head = path.with_name('head.tex')
+    with open(path) as source, open(head, 'w') as file:
+        for line in source:
+            file.write(line)
+            if line.startswith('\\end{EnvTangramTikz}'):
+                n_puzzles -= 1
+                if not n_puzzles:
+                    break
+    return head
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,41 @@
+"""
+Speedup of TangramBatch over a directory of puzzle files for 1..N worker
+processes. Run from the repository root:
+
+    python benchmarks/bench_batch.py [n_files] [max_jobs]
+"""
+from pathlib import Path
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.batch import TangramBatch
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def main(n_files: int = 600, max_jobs: int = None):
+    max_jobs = max_jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        for idx in range(n_files):
+            shutil.copy(Path.cwd() / 'examples' / f'{EXAMPLES[idx % len(EXAMPLES)]}.tex',
+                        Path(directory) / f'puzzle_{idx:06}.tex')
+
+        baseline = None
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            results = TangramBatch(directory, jobs=jobs).run()
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in results)
+            baseline = baseline or elapsed
+            print(f'jobs {jobs:3}: {elapsed:7.2f} s  {n_files / elapsed:8.1f} files/s  speedup {baseline / elapsed:5.2f}x')
+            jobs *= 2
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
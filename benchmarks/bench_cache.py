@@ -0,0 +1,60 @@
+"""
+Load time of a corpus of distinct puzzle files through TangramPuzzle with
+the parse cache bypassed, with an empty cache (parse and store) and with
+a warm cache. Run from the repository root:
+
+    python benchmarks/bench_cache.py [n_files]
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.cache import ParseCache
+from tangram.TangramPuzzle import TangramPuzzle
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def build_corpus(directory: Path, n_files: int) -> list[Path]:
+    """Copies of the examples, each with its own comment so every file hashes differently"""
+    examples = [(Path.cwd() / 'examples' / f'{name}.tex').read_text() for name in EXAMPLES]
+    paths = []
+    for idx in range(n_files):
+        path = directory / f'puzzle_{idx:06}.tex'
+        path.write_text(f'% puzzle {idx}\n' + examples[idx % len(examples)])
+        paths.append(path)
+    return paths
+
+
+def load_all(paths: list[Path], cache) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        for gram in TangramPuzzle(str(path), cache=cache).tangrams:
+            gram.vertices
+    return time.perf_counter() - start
+
+
+def main(n_files: int = 10000):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = build_corpus(Path(directory), n_files)
+        cache = ParseCache(Path(directory) / 'cache')
+
+        uncached = load_all(paths, cache=False)
+        cold = load_all(paths, cache=cache)
+        warm = load_all(paths, cache=cache)
+        assert cache.hits == n_files and cache.misses == n_files
+
+        expected = TangramPuzzle(str(paths[0]), cache=False)
+        assert str(TangramPuzzle(str(paths[0]), cache=cache)) == str(expected)
+
+        print(f'{n_files} files, cache {cache.size / 2**20:.1f} MiB')
+        print(f'no cache: {uncached:7.2f} s  {n_files / uncached:8.0f} files/s')
+        print(f'cold:     {cold:7.2f} s  {n_files / cold:8.0f} files/s')
+        print(f'warm:     {warm:7.2f} s  {n_files / warm:8.0f} files/s  ({uncached / warm:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
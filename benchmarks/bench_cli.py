@@ -0,0 +1,48 @@
+"""
+Time per puzzle of running the command line tool once per puzzle, against
+sending the same requests to one serve process over its stdin. Run from the
+repository root:
+
+    python benchmarks/bench_cli.py [n_requests]
+"""
+from pathlib import Path
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+COMMANDS = ['transforms', 'vertices', 'pieces', 'outline', 'validate']
+
+
+def requests(n_requests: int) -> list[dict]:
+    return [{'id': idx, 'command': COMMANDS[idx % len(COMMANDS)],
+             'path': str(ROOT / 'examples' / f'{EXAMPLES[idx % len(EXAMPLES)]}.tex')} for idx in range(n_requests)]
+
+
+def main(n_requests: int = 50):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    command = [sys.executable, '-m', 'tangram']
+
+    start = time.perf_counter()
+    one_shot = [subprocess.run(command + [request['command'], request['path']], env=env,
+                               capture_output=True, text=True).stdout.rstrip('\n')
+                for request in requests(n_requests)]
+    per_process = (time.perf_counter() - start) / n_requests
+
+    lines = ''.join(json.dumps(request) + '\n' for request in requests(n_requests))
+    start = time.perf_counter()
+    served = subprocess.run(command + ['serve'], env=env, input=lines, capture_output=True, text=True, check=True)
+    per_request = (time.perf_counter() - start) / n_requests
+
+    responses = [json.loads(line) for line in served.stdout.splitlines()]
+    assert [response['output'] for response in responses] == one_shot, 'serve and one shot outputs differ'
+    print(f'process per puzzle  {per_process * 1e3:8.2f} ms/puzzle')
+    print(f'serve               {per_request * 1e3:8.2f} ms/puzzle (including its startup)  '
+          f'{per_process / per_request:6.1f}x faster')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
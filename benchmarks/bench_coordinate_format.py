@@ -0,0 +1,47 @@
+"""
+Number.coordinate_format through the cache and the whole/half coefficient
+fast path against the original __repr__ based formatting, over the
+coordinates of the examples and over random coefficients, checking the
+strings are identical. Run from the repository root:
+
+    python benchmarks/bench_coordinate_format.py [repeat]
+"""
+from pathlib import Path
+from fractions import Fraction
+import random
+import sys
+import timeit
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.document import TangramPieces
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils.coords import Number, _COORDINATE_FORMATS
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def main(repeat: int = 200):
+    puzzles = [TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex') for name in EXAMPLES]
+    values = [value for puzzle in puzzles for gram in puzzle.tangrams for point in gram.vertices for value in point]
+    rng = random.Random(0)
+    values += [Number(Fraction(rng.randint(-40, 40), rng.choice([1, 2, 4, 8])),
+                      Fraction(rng.randint(-40, 40), rng.choice([1, 2, 4, 8]))) for _ in range(1000)]
+    assert all(value.coordinate_format() == value._coordinate_format() for value in values)
+
+    original = timeit.timeit(lambda: [value._coordinate_format() for value in values], number=repeat)
+    _COORDINATE_FORMATS.clear()
+    cold = timeit.timeit(lambda: [value.coordinate_format() for value in values], number=1)
+    cached = timeit.timeit(lambda: [value.coordinate_format() for value in values], number=repeat)
+    n = len(values)
+    print(f'{n} coordinates, {len(_COORDINATE_FORMATS)} distinct')
+    print(f'original: {original / repeat / n * 1e6:7.3f} us  first call: {cold / n * 1e6:7.3f} us  '
+          f'cached: {cached / repeat / n * 1e6:7.3f} us  ({original / cached:.0f}x)')
+
+    documents = [TangramPieces(puzzle.grid_size, puzzle.sorted_tangrams) for puzzle in puzzles]
+    elapsed = timeit.timeit(lambda: [document.generate_content() for document in documents], number=repeat)
+    print(f'pieces documents: {elapsed / repeat / len(documents) * 1e3:.3f} ms each')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
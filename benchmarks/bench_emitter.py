@@ -0,0 +1,79 @@
+"""
+Peak RSS and throughput of writing a pieces document of n pieces by building
+the whole string with generate_content then FileHandler.write_tex, against
+streaming it with TangramPieces.write. Each way runs in its own process so
+the peaks don't mix. Run from the repository root:
+
+    python benchmarks/bench_emitter.py [n_pieces]
+"""
+from pathlib import Path
+import hashlib
+import itertools
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.document import TangramPieces
+from tangram.fileHandler import FileHandler
+from tangram.TangramPuzzle import TangramPuzzle
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def pieces(n_pieces: int):
+    """The example pieces over and over, made lazily so they take no memory themselves"""
+    tangrams = [gram for name in EXAMPLES for gram in TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex').sorted_tangrams]
+    return itertools.islice(itertools.cycle(tangrams), n_pieces)
+
+
+def peak_rss() -> int:
+    """Bytes, from VmHWM where there is one since ru_maxrss can carry over the parent's peak across exec"""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(mode: str, n_pieces: int, path: str):
+    document = TangramPieces(((-10, -10), (10, 10)), pieces(n_pieces))
+    before = peak_rss()
+    start = time.perf_counter()
+    if mode == 'string':
+        FileHandler.write_tex(content=document.generate_content(), filename=path)
+    else:
+        document.write(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'elapsed': elapsed, 'baseline': before, 'peak': peak_rss()}))
+
+
+def main(n_pieces: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        digests = {}
+        for mode in ('string', 'stream'):
+            path = Path(directory) / f'{mode}.tex'
+            run = subprocess.run([sys.executable, __file__, 'child', mode, str(n_pieces), str(path)],
+                                 capture_output=True, text=True, check=True)
+            result = json.loads(run.stdout)
+            with open(path, 'rb') as file:
+                digests[mode] = hashlib.file_digest(file, 'sha256').hexdigest()
+            size = path.stat().st_size
+            print(f'{mode:6}  {result["elapsed"]:6.2f} s  {n_pieces / result["elapsed"]:8.0f} pieces/s  '
+                  f'peak RSS {result["peak"] / 2**20:7.1f} MiB ({(result["peak"] - result["baseline"]) / 2**20:+7.1f} MiB)  '
+                  f'{size / 2**20:.1f} MiB written')
+        assert digests['string'] == digests['stream'], 'outputs differ'
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['child']:
+        child(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""
+Fingerprints per second of the examples, and duplicate detection over a
+corpus of copies moved by a random symmetry and translation.
+Run from the repository root:
+
+    python benchmarks/bench_fingerprint.py [copies]
+"""
+from pathlib import Path
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.fingerprint import SYMMETRIES, FingerprintIndex, fingerprint, transform
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def moved(tangrams, symmetry, dx, dy):
+    """Copies of the pieces under the symmetry then shifted by (dx, dy)"""
+    return [SimpleNamespace(tangram_type=gram.tangram_type,
+                            vertices=tuple((x + dx, y + dy) for x, y in transform(gram.vertices, symmetry)))
+            for gram in tangrams]
+
+
+def main(copies: int = 2000):
+    puzzles = [TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex') for name in EXAMPLES]
+    rng = random.Random(0)
+    corpus = [moved(puzzles[idx % len(puzzles)].tangrams, rng.choice(SYMMETRIES), rng.randint(-9, 9), rng.randint(-9, 9))
+              for idx in range(copies)]
+
+    for by in ('pieces', 'outline'):
+        index = FingerprintIndex()
+        start = time.perf_counter()
+        duplicates = sum(index.add(fingerprint(tangrams, by), idx) is not None for idx, tangrams in enumerate(corpus))
+        elapsed = time.perf_counter() - start
+        assert len(index) == len(puzzles) and duplicates == copies - len(puzzles)
+        print(f'{by:8} {copies / elapsed:8.0f} puzzles/s  {len(index)} distinct, {duplicates} duplicates')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
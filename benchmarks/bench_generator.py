@@ -0,0 +1,54 @@
+"""
+Throughput and peak memory of streaming a synthetic corpus to disk with
+write_corpus, for growing corpus sizes, checking the output parses back into
+valid figures and that the adversarial documents parse to the pieces they
+were made from. Run from the repository root:
+
+    python benchmarks/bench_generator.py [max_pieces] [seed]
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.generator import adversarial_documents, write_corpus
+from tangram.parser import LatexTangramParser, iter_environments
+from tangram.validator import validate
+
+
+def same_pieces(first, second) -> bool:
+    return sorted(sorted(gram.vertices) for gram in first) == sorted(sorted(gram.vertices) for gram in second)
+
+
+def main(max_pieces: int = 1_000_000, seed: int = 0):
+    for kind, text, tangrams in adversarial_documents(seed):
+        assert same_pieces(LatexTangramParser(text).parse(), tangrams), f'{kind}: parsed pieces differ'
+    print('adversarial documents parse correctly')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'corpus.tex'
+        n_puzzles = 1000
+        while n_puzzles * 7 <= max_pieces:
+            tracemalloc.start()
+            start = time.perf_counter()
+            n_pieces = write_corpus(path, n_puzzles, seed=seed, per_document=1000)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = path.stat().st_size
+            print(f'{n_pieces:9} pieces  {elapsed:7.2f} s  {n_pieces / elapsed:8.0f} pieces/s  '
+                  f'{size / 2**20:7.1f} MiB on disk  peak {peak / 2**20:5.1f} MiB')
+            n_puzzles *= 10
+
+        # Spot check the last corpus: every environment parses into a valid figure
+        for idx, tangrams in enumerate(iter_environments(path)):
+            if idx >= 200:
+                break
+            assert not validate(tangrams), f'environment {idx} is not a valid figure'
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+Cold start time of importing the package, from python -X importtime in fresh
+processes started outside the repository, with the slowest modules of the
+fastest run and a check that numpy and shapely are only loaded when used.
+Run from the repository root:
+
+    python benchmarks/bench_import.py [runs] [top]
+"""
+from pathlib import Path
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULES = ['tangram.TangramPuzzle', 'tangram.batch', 'tangram.analyser']
+# Dependencies only some features need, none of them should come in with a plain import
+LAZY = ['numpy', 'shapely', 'multiprocessing', 'concurrent.futures']
+
+
+def import_times(module: str, directory: str) -> tuple[dict[str, tuple[int, int]], list[str]]:
+    """{module: (self us, cumulative us)} of one cold import, and the lazy modules it loaded anyway"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE='1')
+    check = f'import sys, {module}; print(",".join(name for name in {LAZY!r} if name in sys.modules))'
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], cwd=directory, env=env,
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times, [name for name in process.stdout.strip().split(',') if name]
+
+
+def main(runs: int = 10, top: int = 8):
+    # Outside the repository, so nothing is found through the working directory
+    with tempfile.TemporaryDirectory() as directory:
+        for module in MODULES:
+            results = [import_times(module, directory) for _ in range(runs)]
+            times, loaded = min(results, key=lambda result: result[0][module][1])
+            totals = sorted(result[0][module][1] for result in results)
+            print(f'{module}: min {totals[0] / 1e3:6.1f} ms  median {totals[len(totals) // 2] / 1e3:6.1f} ms '
+                  f'over {runs} runs')
+            for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][0])[:top]:
+                print(f'    {name:40} self {own / 1e3:6.2f} ms  cumulative {cumulative / 1e3:6.2f} ms')
+            assert not loaded, f'{module} imports {", ".join(loaded)} eagerly'
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
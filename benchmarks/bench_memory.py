@@ -0,0 +1,72 @@
+"""
+Memory per piece of a corpus held as Tangram objects (with their vertices,
+as a TangramPuzzle needs them) against the same corpus in a PuzzleArray.
+Run from the repository root:
+
+    python benchmarks/bench_memory.py [copies]
+"""
+from pathlib import Path
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.puzzle_array import PuzzleArray
+from tangram.parser import iter_environments
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def build_corpus(path: Path, copies: int):
+    """Concatenate the examples into one file, one environment per copy"""
+    examples = [(Path.cwd() / 'examples' / f'{name}.tex').read_text() for name in EXAMPLES]
+    with open(path, 'w') as file:
+        for idx in range(copies):
+            file.write(examples[idx % len(examples)])
+            file.write('\n')
+
+
+def measure(func):
+    """Result of func, the memory it still holds afterwards and the time it took"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def load_tangrams(path: Path):
+    puzzles = list(iter_environments(path))
+    for tangrams in puzzles:
+        for gram in tangrams:
+            gram.vertices
+    return puzzles
+
+
+def main(copies: int = 15000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'corpus.tex'
+        build_corpus(path, copies)
+
+        puzzles, tangram_bytes, tangram_time = measure(lambda: load_tangrams(path))
+        n_pieces = sum(len(tangrams) for tangrams in puzzles)
+        del puzzles
+
+        array, array_bytes, array_time = measure(lambda: PuzzleArray.from_source(path))
+        assert len(array) == n_pieces
+
+    print(f'{n_pieces} pieces in {array.n_puzzles} puzzles')
+    print(f'Tangram:     {tangram_bytes / 2**20:8.1f} MiB  {tangram_bytes / n_pieces:8.0f} B/piece  {tangram_time:6.2f} s')
+    print(f'PuzzleArray: {array_bytes / 2**20:8.1f} MiB  {array_bytes / n_pieces:8.0f} B/piece  {array_time:6.2f} s  '
+          f'(columns {array.nbytes / n_pieces:.0f} B/piece, {tangram_bytes / array_bytes:.0f}x smaller)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
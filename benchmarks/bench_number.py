@@ -0,0 +1,94 @@
+"""
+Micro-benchmark of the exact Q(√2) Number against the float backed Number
+it replaced. Run from the repository root:
+
+    python benchmarks/bench_number.py
+"""
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.utils.coords import Number, find_boundary_edges
+
+
+class LegacyNumber:
+    """The float backed Number, kept only as the benchmark reference"""
+    def __init__(self, rational: float = 0, irrational: float = 0):
+        self.rational = float(rational)
+        self.irrational = float(irrational)
+
+    def __eq__(self, other):
+        return self.__float__() == other.__float__()
+
+    def __lt__(self, other):
+        return self.__float__() < other.__float__()
+
+    def __neg__(self):
+        return LegacyNumber(-self.rational, -self.irrational)
+
+    def __add__(self, other):
+        if isinstance(other, (int, float)):
+            return LegacyNumber(self.rational + other, self.irrational)
+        return LegacyNumber(self.rational + other.rational, self.irrational + other.irrational)
+
+    def __sub__(self, other):
+        if isinstance(other, (int, float)):
+            return LegacyNumber(self.rational - other, self.irrational)
+        return LegacyNumber(self.rational - other.rational, self.irrational - other.irrational)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return LegacyNumber(self.rational * other, self.irrational * other)
+        return LegacyNumber(
+            self.rational * other.rational + 2 * self.irrational * other.irrational,
+            self.rational * other.irrational + self.irrational * other.rational
+        )
+
+    def __float__(self):
+        return float(self.rational) + float(self.irrational * pow(2, 0.5))
+
+    def __hash__(self):
+        return hash(self.__float__())
+
+
+SHAPE = [(0, 0), (2, 0), (2, 2)]
+ROTATIONS = [((1, 0), (0, 0)), ((0, 1/2), (0, 1/2)), ((0, 0), (1, 0)), ((0, -1/2), (0, 1/2))]
+OFFSETS = [((2, 0), (-1, -1/2)), ((-1/2, 0), (-2, -1/2)), ((1, -1/2), (-1, -1/2))]
+
+
+def transform_workload(num_type, repeat: int = 200):
+    """Rotate and translate a piece the same way Tangram._find_verticies does"""
+    shape = [(num_type(x), num_type(y)) for x, y in SHAPE]
+    rotations = [(num_type(*c), num_type(*s)) for c, s in ROTATIONS]
+    offsets = [(num_type(*x), num_type(*y)) for x, y in OFFSETS]
+    polygons = []
+    for _ in range(repeat):
+        for cos_theta, sin_theta in rotations:
+            for dx, dy in offsets:
+                polygons.append([(x * cos_theta - y * sin_theta + dx, x * sin_theta + y * cos_theta + dy)
+                                 for x, y in shape])
+    return polygons
+
+
+def dedup_workload(polygons):
+    """Hash every vertex, as the boundary-edge dedup does"""
+    return len({vertex for poly in polygons for vertex in poly})
+
+
+def main(number: int = 5):
+    for name, num_type in (('legacy', LegacyNumber), ('exact', Number)):
+        polygons = transform_workload(num_type)
+        transform = min(timeit.repeat(lambda: transform_workload(num_type), number=1, repeat=number))
+        dedup = min(timeit.repeat(lambda: dedup_workload(polygons), number=1, repeat=number))
+        print(f'{name:8} transform: {transform * 1e3:8.2f} ms   '
+              f'dedup: {dedup * 1e3:8.2f} ms   unique vertices: {dedup_workload(polygons)}')
+
+    # The exact type dedups without any tolerance
+    polygons = transform_workload(Number, repeat=1)
+    print(f'exact boundary edges: {len(find_boundary_edges(polygons))}')
+
+
+if __name__ == '__main__':
+    main()
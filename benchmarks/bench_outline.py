@@ -0,0 +1,97 @@
+"""
+Compares the exact outline engine in utils/boundary with the shapely
+unary_union path, checking both give the same outline on every example,
+then times step by step outlines of a growing figure with OutlineBuilder
+against re-running outline() at every step. Run from the repository root:
+
+    python benchmarks/bench_outline.py [repeat] [steps]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.tangram import Tangram, TangramType
+from tangram.parser import iter_tangrams
+from tangram.utils.boundary import OutlineBuilder, outline, remove_collinear
+from tangram.utils.coords import Number
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def shapely_outline(polygons):
+    """Float vertices of the shapely union, one exterior per part"""
+    from shapely.geometry import Polygon
+    from shapely.ops import unary_union
+
+    merged = unary_union([Polygon([(float(x), float(y)) for x, y in p]) for p in polygons])
+    parts = getattr(merged, 'geoms', [merged])
+    return [list(part.exterior.coords)[:-1] for part in parts]
+
+
+def same_vertices(exact, parts, digits: int = 9) -> bool:
+    """Shapely splits shapes touching at a corner into parts, so compare the vertex sets"""
+    ours = {(round(float(x), digits), round(float(y), digits)) for x, y in exact}
+    theirs = {(round(x, digits), round(y, digits)) for part in parts for x, y in remove_collinear(part)}
+    return ours == theirs
+
+
+def timed(func, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def triangle_strip(n_pieces: int):
+    """Large triangles pairing up into a row of squares, so the outline keeps growing"""
+    polygons = []
+    for idx in range(n_pieces):
+        square, upper = divmod(idx, 2)
+        rotate = 180 if upper else 0
+        base = (Number(2 * square + 2 * upper), Number(2 * upper))
+        polygons.append(Tangram(TangramType.TRIANGLE_LARGE, {'rotate': rotate}, base).vertices)
+    return polygons
+
+
+def main(repeat: int = 50, steps: int = 140):
+    # Shapely's import is part of the cost it adds to a short run
+    start = time.perf_counter()
+    import shapely.ops
+    print(f'shapely import: {(time.perf_counter() - start) * 1e3:.1f} ms')
+
+    for name in EXAMPLES:
+        polygons = [t.vertices for t in iter_tangrams(Path.cwd() / 'examples' / f'{name}.tex')]
+        exact, exact_time = timed(lambda: outline(polygons), repeat)
+        parts, shapely_time = timed(lambda: shapely_outline(polygons), repeat)
+        assert same_vertices(exact, parts), f'{name}: outlines differ'
+        print(f'{name:9} exact: {exact_time * 1e3:7.2f} ms  shapely: {shapely_time * 1e3:7.2f} ms  '
+              f'({len(exact)} vertices, shapely parts: {len(parts)})')
+
+    polygons = triangle_strip(steps)
+    start = time.perf_counter()
+    builder = OutlineBuilder()
+    for polygon in polygons:
+        builder.add(polygon)
+    merge_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder = OutlineBuilder()
+    for polygon in polygons:
+        builder.add(polygon)
+        incremental = builder.outline()
+    incremental_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for step in range(1, len(polygons) + 1):
+        rebuilt = outline(polygons[:step])
+    rebuilt_time = time.perf_counter() - start
+    assert incremental == rebuilt, 'incremental outline differs'
+    print(f'{steps} steps  merge only: {merge_time * 1e3:8.1f} ms  '
+          f'merge + outline each step: {incremental_time * 1e3:8.1f} ms  '
+          f're-union each step: {rebuilt_time * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Speedup of the tangram solver split over 1..N worker processes, enumerating
+every solution of a few outlines and finding the first solution of each.
+Run from the repository root:
+
+    python benchmarks/bench_parallel_solver.py [max_jobs]
+"""
+from pathlib import Path
+import os
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.analyser import TangramSolver
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils.coords import Number
+
+SQRT2 = Number(0, 1)
+
+
+def targets() -> dict[str, list]:
+    outlines = {name: TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex', cache=False).outline
+                for name in ('kangaroo', 'cat', 'goose')}
+    outlines['square'] = [(0, 0), (0, 2 * SQRT2), (2 * SQRT2, 2 * SQRT2), (2 * SQRT2, 0)]
+    outlines['diamond'] = [(0, 0), (2, 2), (4, 0), (2, -2)]
+    return outlines
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(max_jobs: int = None):
+    max_jobs = max_jobs or os.cpu_count() or 1
+    outlines = targets()
+    baseline_all = baseline_first = None
+    jobs = 1
+    while jobs <= max_jobs:
+        total_all = total_first = 0.0
+        for target in outlines.values():
+            solutions, elapsed = timed(lambda: list(TangramSolver(target, jobs=jobs).iter_solutions()))
+            assert solutions, 'no solution found'
+            total_all += elapsed
+            solution, elapsed = timed(lambda: TangramSolver(target, jobs=jobs).solve())
+            assert solution is not None
+            total_first += elapsed
+        baseline_all = baseline_all or total_all
+        baseline_first = baseline_first or total_first
+        print(f'jobs {jobs:3}: all solutions {total_all:6.2f} s (speedup {baseline_all / total_all:5.2f}x)  '
+              f'first solution {total_first:6.2f} s (speedup {baseline_first / total_first:5.2f}x)')
+        jobs *= 2
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,119 @@
+"""
+Compares the single-pass LatexTangramParser with the line-by-line parser
+it replaced, on a large file built from examples/*.tex. The end-to-end
+figure (text to Tangram objects) is the one that matters to callers; the
+scan-only figure is the regex sweep alone, the bound for any parser built
+on it. Each is the best of a few runs. Run from the repository root:
+
+    python benchmarks/bench_parser.py [copies] [repeat]
+"""
+from fractions import Fraction
+from pathlib import Path
+import re
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.tangram import Tangram, TangramType
+from tangram.fileHandler import FileHandler
+from tangram.parser import LatexTangramParser, _TOKEN_PATTERN
+from tangram.utils.coords import Number
+
+
+class LegacyParser:
+    """The line-by-line parser, kept only as the benchmark reference"""
+    def __init__(self, raw_text: str):
+        self.lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
+
+    def parse(self) -> list[Tangram]:
+        tangrams = []
+        for line in self.lines:
+            tangram = self._parse_line(line)
+            if tangram is not None:
+                tangrams.append(tangram)
+        return tangrams
+
+    def _parse_line(self, line: str) -> Tangram | None:
+        pattern = re.compile(
+                r'\[TangSol.*'
+                r'(?P<params>(?<=\]<).*(?=>)|(?:(?=\]\()))'
+                    r'.*'
+                r'(?P<coords>'
+                    r'(?P<x>(?<=({)).*)(?=(},))'
+                        r'.*'
+                    r'(?P<y>(?<=(,{)).*)(?=(}\))))'
+                r'.*(?P<type>Tang(?:GrandTri|MoyTri|PetTri|Car|Para))'
+            )
+        line = re.sub(r'\s', '', line)
+        matches = pattern.search(line)
+        if matches is None:
+            return None
+        type_map = {
+            'TangGrandTri': TangramType.TRIANGLE_LARGE,
+            'TangMoyTri': TangramType.TRIANGLE_MEDIUM,
+            'TangPetTri': TangramType.TRIANGLE_SMALL,
+            'TangCar': TangramType.SQUARE,
+            'TangPara': TangramType.PARALLELOGRAM
+        }
+        transform_params = {}
+        if matches.group('params'):
+            for param in matches.group('params').split(','):
+                key, value = param.split('=')
+                transform_params[key.strip()] = int(value.strip())
+        x_coord = Number(*self._parse_coord(matches.group('x')))
+        y_coord = Number(*self._parse_coord(matches.group('y')))
+        return Tangram(tangram_type=type_map[matches.group('type')], transform_params=transform_params,
+                       base_coords=(x_coord, y_coord))
+
+    @staticmethod
+    def _parse_coord(expression: str) -> tuple[Fraction, Fraction]:
+        pattern = re.compile(
+            r'(?P<a_part>^((?P<a_sign>[+-]?)(?P<a>(\d+|\d+\.\d+|\.\d+)))(?=[+-]|$))?'
+            r'(?P<b_part>(?P<b_sign>[+-]?)(?P<b>(\d+|\d+\.\d+|\.\d+)?)\*?sqrt\(2\)$)?'
+        )
+        match = pattern.match(re.sub(r'\s', '', expression))
+        rational, irrational = Fraction(0), Fraction(0)
+        if match.group('a_part'):
+            rational = Fraction(match.group('a')) * (-1 if match.group('a_sign') == '-' else 1)
+        if match.group('b_part'):
+            irrational = Fraction(match.group('b') or 1) * (-1 if match.group('b_sign') == '-' else 1)
+        return (rational, irrational)
+
+
+def build_corpus(copies: int) -> str:
+    """Concatenate the examples into one large document"""
+    examples = [FileHandler.read_file(Path.cwd() / 'examples' / f'{name}.tex')
+                for name in ('kangaroo', 'cat', 'goose')]
+    return '\n'.join(examples[idx % len(examples)] for idx in range(copies))
+
+
+def timed(func, repeat: int = 5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(copies: int = 1500, repeat: int = 5):
+    text = build_corpus(copies)
+
+    legacy, legacy_time = timed(lambda: LegacyParser(text).parse(), repeat)
+    current, current_time = timed(lambda: LatexTangramParser(text).parse(), repeat)
+    tokens, scan_time = timed(lambda: sum(1 for m in _TOKEN_PATTERN.finditer(text) if m.group('type') is not None),
+                              repeat)
+
+    assert [g.vertices for g in legacy] == [g.vertices for g in current], 'parsers disagree'
+    assert tokens == len(current)
+    print(f'{len(current)} pieces, {len(text) / 1e6:.1f} MB')
+    print(f'legacy:      {legacy_time * 1e3:9.2f} ms  {len(legacy) / legacy_time:12.0f} pieces/s')
+    print(f'end to end:  {current_time * 1e3:9.2f} ms  {len(current) / current_time:12.0f} pieces/s  '
+          f'({legacy_time / current_time:.1f}x)')
+    print(f'scan only:   {scan_time * 1e3:9.2f} ms  {tokens / scan_time:12.0f} pieces/s  '
+          f'({legacy_time / scan_time:.1f}x, regex sweep without building pieces)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
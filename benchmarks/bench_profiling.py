@@ -0,0 +1,57 @@
+"""
+Cost of the profiling hooks: the examples run through parsing, sorting,
+transformations, TeX, outline and validation with profiling never enabled,
+after it was enabled then disabled, enabled, and enabled with allocation
+tracing. Prints the stage table of the last run. Run from the repository root:
+
+    python benchmarks/bench_profiling.py [repeat]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.profiling import Profiler
+from tangram.TangramPuzzle import TangramPuzzle
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def workload():
+    for name in EXAMPLES:
+        puzzle = TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex', cache=False)
+        puzzle.draw_pieces('', writeout=False)
+        puzzle.outline
+        puzzle.transformations
+        puzzle.validate()
+
+
+def timed(repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        workload()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 100):
+    workload()
+    baseline = timed(repeat)
+    with Profiler():
+        pass
+    disabled = timed(repeat)
+    with Profiler() as profiler:
+        enabled = timed(repeat)
+    with Profiler(allocations=True):
+        traced = timed(repeat // 10 or 1)
+
+    for label, elapsed in (('never enabled', baseline), ('disabled', disabled),
+                           ('enabled', enabled), ('allocations', traced)):
+        print(f'{label:14} {elapsed * 1e3:8.3f} ms  ({elapsed / baseline - 1:+6.1%})')
+    print()
+    for stage, stats in sorted(profiler.snapshot().items(), key=lambda item: -item[1]['seconds']):
+        print(f'{stage:24} {stats["calls"]:7} calls  {stats["seconds"] / repeat * 1e3:8.3f} ms/run  {stats["items"]:7} items')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
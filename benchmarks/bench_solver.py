@@ -0,0 +1,35 @@
+"""
+Time to solution of the tangram solver on the outlines of the examples,
+checking every solution covers the outline it was asked for. Run from the
+repository root:
+
+    python benchmarks/bench_solver.py [repeat]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.analyser import TangramSolver
+from tangram.TangramPuzzle import TangramPuzzle
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def main(repeat: int = 5):
+    for name in EXAMPLES:
+        target = TangramPuzzle(Path.cwd() / 'examples' / f'{name}.tex', cache=False).outline
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            solver = TangramSolver(target)
+            solution = solver.solve()
+            times.append(time.perf_counter() - start)
+        assert solution is not None, f'no solution for {name}'
+        assert TangramPuzzle(tangrams=solution).outline == target, f'solution for {name} has another outline'
+        print(f'{name:10} best {min(times) * 1e3:7.1f} ms  worst {max(times) * 1e3:7.1f} ms  {solver.nodes} nodes')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
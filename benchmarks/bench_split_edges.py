@@ -0,0 +1,75 @@
+"""
+Scaling of the grid indexed split_edges against the quadratic version it
+replaced, on the kangaroo tiled from 7 up to 10^5 pieces. Run from the
+repository root:
+
+    python benchmarks/bench_split_edges.py [max_pieces] [max_naive_pieces]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.tangram import Tangram
+from tangram.fileHandler import FileHandler
+from tangram.parser import LatexTangramParser
+from tangram.utils.boundary import point_on_segment, split_edges
+from tangram.utils.coords import Number
+
+
+def naive_split_edges(boundaries):
+    """The O(E·P) splitter, kept only as the benchmark reference"""
+    edges = []
+    for boundary in boundaries:
+        n = len(boundary)
+        for i in range(n):
+            edges.append((boundary[i], boundary[(i + 1) % n]))
+    points = set(p for edge in edges for p in edge)
+    result = []
+    for a, b in edges:
+        on_seg = [p for p in points if p != a and p != b and point_on_segment(p, a, b)]
+        if not on_seg:
+            result.append((a, b))
+        else:
+            def dist(p1, p2):
+                return (p1[0] - p2[0])**2 + (p1[1] - p2[1])**2
+            all_points = [a] + sorted(on_seg, key=lambda p: dist(a, p)) + [b]
+            for i in range(len(all_points) - 1):
+                result.append((all_points[i], all_points[i+1]))
+    return result
+
+
+def tiled_pieces(n_pieces: int) -> list[list[tuple[Number, Number]]]:
+    """Copies of the kangaroo laid out on a square grid, far enough apart not to touch"""
+    kangaroo = LatexTangramParser(FileHandler.read_file(Path.cwd() / 'examples' / 'kangaroo.tex')).parse()
+    side = int((n_pieces / len(kangaroo)) ** 0.5) + 1
+    polygons = []
+    for idx in range(n_pieces):
+        copy, piece = divmod(idx, len(kangaroo))
+        dx, dy = Number(8 * (copy % side)), Number(8 * (copy // side))
+        polygons.append([(x + dx, y + dy) for x, y in kangaroo[piece].vertices])
+    return polygons
+
+
+SIZES = [7, 70, 700, 7_000, 70_000, 100_000]
+
+
+def main(max_pieces: int = 100_000, max_naive_pieces: int = 70):
+    for n_pieces in (size for size in SIZES if size <= max_pieces):
+        polygons = tiled_pieces(n_pieces)
+        start = time.perf_counter()
+        result = split_edges(polygons)
+        indexed = time.perf_counter() - start
+        line = f'{n_pieces:7} pieces  indexed: {indexed * 1e3:10.2f} ms'
+        if n_pieces <= max_naive_pieces:
+            start = time.perf_counter()
+            expected = naive_split_edges(polygons)
+            naive = time.perf_counter() - start
+            assert result == expected, 'indexed split_edges differs from the quadratic version'
+            line += f'  naive: {naive * 1e3:10.2f} ms  ({naive / indexed:.1f}x)'
+        print(line)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
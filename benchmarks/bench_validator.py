@@ -0,0 +1,42 @@
+"""
+Throughput of the layout validator on the examples, next to the cost of
+parsing the same puzzles, and how many pairs the bounding-box sweep leaves
+for the exact intersection test. Run from the repository root:
+
+    python benchmarks/bench_validator.py [n_puzzles]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.parser import iter_tangrams
+from tangram.validator import _overlapping_pairs, validate
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def main(n_puzzles: int = 3000):
+    examples = [list(iter_tangrams(Path.cwd() / 'examples' / f'{name}.tex')) for name in EXAMPLES]
+
+    start = time.perf_counter()
+    for idx in range(n_puzzles):
+        list(iter_tangrams(Path.cwd() / 'examples' / f'{EXAMPLES[idx % len(EXAMPLES)]}.tex'))
+    parsing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for idx in range(n_puzzles):
+        assert not validate(examples[idx % len(examples)])
+    validating = time.perf_counter() - start
+
+    pieces = len(examples[0])
+    pairs = sum(len(_overlapping_pairs(tangrams)) for tangrams in examples) / len(examples)
+    print(f'{n_puzzles} puzzles')
+    print(f'parse:    {parsing:6.2f} s  {n_puzzles / parsing:8.0f} puzzles/s')
+    print(f'validate: {validating:6.2f} s  {n_puzzles / validating:8.0f} puzzles/s')
+    print(f'exact tests after the sweep: {pairs:.1f} of {pieces * (pieces - 1) // 2} pairs per puzzle')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
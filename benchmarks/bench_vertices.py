@@ -0,0 +1,55 @@
+"""
+Times Tangram construction for the examples and compares the per-piece
+Tangram._find_verticies loop with the batched VertexBatch pipeline.
+Run from the repository root:
+
+    python benchmarks/bench_vertices.py [n_puzzles]
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from tangram.elements.tangram import Tangram
+from tangram.elements.vertices import VertexBatch
+from tangram.fileHandler import FileHandler
+from tangram.parser import LatexTangramParser
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+
+
+def load_puzzles(n_puzzles: int):
+    examples = [LatexTangramParser(FileHandler.read_file(Path.cwd() / 'examples' / f'{name}.tex')).parse()
+                for name in EXAMPLES]
+    return [examples[idx % len(examples)] for idx in range(n_puzzles)]
+
+
+def main(n_puzzles: int = 3000):
+    puzzles = load_puzzles(n_puzzles)
+    pieces = [gram for tangrams in puzzles for gram in tangrams]
+
+    start = time.perf_counter()
+    expected = [gram._find_verticies() for gram in pieces]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = VertexBatch.from_puzzles(puzzles)
+    batch.a
+    vectorised = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for gram in pieces:
+        Tangram(gram.tangram_type, {'rotate': gram.rotate, 'xscale': -gram.xflip, 'yscale': -gram.yflip},
+                gram.base_coords)
+    construction = time.perf_counter() - start
+
+    assert batch.vertices() == expected, 'batched vertices differ from Tangram.vertices'
+    print(f'{len(pieces)} pieces')
+    print(f'construct:  {construction * 1e3:9.2f} ms  ({construction / len(pieces) * 1e6:.2f} us per piece)')
+    print(f'scalar:     {scalar * 1e3:9.2f} ms')
+    print(f'vectorised: {vectorised * 1e3:9.2f} ms  ({scalar / vectorised:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,238 @@
+"""
+Benchmark suite over every pipeline stage, on the examples and on synthetic
+corpora of increasing size, writing the timings as JSON. The compare mode
+reads two result files and flags the benches whose fastest sample got slower
+by more than the threshold (a fraction, default 0.10), exiting with 1 if any did.
+Run from the repository root:
+
+    python benchmarks/suite.py [results.json] [quick]
+    python benchmarks/suite.py compare base.json new.json [threshold]
+"""
+from pathlib import Path
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
+
+from bench_outline import triangle_strip
+from tangram.elements.document import TangramPieces
+from tangram.elements.tangram import Tangram
+from tangram.parser import CoordParser, LatexTangramParser, _TOKEN_PATTERN, iter_environment_records, iter_environments
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils.boundary import OutlineBuilder, find_boundary, outer_boundary, outline
+
+EXAMPLES = ['kangaroo', 'cat', 'goose']
+# Puzzles in each synthetic corpus, and in quick mode
+SIZES = [10, 100, 1000]
+QUICK_SIZES = [10, 100]
+# Pieces of the growing figure the outline benches run on
+STRIP_SIZES = [7, 35, 140]
+# Each sample loops the bench until it takes at least this many seconds, so short benches aren't just timer noise
+MIN_SAMPLE_TIME = 0.02
+SAMPLES = 5
+
+
+def corpus_text(n_puzzles: int) -> str:
+    """The examples repeated into one source of n_puzzles environments"""
+    examples = [(Path.cwd() / 'examples' / f'{name}.tex').read_text() for name in EXAMPLES]
+    return '\n'.join(examples[idx % len(examples)] for idx in range(n_puzzles))
+
+
+def inputs(sizes: list[int]) -> dict[str, str]:
+    sources = {name: (Path.cwd() / 'examples' / f'{name}.tex').read_text() for name in EXAMPLES}
+    sources.update({f'corpus-{size}': corpus_text(size) for size in sizes})
+    return sources
+
+
+# Each bench takes a source and returns (the function to time, the number of items it handles)
+
+def bench_coord_parser(text: str):
+    # The lru_cache would make every repeat after the first a dict lookup, so time the parse itself
+    parse = CoordParser.parse.__wrapped__
+    expressions = [value for match in _TOKEN_PATTERN.finditer(text) if match.group('type')
+                   for value in (match.group('x'), match.group('y'))]
+    return lambda: [parse(expression) for expression in expressions], len(expressions)
+
+
+def bench_latex_parser(text: str):
+    n_pieces = sum(len(tangrams) for tangrams in iter_environments(io.StringIO(text)))
+    return lambda: LatexTangramParser(text).parse(), n_pieces
+
+
+def bench_tangram_construct(text: str):
+    records = [record for records in iter_environment_records(io.StringIO(text)) for record in records]
+    return lambda: [Tangram(tangram_type, params, base, line) for tangram_type, params, base, line in records], len(records)
+
+
+def bench_find_vertices(text: str):
+    tangrams = LatexTangramParser(text).parse()
+    return lambda: [gram._find_verticies() for gram in tangrams], len(tangrams)
+
+
+def _puzzles(text: str) -> list[TangramPuzzle]:
+    return [TangramPuzzle(tangrams=tangrams) for tangrams in iter_environments(io.StringIO(text))]
+
+
+def bench_puzzle_sort(text: str):
+    puzzles = _puzzles(text)
+    return lambda: [puzzle._sort() for puzzle in puzzles], len(puzzles)
+
+
+def bench_puzzle_transforms(text: str):
+    puzzles = _puzzles(text)
+    return lambda: [puzzle._transforms() for puzzle in puzzles], len(puzzles)
+
+
+def bench_puzzle_grid_size(text: str):
+    puzzles = _puzzles(text)
+    grid_size = TangramPuzzle.grid_size.func
+    return lambda: [grid_size(puzzle) for puzzle in puzzles], len(puzzles)
+
+
+def bench_pieces_content(text: str):
+    puzzles = _puzzles(text)
+    documents = [(puzzle.grid_size, puzzle.sorted_tangrams) for puzzle in puzzles]
+    return lambda: [TangramPieces(grid, tangrams).generate_content() for grid, tangrams in documents], len(puzzles)
+
+
+def bench_find_boundary(polygons: list):
+    return lambda: find_boundary(polygons), len(polygons)
+
+
+def bench_outline(polygons: list):
+    return lambda: outline(polygons), len(polygons)
+
+
+def bench_outline_builder(polygons: list):
+    def build():
+        builder = OutlineBuilder()
+        for polygon in polygons:
+            builder.add(polygon)
+        return builder.outline()
+    return build, len(polygons)
+
+
+def bench_outer_boundary(polygons: list):
+    floats = [[(float(x), float(y)) for x, y in polygon] for polygon in polygons]
+    return lambda: outer_boundary(floats), len(polygons)
+
+
+SOURCE_BENCHES = {
+    'coord_parser': bench_coord_parser,
+    'latex_parser': bench_latex_parser,
+    'tangram_construct': bench_tangram_construct,
+    'find_vertices': bench_find_vertices,
+    'puzzle_sort': bench_puzzle_sort,
+    'puzzle_transforms': bench_puzzle_transforms,
+    'puzzle_grid_size': bench_puzzle_grid_size,
+    'pieces_content': bench_pieces_content,
+}
+
+POLYGON_BENCHES = {
+    'find_boundary': bench_find_boundary,
+    'outline': bench_outline,
+    'outline_builder': bench_outline_builder,
+    'outer_boundary': bench_outer_boundary,
+}
+
+
+def measure(func) -> dict:
+    """Seconds per call of func, from SAMPLES samples of enough calls to last MIN_SAMPLE_TIME"""
+    def sample(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    # The first calls also warm up any caches and the orientation table
+    number = 1
+    while sample(number) < MIN_SAMPLE_TIME:
+        number *= 2
+    times = [sample(number) / number for _ in range(SAMPLES)]
+    return {'median': statistics.median(times), 'min': min(times), 'number': number, 'samples': SAMPLES}
+
+
+def run(quick: bool = False) -> dict:
+    results = {}
+    for input_name, text in inputs(QUICK_SIZES if quick else SIZES).items():
+        for bench_name, bench in SOURCE_BENCHES.items():
+            func, n_items = bench(text)
+            results[f'{bench_name}/{input_name}'] = dict(measure(func), items=n_items)
+
+    polygon_inputs = {name: [t.vertices for t in LatexTangramParser(text).parse()]
+                      for name, text in inputs([]).items()}
+    polygon_inputs.update({f'strip-{size}': triangle_strip(size) for size in STRIP_SIZES[:2 if quick else None]})
+    for input_name, polygons in polygon_inputs.items():
+        for bench_name, bench in POLYGON_BENCHES.items():
+            try:
+                func, n_items = bench(polygons)
+                results[f'{bench_name}/{input_name}'] = dict(measure(func), items=n_items)
+            except (ImportError, AttributeError):
+                # The shapely path is optional, and only handles figures that union into one polygon
+                continue
+
+    for name, result in results.items():
+        result['per_item'] = result['median'] / max(result['items'], 1)
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': commit or None,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(base_path: str, new_path: str, threshold: float = 0.10) -> bool:
+    """Print the change of every bench in both runs, True if any regressed beyond the threshold"""
+    with open(base_path) as file:
+        base = json.load(file)['results']
+    with open(new_path) as file:
+        new = json.load(file)['results']
+
+    regressed = False
+    width = max(len(name) for name in base.keys() | new.keys())
+    for name in sorted(base.keys() & new.keys()):
+        # The fastest sample is the one least disturbed by other work on the machine
+        ratio = new[name]['min'] / base[name]['min']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f'{name:{width}}  {base[name]["min"] * 1e3:10.3f} ms  {new[name]["min"] * 1e3:10.3f} ms  '
+              f'{ratio:6.2f}x{flag}')
+    for name in sorted(base.keys() - new.keys()):
+        print(f'{name:{width}}  only in {base_path}')
+    for name in sorted(new.keys() - base.keys()):
+        print(f'{name:{width}}  only in {new_path}')
+    return regressed
+
+
+def main(output: str = 'benchmark_results.json', quick: str = None):
+    results = run(quick == 'quick')
+    with open(output, 'w') as file:
+        json.dump({'metadata': metadata(), 'results': results}, file, indent=2)
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(f'{name:{width}}  {result["median"] * 1e3:10.3f} ms  {result["per_item"] * 1e6:9.2f} us/item')
+    print(f'wrote {output}')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['compare']:
+        base_path, new_path, *threshold = sys.argv[2:]
+        sys.exit(1 if compare(base_path, new_path, *(float(arg) for arg in threshold)) else 0)
+    main(*sys.argv[1:])
@@ -1,34 +1,83 @@
 
 from pathlib import Path
-import sys
+import os
 import re
-from typing import Literal
-import numpy as np
+from typing import Iterable, Iterator, Literal, TextIO
 
 _BOUNDS = Literal['upper','lower']
 
-sys.path.append((Path.cwd() / 'tangram').__str__())
-
-from elements.tangram import Tangram, TangramType
-from elements.document import TangramPieces
-from fileHandler import FileHandler
-from parser import LatexTangramParser, CoordParser
-from utils.coords import Number, arc_sort, find_boundary_edges
-from utils.boundary import find_boundary, point_on_segment, outer_boundary
+from .cache import ParseCache, default_cache
+from .elements.tangram import Tangram, TangramType
+from .elements.document import TangramPieces, TangramOutline
+from .parser import LatexTangramParser, CoordParser, iter_tangrams, iter_environments
+from .utils.coords import Number, arc_sort, find_boundary_edges
+from .utils.boundary import find_boundary, point_on_segment, outer_boundary, outline, OutlineBuilder
+from .validator import Diagnostic, validate
+from .fingerprint import Fingerprint, fingerprint
 from collections import Counter, defaultdict
-from shapely import geometry
-from shapely.ops import unary_union
+from functools import cached_property
 
 
 class TangramPuzzle:
     
-    def __init__(self, file: str):
-        raw = FileHandler.read_file(filename=file)
-        self.tangrams = LatexTangramParser(raw_text=raw).parse()
-        self.transformations = self._transforms()
-        self.sorted_tangrams = self._sort()
+    def __init__(self, file: str | TextIO = None, tangrams: Iterable[Tangram] = None, cache: ParseCache | bool = False):
+        """
+        The file is read a line at a time, so its text is never held whole, but
+        the puzzle keeps every piece in a list. For inputs too large for that,
+        use iter_puzzles or parser.iter_tangrams, which stay lazy.
+
+        Args:
+            file: Path or open text file to read the tangrams from, FileNotFoundError if the path is missing
+            tangrams: Tangrams that were already parsed, used instead of file
+            cache: ParseCache to load a path through, True for the default cache (in $TANGRAM_CACHE_DIR
+                or ~/.cache/tangram, off when $TANGRAM_NO_CACHE is set), False to always parse
+        """
+        if tangrams is None:
+            if cache is True:
+                cache = default_cache()
+            if cache and isinstance(file, (str, Path)) and os.path.isfile(file):
+                tangrams = cache.load(file)
+            else:
+                tangrams = iter_tangrams(file)
+        self.tangrams = tangrams
+
+    @classmethod
+    def from_array(cls, puzzle_array: 'PuzzleArray', puzzle: int = 0) -> 'TangramPuzzle':
+        """A puzzle over the piece views of one puzzle in a PuzzleArray, without building Tangrams"""
+        return cls(tangrams=puzzle_array.puzzle(puzzle))
+
+    # Values derived from the pieces, dropped when the pieces are replaced or invalidate() is called
+    _cached = ('transformations', 'sorted_tangrams', 'grid_size', 'outline', 'fingerprint')
+
+    def invalidate(self):
+        """Drop the cached values, needed after moving or transforming a piece in place"""
+        for name in self._cached:
+            self.__dict__.pop(name, None)
 
     @property
+    def tangrams(self) -> list[Tangram]:
+        return self._tangrams
+
+    @tangrams.setter
+    def tangrams(self, tangrams: Iterable[Tangram]):
+        self._tangrams = list(tangrams)
+        self.invalidate()
+
+    @cached_property
+    def transformations(self) -> dict:
+        return self._transforms()
+
+    @cached_property
+    def sorted_tangrams(self) -> list[Tangram]:
+        return self._sort()
+
+    @classmethod
+    def iter_puzzles(cls, source: str | TextIO) -> Iterator['TangramPuzzle']:
+        """Yield one puzzle per EnvTangramTikz environment, reading the source lazily"""
+        for tangrams in iter_environments(source):
+            yield cls(tangrams=tangrams)
+
+    @cached_property
     def grid_size(self) -> list[tuple]:
         def add_boundary_space(coord: float, sign:_BOUNDS):
             coord = float(coord)
@@ -44,14 +93,20 @@ class TangramPuzzle:
                 bound = -bound
             return bound
         
-        grids = [gram._grid for gram in self.tangrams]
+        if not self.tangrams:
+            raise ValueError('puzzle has no tangram pieces')
+        grids = iter([gram._grid for gram in self.tangrams])
+        (min_x, min_y), (max_x, max_y) = next(grids)
+        for (low_x, low_y), (high_x, high_y) in grids:
+            min_x, min_y = min(min_x, low_x), min(min_y, low_y)
+            max_x, max_y = max(max_x, high_x), max(max_y, high_y)
 
         # Adding space to the boundary of the grid, 
         # at least one grid space but no more than two
-        min_x = add_boundary_space(min(grids, key=lambda g: g[0][0])[0][0], 'lower')
-        min_y = add_boundary_space(min(grids, key=lambda g: g[0][1])[0][1], 'lower')
-        max_x = add_boundary_space(max(grids, key=lambda g: g[1][0])[1][0], 'upper')
-        max_y = add_boundary_space(max(grids, key=lambda g: g[1][1])[1][1], 'upper')
+        min_x = add_boundary_space(min_x, 'lower')
+        min_y = add_boundary_space(min_y, 'lower')
+        max_x = add_boundary_space(max_x, 'upper')
+        max_y = add_boundary_space(max_y, 'upper')
 
         return ((min_x, min_y), (max_x, max_y))
     
@@ -93,17 +148,49 @@ class TangramPuzzle:
 
         return transform_dict
 
+    def validate(self, pieces: dict[TangramType, int] = None) -> list[Diagnostic]:
+        """Problems with the layout (wrong pieces, overlaps, holes), empty when it is a valid tangram"""
+        return validate(self.tangrams, pieces)
+
     def draw_pieces(self, filename, writeout:bool=True):
-        pieces_content = TangramPieces(self.grid_size, self.sorted_tangrams).generate_content()
+        pieces = TangramPieces(self.grid_size, self.sorted_tangrams)
         if writeout:
-            FileHandler.write_tex(content=pieces_content, filename=filename)
+            pieces.write(filename)
         else:
-            return pieces_content
+            return pieces.generate_content()
+
+
+    def iter_outlines(self) -> Iterator[list[tuple]]:
+        """
+        Yield the outline after merging each piece in turn, for step by step renders.
+        Each piece is merged into the running boundary instead of re-unioning every piece.
+        """
+        builder = OutlineBuilder()
+        for gram in self.tangrams:
+            builder.add(gram.vertices)
+            yield builder.outline()
 
+    @cached_property
+    def outline(self) -> list[tuple]:
+        """Vertices of the outline of the puzzle, clockwise from the topmost then leftmost vertex"""
+        # All the pieces are known up front, so one pass beats merging them in one at a time
+        return outline([gram.vertices for gram in self.tangrams])
+
+    @cached_property
+    def fingerprint(self) -> Fingerprint:
+        """Same for puzzles with the same piece placements up to rotation, mirroring and translation"""
+        return fingerprint(self.tangrams)
+
+    def draw_outline(self, filename, writeout:bool=True):
+        outline = TangramOutline(self.grid_size, self.outline)
+        if writeout:
+            outline.write(filename)
+        else:
+            return outline.generate_content()
 
     def __str__(self):
         str_out = []
         sorted_tangrams = self.sorted_tangrams
         for gram in sorted_tangrams:
-            str_out.append(f'{gram.tangram_type:15}: {gram.vertices}')
+            str_out.append(f'{gram.tangram_type:15}: {list(gram.vertices)}')
         return '\n'.join(str_out)
\ No newline at end of file
@@ -0,0 +1,617 @@
+
+from pathlib import Path
+import re
+import os
+import time
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, Iterator, TextIO
+
+from .elements.tangram import (STANDARD_SET, Tangram, TangramType, base_shapes, distinct_orientations,
+                               oriented_vertices)
+from .fileHandler import FileHandler
+from .parser import TEX_NAMES
+from .utils.boundary import edge_direction, get_edges, remove_collinear, signed_area, trace_loops
+from .utils.coords import Number, tex_number
+
+# Areas in half units, the area of the small triangle
+_HALF_AREAS = {tangram_type: int(abs(signed_area(shape)).rational * 2) for tangram_type, shape in base_shapes.items()}
+
+_OUTLINE_PATTERN = re.compile(r'\\draw\[ultra thick\](?P<path>[^;]*?)--\s*cycle\s*;')
+_POINT_PATTERN = re.compile(r'\(\s*\{(?P<x>[^}]*)\}\s*,\s*\{(?P<y>[^}]*)\}\s*\)')
+_TERM_PATTERN = re.compile(
+    r'\s*(?P<sign>[+-])?\s*'
+    r'(?P<value>\d+(?:\.\d*)?|\.\d+)?(?:\s*/\s*(?P<denominator>\d+))?'
+    r'\s*(?P<sqrt>\*?\s*sqrt\(\s*2\s*\))?'
+)
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _on_segment(p, a, b) -> bool:
+    """Whether p lies strictly between a and b on the segment ab"""
+    if p == a or p == b or _cross(a, b, p) != 0:
+        return False
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _bounds(points) -> tuple[float, float, float, float]:
+    points = list(points)
+    xs = [float(x) for x, _ in points]
+    ys = [float(y) for _, y in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _crosses_interior(a, b, piece) -> bool:
+    """
+    Whether the segment ab passes through the interior of a convex clockwise piece
+    (touching or running along its edges does not count). The segment is clipped
+    against the inside of every edge in turn, in exact arithmetic.
+    """
+    low, high = Number(0), Number(1)
+    direction = (b[0] - a[0], b[1] - a[1])
+    for p, q in get_edges(piece):
+        edge = (q[0] - p[0], q[1] - p[1])
+        # Inside of the edge where start + t * slope < 0
+        start = edge[0] * (a[1] - p[1]) - edge[1] * (a[0] - p[0])
+        slope = edge[0] * direction[1] - edge[1] * direction[0]
+        if slope == 0:
+            if start >= 0:
+                return False
+            continue
+        bound = -start / slope
+        if slope > 0:
+            high = min(high, bound)
+        else:
+            low = max(low, bound)
+        if low >= high:
+            return False
+    return True
+
+
+def _split(edges, points) -> list[tuple]:
+    """Split the edges at any of the points lying on them"""
+    result = []
+    for a, b in edges:
+        inner = [p for p in points if _on_segment(p, a, b)]
+        if not inner:
+            result.append((a, b))
+            continue
+        inner.sort(key=lambda p: abs(p[0] - a[0]) + abs(p[1] - a[1]))
+        chain = [a] + inner + [b]
+        result.extend(zip(chain, chain[1:]))
+    return result
+
+
+@lru_cache(maxsize=None)
+def _subset_sums(counts: tuple[tuple[TangramType, int], ...]) -> frozenset[int]:
+    """Every total area (in half units) that some of the remaining pieces can cover"""
+    sums = {0}
+    for tangram_type, count in counts:
+        sums |= {total + _HALF_AREAS[tangram_type] * k for total in sums for k in range(1, count + 1)}
+    return frozenset(sums)
+
+
+@lru_cache(maxsize=None)
+def _placements(tangram_type: TangramType) -> dict[int, list[tuple]]:
+    """
+    Ways a piece can line one of its vertices and the clockwise edge leaving it up
+    with a direction: ((rotate, xflip, yflip), vertex index) keyed by direction.
+    """
+    placements = {}
+    for orientation in distinct_orientations(tangram_type):
+        vertices = oriented_vertices(tangram_type, *orientation)
+        for idx, (a, b) in enumerate(get_edges(vertices)):
+            placements.setdefault(edge_direction(a, b), []).append((orientation, idx))
+    return placements
+
+
+class Region:
+    """
+    The part of the target still to be covered, as clockwise boundary loops.
+    Shapes touching at a corner share one loop that passes through it twice.
+    """
+    def __init__(self, loops: list[list[tuple]]):
+        self.loops = [loop for loop in loops if len(loop) >= 3]
+        self.edges = [edge for loop in self.loops for edge in get_edges(loop)]
+        self.bounds = _bounds(p for loop in self.loops for p in loop) if self.loops else None
+
+    def __bool__(self):
+        return bool(self.loops)
+
+    def anchor(self) -> tuple[tuple, tuple]:
+        """The topmost then leftmost vertex, and the end of the edge leaving it"""
+        return min(self.edges, key=lambda edge: (-edge[0][1], edge[0][0]))
+
+    def half_areas(self) -> list[Number]:
+        """Area of every loop, in half units"""
+        return [-signed_area(loop) * 2 for loop in self.loops]
+
+    def key(self, anchor) -> frozenset:
+        """The boundary shifted so the anchor is at the origin, equal for equal shapes"""
+        x, y = anchor
+        return frozenset(((a[0] - x, a[1] - y), (b[0] - x, b[1] - y)) for a, b in self.edges)
+
+    def fits(self, piece) -> bool:
+        """Whether a piece sharing the anchor corner lies inside the region"""
+        min_x, min_y, max_x, max_y = _bounds(piece)
+        if min_x < self.bounds[0] - 1e-9 or min_y < self.bounds[1] - 1e-9 \
+                or max_x > self.bounds[2] + 1e-9 or max_y > self.bounds[3] + 1e-9:
+            return False
+        # The piece starts on the inside of the anchor edge, so it is inside
+        # the region unless some part of the boundary cuts through it
+        for a, b in self.edges:
+            if max(float(a[0]), float(b[0])) <= min_x + 1e-9 or min(float(a[0]), float(b[0])) >= max_x - 1e-9 \
+                    or max(float(a[1]), float(b[1])) <= min_y + 1e-9 or min(float(a[1]), float(b[1])) >= max_y - 1e-9:
+                continue
+            if _crosses_interior(a, b, piece):
+                return False
+        return True
+
+    def remove(self, piece) -> 'Region':
+        """The region left once a piece inside it is covered"""
+        points = {p for loop in self.loops for p in loop}
+        region_edges = _split(self.edges, piece)
+        piece_edges = _split(get_edges(piece), points)
+        # Edges the piece shares with the boundary stop being boundary,
+        # the rest of the piece's edges become boundary facing the other way
+        shared = set(piece_edges)
+        edges = [edge for edge in region_edges if edge not in shared]
+        region_set = set(region_edges)
+        edges.extend((b, a) for a, b in piece_edges if (a, b) not in region_set)
+        return Region([remove_collinear(loop) for loop in trace_loops(edges)])
+
+
+class TangramSolver:
+    """
+    Finds how to place tangram pieces to exactly cover a target outline.
+
+    The search always covers the topmost then leftmost corner of what is left
+    of the target. Whatever piece covers that corner has a vertex there and an
+    edge along the boundary edge leaving it, so only those placements of each
+    distinct orientation are tried. A placement is kept when no boundary edge
+    cuts through the piece. Regions whose area no combination of the remaining
+    pieces can make are pruned, and regions (up to translation) already found
+    to have no solution with the same pieces left are not searched again.
+    """
+    def __init__(self, target: Iterable[tuple] | str | Path, pieces: dict[TangramType, int] = None,
+                 jobs: int = 1, timeout: float = None):
+        """
+        Args:
+            target: Clockwise or anticlockwise vertices of the outline in exact coordinates,
+                or the path to an *_outline_on_grid.tex file
+            pieces: Number of each TangramType to place, defaults to one tangram set
+            jobs: Worker processes to split the search over, None for the number of CPUs; 1 searches in this process
+            timeout: Seconds to search for before giving up with a TimeoutError
+        """
+        if isinstance(target, (str, Path)):
+            target = read_outline(target)
+        target = [(Number(x) if not isinstance(x, Number) else x, Number(y) if not isinstance(y, Number) else y)
+                  for x, y in target]
+        if signed_area(target) > 0:
+            target = target[::-1]
+        self.target = target
+        self.pieces = dict(STANDARD_SET if pieces is None else pieces)
+        self.region = Region([remove_collinear(target)])
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.deadline = None
+        self._cancel = None
+        self._failed = set()
+        self.nodes = 0
+
+    def _counts(self, remaining: dict[TangramType, int]) -> tuple:
+        return tuple((tangram_type, count) for tangram_type, count in remaining.items() if count)
+
+    def _viable(self, region: Region, counts: tuple) -> bool:
+        """Whether the area of every loop can be made up of the remaining pieces"""
+        sums = _subset_sums(counts)
+        total = 0
+        for area in region.half_areas():
+            if area.irrational or area.rational.denominator != 1 or int(area.rational) not in sums:
+                return False
+            total += int(area.rational)
+        return total == sum(_HALF_AREAS[tangram_type] * count for tangram_type, count in counts)
+
+    def _candidates(self, region: Region, remaining: dict[TangramType, int]) -> Iterator[tuple]:
+        """(tangram_type, orientation, piece vertices) of every placement covering the anchor that fits"""
+        anchor, following = region.anchor()
+        direction = edge_direction(anchor, following)
+        # Bigger pieces first, they leave fewer ways to go wrong
+        for tangram_type in sorted(remaining, key=lambda t: -_HALF_AREAS[t]):
+            if not remaining[tangram_type]:
+                continue
+            for orientation, idx in _placements(tangram_type).get(direction, ()):
+                vertices = oriented_vertices(tangram_type, *orientation)
+                dx, dy = anchor[0] - vertices[idx][0], anchor[1] - vertices[idx][1]
+                piece = tuple((x + dx, y + dy) for x, y in vertices)
+                if region.fits(piece):
+                    yield tangram_type, orientation, piece
+
+    def _check(self):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise TimeoutError(f'no result within {self.timeout} s')
+        if self._cancel is not None and self._cancel.is_set():
+            raise SearchCancelled()
+
+    def _children(self, region: Region, remaining: dict[TangramType, int]) -> Iterator[tuple]:
+        """(placement, region left) of every placement covering the anchor that leaves a viable region"""
+        for tangram_type, orientation, piece in self._candidates(region, remaining):
+            rest = region.remove(piece)
+            remaining[tangram_type] -= 1
+            viable = self._viable(rest, self._counts(remaining))
+            remaining[tangram_type] += 1
+            if viable:
+                yield (tangram_type, orientation, piece), rest
+
+    def _search(self, region: Region, remaining: dict[TangramType, int], placed: list) -> Iterator[list]:
+        self._check()
+        self.nodes += 1
+        if not region:
+            if not any(remaining.values()):
+                yield list(placed)
+            return
+        counts = self._counts(remaining)
+        key = (region.key(region.anchor()[0]), counts)
+        if key in self._failed:
+            return
+
+        found = False
+        for placement, rest in self._children(region, remaining):
+            remaining[placement[0]] -= 1
+            placed.append(placement)
+            for solution in self._search(rest, remaining, placed):
+                found = True
+                yield solution
+            placed.pop()
+            remaining[placement[0]] += 1
+        if not found:
+            self._failed.add(key)
+
+    def _branches(self, count: int, max_depth: int = 2) -> list[list]:
+        """
+        Placements of the first pieces that split the search into at least count
+        independent branches where possible, going at most max_depth pieces deep.
+        """
+        branches = [([], self.region, dict(self.pieces))]
+        for _ in range(max_depth):
+            if len(branches) >= count:
+                break
+            expanded = []
+            for placed, region, remaining in branches:
+                if not region:
+                    expanded.append((placed, region, remaining))
+                    continue
+                for placement, rest in self._children(region, remaining):
+                    left = dict(remaining)
+                    left[placement[0]] -= 1
+                    expanded.append((placed + [placement], rest, left))
+            branches = expanded
+        return [placed for placed, _, _ in branches]
+
+    def _resume(self, placed: list, first_only: bool) -> list[list]:
+        """Search the branch below the placements already made"""
+        region, remaining = self.region, dict(self.pieces)
+        for tangram_type, orientation, piece in placed:
+            region = region.remove(piece)
+            remaining[tangram_type] -= 1
+        solutions = []
+        for solution in self._search(region, remaining, list(placed)):
+            solutions.append(solution)
+            if first_only:
+                break
+        return solutions
+
+    def _iter_parallel(self, first_only: bool) -> Iterator[list]:
+        """
+        Search the branches on a process pool, yielding the solutions of each branch
+        as it finishes. Stopping early (or timing out) sets a shared event that
+        the workers check at every node, and drops the branches not yet started.
+        """
+        # Only parallel searches pay for importing the process machinery
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        cancel = multiprocessing.Event()
+        pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(cancel,))
+        try:
+            pending = {pool.submit(_search_branch, self.target, self.pieces, placed, first_only, self.deadline)
+                       for placed in self._branches(self.jobs * 4)}
+            while pending:
+                timeout = None if self.deadline is None else max(0.0, self.deadline - time.time())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f'no result within {self.timeout} s')
+                for future in done:
+                    yield from future.result()
+        finally:
+            cancel.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def iter_solutions(self) -> Iterator[list[Tangram]]:
+        """
+        Yield every way of placing the pieces, as Tangrams. With several jobs the
+        solutions of each branch come as soon as it is searched, in no set order.
+        """
+        self.deadline = None if self.timeout is None else time.time() + self.timeout
+        if not self._viable(self.region, self._counts(self.pieces)):
+            return
+        if self.jobs == 1:
+            solutions = self._search(self.region, dict(self.pieces), [])
+        else:
+            solutions = self._iter_parallel(first_only=False)
+        for placed in solutions:
+            yield [_to_tangram(*placement) for placement in placed]
+
+    def solve(self) -> list[Tangram] | None:
+        """
+        The first way of placing the pieces found, None when there is none.
+        With several jobs the first branch to find one wins and the rest are cancelled.
+        """
+        self.deadline = None if self.timeout is None else time.time() + self.timeout
+        if not self._viable(self.region, self._counts(self.pieces)):
+            return None
+        if self.jobs == 1:
+            solutions = self._search(self.region, dict(self.pieces), [])
+        else:
+            solutions = self._iter_parallel(first_only=True)
+        placed = next(solutions, None)
+        solutions.close()
+        return None if placed is None else [_to_tangram(*placement) for placement in placed]
+
+
+class SearchCancelled(Exception):
+    """Raised inside a worker once another worker has already finished the search"""
+
+
+# Set in every worker process of a parallel search
+_cancel_event = None
+
+
+def _init_worker(cancel):
+    global _cancel_event
+    _cancel_event = cancel
+
+
+def _search_branch(target: list, pieces: dict, placed: list, first_only: bool, deadline: float | None) -> list[list]:
+    solver = TangramSolver(target, pieces)
+    solver.deadline = deadline
+    solver._cancel = _cancel_event
+    try:
+        return solver._resume(placed, first_only)
+    except SearchCancelled:
+        return []
+
+
+def _to_tangram(tangram_type: TangramType, orientation: tuple, piece: tuple) -> Tangram:
+    rotate, xflip, yflip = orientation
+    base = oriented_vertices(tangram_type, *orientation)[0]
+    base_coords = (piece[0][0] - base[0], piece[0][1] - base[1])
+    return Tangram(tangram_type, {'rotate': rotate, 'xscale': -1 if xflip else 0, 'yscale': -1 if yflip else 0},
+                   base_coords)
+
+
+def solve(target: Iterable[tuple] | str | Path, jobs: int = 1, timeout: float = None) -> list[Tangram] | None:
+    return TangramSolver(target, jobs=jobs, timeout=timeout).solve()
+
+
+def read_outline(filename: str | Path) -> list[tuple[Number, Number]]:
+    """Vertices of the outline drawn in an *_outline_on_grid.tex file"""
+    match = _OUTLINE_PATTERN.search(FileHandler.read_file(filename) or '')
+    if match is None:
+        raise ValueError(f'no outline found in {filename}')
+    return [(parse_expression(point.group('x')), parse_expression(point.group('y')))
+            for point in _POINT_PATTERN.finditer(match.group('path'))]
+
+
+def parse_expression(expression: str) -> Number:
+    """Parse a coordinate such as 2-1/2*sqrt(2) or 1.5 + 0.5 * sqrt(2) into a Number"""
+    rational, irrational = Fraction(0), Fraction(0)
+    position, end = 0, len(expression.rstrip())
+    while position < end:
+        match = _TERM_PATTERN.match(expression, position)
+        if match.end() == position or not (match.group('value') or match.group('sqrt')):
+            raise ValueError(f'cannot parse coordinate: {expression!r}')
+        value = Fraction(match.group('value') or 1)
+        if match.group('denominator'):
+            value /= int(match.group('denominator'))
+        if match.group('sign') == '-':
+            value = -value
+        if match.group('sqrt'):
+            irrational += value
+        else:
+            rational += value
+        position = match.end()
+    return Number(rational, irrational)
+
+
+def piece_lines(tangrams: Iterable[Tangram]) -> list[str]:
+    r"""The \PieceTangram line of every piece"""
+    lines = []
+    for gram in tangrams:
+        params = []
+        if gram.xflip:
+            params.append('xscale = -1')
+        if gram.yflip:
+            params.append('yscale = -1')
+        params.append(f'rotate = {gram.rotate}')
+        x, y = gram.base_coords
+        lines.append(rf"\PieceTangram[TangSol]<{', '.join(params)}>({{{tex_number(x)}}}, {{{tex_number(y)}}})"
+                     rf"{{{TEX_NAMES[gram.tangram_type]}}}")
+    return lines
+
+
+# Corpus analytics, computed on the columns of a PuzzleArray so no Tangram is built for any piece
+
+def _perimeter(shape: list[tuple]) -> Number:
+    """Exact perimeter of a shape whose edges all run along multiples of 45 degrees"""
+    perimeter = Number(0)
+    for (x1, y1), (x2, y2) in get_edges(shape):
+        dx, dy = abs(x2 - x1), abs(y2 - y1)
+        perimeter += dx + dy if not dx or not dy else dx * Number(0, 1)
+    return perimeter
+
+
+_PERIMETERS = {tangram_type: _perimeter(shape) for tangram_type, shape in base_shapes.items()}
+
+_COLUMNS = {'type': TangramType, 'rotate': int, 'xflip': bool, 'yflip': bool}
+# Every column value is below this, so a group of columns packs into one integer key
+_RADIX = 512
+
+
+def _orientation_index(types, rotations, xflips, yflips):
+    return ((types * 8 + rotations // 45) * 2 + xflips) * 2 + yflips
+
+
+@lru_cache(maxsize=None)
+def _extents():
+    """(a, b, d) parts of the min x, min y, max x and max y of every oriented piece, by _orientation_index"""
+    import numpy as np
+
+    extents = np.zeros(((max(tangram_type.value for tangram_type in TangramType) + 1) * 32, 4, 3), dtype=np.int64)
+    # Rows of unused indexes stay 0/1, so they don't divide by zero
+    extents[..., 2] = 1
+    for tangram_type in TangramType:
+        for rotate in range(0, 360, 45):
+            for xflip in (False, True):
+                for yflip in (False, True):
+                    vertices = oriented_vertices(tangram_type, rotate, xflip, yflip)
+                    xs, ys = [x for x, _ in vertices], [y for _, y in vertices]
+                    extents[_orientation_index(tangram_type.value, rotate, xflip, yflip)] = \
+                        [min(xs).parts, min(ys).parts, max(xs).parts, max(ys).parts]
+    return extents
+
+
+class CorpusAnalytics:
+    """
+    Aggregations over every piece of a corpus: piece counts grouped by type,
+    rotation and flips, and exact areas, perimeters and bounding boxes.
+    Everything runs vectorised over the columns of a PuzzleArray (the parser's
+    records as typed arrays), so no Tangram or transformations dict is built.
+    """
+    def __init__(self, table: 'PuzzleArray'):
+        """
+        Args:
+            table: The pieces of the corpus, one puzzle per EnvTangramTikz environment
+        """
+        self.table = table
+
+    @classmethod
+    def from_source(cls, source: str | TextIO) -> 'CorpusAnalytics':
+        """Parse a path or open text file straight into columns"""
+        from .elements.puzzle_array import PuzzleArray
+        return cls(PuzzleArray.from_source(source))
+
+    def _column(self, name: str):
+        table = self.table
+        return {'type': table.types, 'rotate': table.rotations, 'xflip': table.xflips, 'yflip': table.yflips}[name]
+
+    def _puzzles(self):
+        """Start row and size of every puzzle that has pieces"""
+        import numpy as np
+
+        offsets = self.table.puzzle_offsets
+        sizes = np.diff(offsets)
+        return offsets[:-1][sizes > 0], sizes[sizes > 0]
+
+    def group_by(self, *columns: str) -> dict[tuple, int]:
+        """
+        Pieces with each combination of the columns ('type', 'rotate', 'xflip',
+        'yflip', default all of them) that occurs, e.g. group_by('type', 'rotate')
+        gives {(TangramType.SQUARE, 45): 3, ...}
+        """
+        import numpy as np
+
+        columns = columns or tuple(_COLUMNS)
+        unknown = [name for name in columns if name not in _COLUMNS]
+        if unknown:
+            raise ValueError(f'unknown columns: {", ".join(unknown)}')
+        keys = np.zeros(len(self.table), dtype=np.int64)
+        for name in columns:
+            keys = keys * _RADIX + self._column(name)
+        keys, counts = np.unique(keys, return_counts=True)
+
+        groups = {}
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            values = []
+            for name in reversed(columns):
+                key, value = divmod(key, _RADIX)
+                values.append(_COLUMNS[name](value))
+            groups[tuple(reversed(values))] = count
+        return groups
+
+    def rotation_histogram(self) -> dict[TangramType, dict[int, int]]:
+        """{type: {rotation: pieces}} of the normalised rotations"""
+        histogram = {}
+        for (tangram_type, rotate), count in self.group_by('type', 'rotate').items():
+            histogram.setdefault(tangram_type, {})[rotate] = count
+        return histogram
+
+    def flip_rates(self) -> dict[TangramType, float]:
+        """Fraction of the pieces of each type that are mirrored, on either axis"""
+        import numpy as np
+
+        pieces = np.bincount(self.table.types)
+        flipped = np.bincount(self.table.types, weights=self.table.xflips | self.table.yflips)
+        return {TangramType(value): float(flipped[value] / pieces[value]) for value in np.flatnonzero(pieces).tolist()}
+
+    def measures(self) -> dict[TangramType, dict]:
+        """{type: {'pieces': n, 'area': total area, 'perimeter': total perimeter}}, exact in Q(√2)"""
+        import numpy as np
+
+        pieces = np.bincount(self.table.types)
+        measures = {}
+        for value in np.flatnonzero(pieces).tolist():
+            tangram_type, count = TangramType(value), int(pieces[value])
+            measures[tangram_type] = {'pieces': count, 'area': Number.from_parts(_HALF_AREAS[tangram_type] * count, 0, 2),
+                                      'perimeter': _PERIMETERS[tangram_type] * count}
+        return measures
+
+    def puzzle_areas(self) -> dict[Number, int]:
+        """{area: figures} of the summed piece areas of the figures, their areas when no pieces overlap"""
+        import numpy as np
+
+        half_areas = np.zeros(max(tangram_type.value for tangram_type in TangramType) + 1, dtype=np.int64)
+        for tangram_type, half_area in _HALF_AREAS.items():
+            half_areas[tangram_type.value] = half_area
+        starts, _ = self._puzzles()
+        if not len(starts):
+            return {}
+        totals, counts = np.unique(np.add.reduceat(half_areas[self.table.types], starts), return_counts=True)
+        return {Number.from_parts(total, 0, 2): count for total, count in zip(totals.tolist(), counts.tolist())}
+
+    def bounding_boxes(self) -> dict[tuple[Number, Number], int]:
+        """{(width, height): figures} of the exact bounding boxes of the figures"""
+        import numpy as np
+
+        table = self.table
+        orientations = _orientation_index(table.types.astype(np.int64), table.rotations, table.xflips, table.yflips)
+        extents = _extents()
+        offsets = (extents[..., 0] + extents[..., 1] * 2 ** 0.5) / extents[..., 2]
+        bases = (table.coords[..., 0] + table.coords[..., 1] * 2 ** 0.5) / table.coords[..., 2]
+
+        starts, sizes = self._puzzles()
+        if not len(starts):
+            return {}
+        limits = []
+        for column, extreme in enumerate((np.minimum, np.minimum, np.maximum, np.maximum)):
+            # The floats find the extreme piece of each figure, only its exact parts are then worked out
+            values = offsets[orientations, column] + bases[:, column % 2]
+            hits = np.flatnonzero(values == np.repeat(extreme.reduceat(values, starts), sizes))
+            rows = hits[np.searchsorted(hits, starts)]
+            (ea, eb, ed), (ba, bb, bd) = extents[orientations[rows], column].T, table.coords[rows, column % 2].T
+            limits.append((ea * bd + ba * ed, eb * bd + bb * ed, ed * bd))
+
+        sides = []
+        for (la, lb, ld), (ha, hb, hd) in ((limits[0], limits[2]), (limits[1], limits[3])):
+            side = np.stack([ha * ld - la * hd, hb * ld - lb * hd, hd * ld], axis=1)
+            sides.append(side // np.gcd.reduce(side, axis=1)[:, None])
+        # Equal boxes end up next to each other, sorting the rows is much cheaper than np.unique(axis=0)
+        boxes = np.concatenate(sides, axis=1)
+        boxes = boxes[np.lexsort(boxes.T)]
+        firsts = np.flatnonzero(np.concatenate(([True], np.any(boxes[1:] != boxes[:-1], axis=1))))
+        counts = np.diff(np.append(firsts, len(boxes)))
+        return {(Number.from_parts(*box[:3]), Number.from_parts(*box[3:])): count
+                for box, count in zip(boxes[firsts].tolist(), counts.tolist())}
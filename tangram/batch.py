@@ -0,0 +1,228 @@
+
+from pathlib import Path
+import glob
+import os
+import time
+from itertools import repeat
+from typing import Iterable, Iterator
+
+from .TangramPuzzle import TangramPuzzle
+from .fileHandler import FileHandler
+from .fingerprint import FingerprintIndex
+from .profiling import Profiler, merge
+
+
+class BatchResult:
+    """Outcome of processing a single puzzle file, plain data so it pickles cheaply"""
+    def __init__(self, path: str, transformations: dict = None, vertices: str = None,
+                 tex: str = None, error: str = None, elapsed: float = 0.0, diagnostics: list = None,
+                 fingerprint: str = None, duplicate_of: str = None, profile: dict = None):
+        self.path = path
+        self.transformations = transformations
+        self.vertices = vertices
+        self.tex = tex
+        self.error = error
+        self.elapsed = elapsed
+        self.diagnostics = diagnostics or []
+        self.fingerprint = fingerprint
+        self.duplicate_of = duplicate_of
+        self.profile = profile
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f'error: {self.error}'
+        if self.ok and self.diagnostics:
+            status = f'{len(self.diagnostics)} problem(s)'
+        if self.duplicate_of is not None:
+            status = f'duplicate of {self.duplicate_of}'
+        return f"BatchResult({{Path: {self.path}, Status: {status}, Elapsed: {self.elapsed:.4f}s}})"
+
+
+def _process_file(path: str, draw: bool = True, output_dir: str = None, validate: bool = True,
+                  profile: bool = False, cache: bool = False, fingerprint: bool = True) -> BatchResult:
+    """Parse a file, find its vertices, transformations, problems and TeX output, catching any error"""
+    if profile:
+        with Profiler() as profiler:
+            result = _process_file(path, draw, output_dir, validate, cache=cache, fingerprint=fingerprint)
+        result.profile = profiler.snapshot()
+        return result
+    start = time.perf_counter()
+    try:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'no such file: {path}')
+        puzzle = TangramPuzzle(path, cache=cache)
+        if not puzzle.tangrams:
+            raise ValueError('no tangram pieces found')
+        tex = None
+        if draw:
+            tex = puzzle.draw_pieces('', writeout=False)
+            if output_dir is not None:
+                FileHandler.write_tex(content=tex, filename=Path(output_dir) / f'{Path(path).stem}_pieces_on_grid.tex')
+        diagnostics = puzzle.validate() if validate else []
+        return BatchResult(path, transformations=puzzle.transformations, vertices=str(puzzle), tex=tex,
+                           elapsed=time.perf_counter() - start, diagnostics=diagnostics,
+                           fingerprint=puzzle.fingerprint.digest if fingerprint else None)
+    except Exception as error:
+        return BatchResult(path, error=f'{type(error).__name__}: {error}', elapsed=time.perf_counter() - start)
+
+
+def _fingerprint_file(path: str, profile: bool = False, cache: bool = False) -> tuple[str | None, float, dict | None]:
+    """
+    The (fingerprint digest, elapsed, profile) of a file, parsing it and nothing
+    more. The digest is None when the file cannot be parsed, _process_file says why.
+    """
+    if profile:
+        with Profiler() as profiler:
+            digest, elapsed, _ = _fingerprint_file(path, cache=cache)
+        return digest, elapsed, profiler.snapshot()
+    start = time.perf_counter()
+    try:
+        puzzle = TangramPuzzle(path, cache=cache)
+        digest = puzzle.fingerprint.digest if puzzle.tangrams else None
+    except Exception:
+        digest = None
+    return digest, time.perf_counter() - start, None
+
+
+class TangramBatch:
+    """
+    Processes many puzzle files, fanning the work out across a process pool.
+
+    Results come back in the same order as the files, and a file that fails
+    records its error in its result instead of stopping the batch.
+
+    With dedup, every file is first parsed and fingerprinted, which costs a
+    fraction of processing it. A file whose pieces are a rotation, mirror image
+    or translation of an earlier file's (in this run or, with a saved index, a
+    previous one) is then never drawn, validated or written out: its result
+    only names the file it duplicates, whose outputs can be used instead.
+    """
+    def __init__(self, sources: str | Path | Iterable[str | Path], jobs: int = None,
+                 chunksize: int = None, draw: bool = True, output_dir: str | Path = None, validate: bool = True,
+                 dedup: bool | str | Path | FingerprintIndex = False, profile: bool = False, cache: bool = False):
+        """
+        Args:
+            sources: A directory (all .tex files in it), a glob pattern, a file, or an iterable of these
+            jobs: Worker processes to use, defaults to the number of CPUs; 1 runs in this process
+            chunksize: Files sent to a worker at a time, defaults to spreading files evenly over the workers
+            draw: Whether to generate the TeX output of the pieces
+            output_dir: Directory to write the *_pieces_on_grid.tex files to, if any
+            validate: Whether to check every layout, see BatchResult.diagnostics
+            dedup: Whether to skip duplicate puzzles, or the FingerprintIndex (or the path of
+                its JSON file, saved after each run) to check against and add to
+            profile: Whether to time the stages of every file, see TangramBatch.profile
+            cache: Whether to load files through the default ParseCache, see TangramPuzzle
+        """
+        self.paths = self._collect(sources)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.draw = draw
+        self.output_dir = None if output_dir is None else str(output_dir)
+        self.validate = validate
+        if dedup is True:
+            dedup = FingerprintIndex()
+        elif isinstance(dedup, (str, Path)):
+            dedup = FingerprintIndex(dedup)
+        self.index = None if dedup is False or dedup is None else dedup
+        self.profile_stages = profile
+        self.cache = cache
+        self.results = []
+
+    @staticmethod
+    def _collect(sources) -> list[str]:
+        if isinstance(sources, (str, Path)):
+            sources = [sources]
+        paths = []
+        for source in sources:
+            source = str(source)
+            if os.path.isdir(source):
+                paths.extend(sorted(str(path) for path in Path(source).glob('*.tex')))
+            elif glob.has_magic(source):
+                paths.extend(sorted(glob.glob(source, recursive=True)))
+            else:
+                paths.append(source)
+        return paths
+
+    def _chunksize(self, n_paths: int) -> int:
+        if self.chunksize:
+            return self.chunksize
+        # A few chunks per worker balances load without paying for a round trip per file
+        return max(1, n_paths // (self.jobs * 4))
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _map(self, pool, func, paths: list[str], *args) -> Iterator:
+        """func over every path with the same other arguments, in order, on the pool when there is one"""
+        args = (paths, *(repeat(arg) for arg in args))
+        if pool is None:
+            return map(func, *args)
+        return pool.map(func, *args, chunksize=self._chunksize(len(paths)))
+
+    def _deduplicated(self, pool) -> Iterator[BatchResult]:
+        """
+        Fingerprint every file, check the fingerprints against the index in file
+        order, then process only the files that are not duplicates
+        """
+        firsts = list(self._map(pool, _fingerprint_file, self.paths, self.profile_stages, self.cache))
+        originals = []
+        for path, (digest, _, _) in zip(self.paths, firsts):
+            original = None if digest is None else self.index.add(digest, path)
+            originals.append(original if original != path else None)
+        unique = [path for path, original in zip(self.paths, originals) if original is None]
+        results = self._map(pool, _process_file, unique, self.draw, self.output_dir, self.validate,
+                            self.profile_stages, self.cache, False)
+        for path, (digest, elapsed, profile), original in zip(self.paths, firsts, originals):
+            if original is not None:
+                yield BatchResult(path, fingerprint=digest, duplicate_of=original, elapsed=elapsed, profile=profile)
+                continue
+            result = next(results)
+            result.fingerprint = digest if result.ok else None
+            result.elapsed += elapsed
+            if self.profile_stages:
+                result.profile = merge([profile, result.profile])
+            yield result
+        if self.index.path is not None:
+            self.index.save()
+
+    def _results(self, pool) -> Iterator[BatchResult]:
+        if self.index is not None:
+            return self._deduplicated(pool)
+        return self._map(pool, _process_file, self.paths, self.draw, self.output_dir, self.validate,
+                         self.profile_stages, self.cache)
+
+    def __iter__(self) -> Iterator[BatchResult]:
+        """Yield results in file order as they become available"""
+        if self.jobs == 1 or len(self.paths) <= 1:
+            yield from self._results(None)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            yield from self._results(pool)
+
+    def run(self) -> list[BatchResult]:
+        self.results = list(self)
+        return self.results
+
+    @property
+    def errors(self) -> list[BatchResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def profile(self) -> dict[str, dict]:
+        """Stage timings summed over every file, when run with profile (see profiling.to_prometheus)"""
+        return merge(result.profile for result in self.results)
+
+    @property
+    def duplicates(self) -> list[BatchResult]:
+        """Results of files found to duplicate an earlier one"""
+        return [result for result in self.results if result.duplicate_of is not None]
+
+    @property
+    def invalid(self) -> list[BatchResult]:
+        """Results of files that parsed but whose layout has problems"""
+        return [result for result in self.results if result.diagnostics]
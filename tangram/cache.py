@@ -0,0 +1,259 @@
+
+from pathlib import Path
+import hashlib
+import os
+import struct
+from array import array
+from functools import lru_cache
+
+from .elements.tangram import Tangram, TangramType, base_shapes, oriented_vertices, rotation_values
+from .parser import PARSER_VERSION, parse_content
+from .utils.coords import Number
+
+# Bump when the layout below changes, old entries are then simply never looked up again
+FORMAT_VERSION = 1
+_MAGIC = b'TGPC'
+# magic, format version, parser version, number of pieces, number of vertices, number of distinct coordinates
+_HEADER = struct.Struct('<4sHHIII')
+_TYPES = {tangram_type.value: tangram_type for tangram_type in TangramType}
+# Coordinates repeat a lot across a corpus, so decoded Numbers are shared between entries
+_NUMBERS = {}
+_MAX_NUMBERS = 1 << 16
+
+
+def _parts(value) -> tuple[int, int, int]:
+    return value.parts if isinstance(value, Number) else Number(value).parts
+
+
+def _encode(tangrams: list[Tangram]) -> bytes:
+    """
+    Pack the pieces into the cache layout: the header, then per piece columns
+    of type codes (B), rotations (H), flip bits (B) and line numbers (q, -1 for none),
+    then a table of the integer parts (a, b, d) of every distinct coordinate (q)
+    and the index into it of the x and y of each piece's base coordinates
+    followed by its vertices (I).
+    """
+    types, rotations, flips, line_numbers = array('B'), array('H'), array('B'), array('q')
+    table, indexes = {}, array('I')
+    n_vertices = 0
+    for gram in tangrams:
+        types.append(gram.tangram_type.value)
+        rotations.append(gram.rotate)
+        flips.append(gram.xflip | gram.yflip << 1)
+        line_numbers.append(-1 if gram.line_number is None else gram.line_number)
+        for point in (gram.base_coords, *gram.vertices):
+            for value in point:
+                indexes.append(table.setdefault(_parts(value), len(table)))
+        n_vertices += len(gram.vertices)
+    parts = array('q', [part for value in table for part in value])
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, PARSER_VERSION, len(tangrams), n_vertices, len(table))
+    return b''.join((header, types.tobytes(), rotations.tobytes(), flips.tobytes(),
+                     line_numbers.tobytes(), parts.tobytes(), indexes.tobytes()))
+
+
+def _decode(data: bytes) -> list[Tangram]:
+    """The pieces of an entry, raising ValueError if it is for another version or is truncated or corrupt"""
+    if len(data) < _HEADER.size:
+        raise ValueError('truncated parse cache entry')
+    magic, format_version, parser_version, n_pieces, n_vertices, n_numbers = _HEADER.unpack_from(data)
+    if magic != _MAGIC or format_version != FORMAT_VERSION or parser_version != PARSER_VERSION:
+        raise ValueError('not a parse cache entry for this version')
+
+    layout = (('B', n_pieces), ('H', n_pieces), ('B', n_pieces), ('q', n_pieces),
+              ('q', n_numbers * 3), ('I', (n_pieces + n_vertices) * 2))
+    size = _HEADER.size + sum(count * array(typecode).itemsize for typecode, count in layout)
+    if len(data) != size:
+        raise ValueError(f'parse cache entry is {len(data)} bytes, expected {size}')
+
+    columns = []
+    offset = _HEADER.size
+    for typecode, count in layout:
+        column = array(typecode)
+        column.frombytes(data[offset:offset + count * column.itemsize])
+        offset += count * column.itemsize
+        columns.append(column)
+    types, rotations, flips, line_numbers, parts, indexes = columns
+    # Every piece needs its base coordinates and one point per vertex of its shape
+    if any(value not in _TYPES for value in types) or \
+            sum(1 + len(base_shapes[_TYPES[value]]) for value in types) * 2 != len(indexes) or \
+            (indexes and max(indexes) >= n_numbers) or 0 in parts[2::3]:
+        raise ValueError('corrupt parse cache entry')
+
+    numbers = []
+    for key in zip(parts[0::3], parts[1::3], parts[2::3]):
+        number = _NUMBERS.get(key)
+        if number is None:
+            if len(_NUMBERS) >= _MAX_NUMBERS:
+                _NUMBERS.clear()
+            number = _NUMBERS[key] = Number.from_parts(*key)
+        numbers.append(number)
+    points = iter([(numbers[x], numbers[y]) for x, y in zip(indexes[::2], indexes[1::2])])
+
+    tangrams = []
+    for idx in range(n_pieces):
+        tangram_type = _TYPES[types[idx]]
+        line_number = line_numbers[idx]
+        tangrams.append(Tangram._restore(
+            tangram_type, rotations[idx], bool(flips[idx] & 1), bool(flips[idx] & 2), next(points),
+            tuple(next(points) for _ in base_shapes[tangram_type]), None if line_number < 0 else line_number))
+    return tangrams
+
+
+class ParseCache:
+    """
+    Directory of parsed puzzles, so unchanged sources are not parsed again across runs.
+
+    Entries are keyed by the SHA-256 of the file content, the parser and
+    format versions and the piece geometry (the oriented shapes vertices are
+    worked out from), so an edited file, a parser change or a change to the
+    shapes is a miss rather than a stale hit. Reading an entry touches it, and
+    once the directory holds more than max_bytes the least recently used
+    entries are removed. An entry that can't be read back is deleted and
+    treated as a miss, and failing to write one only skips caching.
+    """
+    def __init__(self, directory: str | Path = None, max_bytes: int = 256 * 2**20):
+        """
+        Args:
+            directory: Where to keep the entries, defaults to $TANGRAM_CACHE_DIR or ~/.cache/tangram
+            max_bytes: Total size of the entries to keep
+        """
+        if directory is None:
+            directory = os.environ.get('TANGRAM_CACHE_DIR') or Path.home() / '.cache' / 'tangram'
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        digest = hashlib.sha256(content)
+        digest.update(b'parser-%d-format-%d-geometry-' % (PARSER_VERSION, FORMAT_VERSION))
+        digest.update(_geometry())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.bin'
+
+    def get(self, key: str) -> list[Tangram] | None:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            tangrams = _decode(data)
+        except Exception:
+            # Corrupt, truncated or from another version: drop it so the next put replaces it
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self._size = None
+            return None
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return tangrams
+
+    def put(self, key: str, tangrams: list[Tangram]):
+        """Store an entry, doing nothing if the directory can't be written to"""
+        data = _encode(tangrams)
+        path = self._path(key)
+        # Write then rename, so a concurrent reader never sees half an entry
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            try:
+                temporary.unlink()
+            except OSError:
+                pass
+            return
+        if self._size is not None:
+            self._size += len(data)
+        if self.size > self.max_bytes:
+            # Go a little under the limit so the next few puts don't each rescan the directory
+            self.evict(self.max_bytes * 9 // 10)
+
+    def load(self, path: str | Path) -> list[Tangram]:
+        """Tangrams of a file, from the cache when its content has been parsed before"""
+        with open(path, 'rb') as file:
+            content = file.read()
+        key = self.key(content)
+        tangrams = self.get(key)
+        if tangrams is not None:
+            self.hits += 1
+            return tangrams
+        self.misses += 1
+        tangrams = parse_content(content)
+        if tangrams:
+            self.put(key, tangrams)
+        return tangrams
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.directory.glob('*/*.bin'):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the entries, counted once then kept up to date by put and evict"""
+        if self._size is None:
+            self._size = sum(stat.st_size for _, stat in self._entries())
+        return self._size
+
+    def evict(self, max_bytes: int = None):
+        """Remove the least recently used entries until at most max_bytes are left"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime_ns)
+        size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if size <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= stat.st_size
+        self._size = size
+
+    def clear(self):
+        self.evict(0)
+
+
+@lru_cache(maxsize=None)
+def _geometry() -> bytes:
+    """Digest of every oriented piece shape, entries store vertices worked out from these"""
+    digest = hashlib.sha256()
+    for tangram_type in TangramType:
+        for rotate in rotation_values:
+            for xflip in (False, True):
+                for yflip in (False, True):
+                    vertices = oriented_vertices(tangram_type, rotate, xflip, yflip)
+                    digest.update(repr((tangram_type.value, rotate, xflip, yflip,
+                                        [(x.parts, y.parts) for x, y in vertices])).encode())
+    return digest.digest()
+
+
+_default_cache = None
+
+
+def default_cache() -> ParseCache | None:
+    """The shared cache used with cache=True, None when $TANGRAM_NO_CACHE is set"""
+    global _default_cache
+    if os.environ.get('TANGRAM_NO_CACHE'):
+        return None
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
@@ -0,0 +1,312 @@
+
+from pathlib import Path
+import argparse
+import io
+import json
+import os
+import stat
+import sys
+from itertools import repeat
+from typing import Iterable, TextIO
+
+from .batch import TangramBatch
+from .cache import ParseCache, default_cache
+from .fileHandler import FileHandler
+from .parser import parse_content
+from .TangramPuzzle import TangramPuzzle
+
+STDIN = '-'
+
+
+def _transforms(puzzle: TangramPuzzle) -> str:
+    return '\n'.join(f'{piece:16}: {transforms}' for piece, transforms in puzzle.transformations.items())
+
+
+def _vertices(puzzle: TangramPuzzle) -> str:
+    return str(puzzle)
+
+
+def _pieces(puzzle: TangramPuzzle) -> str:
+    return puzzle.draw_pieces('', writeout=False)
+
+
+def _outline(puzzle: TangramPuzzle) -> str:
+    return puzzle.draw_outline('', writeout=False)
+
+
+def _validate(puzzle: TangramPuzzle) -> str:
+    return '\n'.join(str(diagnostic) for diagnostic in puzzle.validate()) or 'valid'
+
+
+# Command: (what it prints for a puzzle, suffix of the file it writes to an output directory)
+COMMANDS = {
+    'transforms': (_transforms, '_transforms.txt'),
+    'vertices': (_vertices, '_vertices.txt'),
+    'pieces': (_pieces, '_pieces_on_grid.tex'),
+    'outline': (_outline, '_outline_on_grid.tex'),
+    'validate': (_validate, '_validate.txt'),
+}
+
+
+def render(command: str, puzzle: TangramPuzzle, filename: str | Path = None) -> str | None:
+    """
+    Output of a command for a puzzle, or None once it is written to filename.
+    Documents are streamed to the file rather than built as one string.
+    """
+    if filename is not None and command in ('pieces', 'outline'):
+        getattr(puzzle, f'draw_{command}')(filename)
+        return None
+    text = COMMANDS[command][0](puzzle)
+    if filename is None:
+        return text
+    FileHandler.write_tex(content=text + '\n', filename=filename)
+    return None
+
+
+def _load(source: str, text: str = None, cache: bool = False) -> TangramPuzzle:
+    puzzle = TangramPuzzle(io.StringIO(text)) if text is not None else TangramPuzzle(source, cache=cache)
+    if not puzzle.tangrams:
+        raise ValueError('no tangram pieces found')
+    return puzzle
+
+
+def _run(command: str, source: str, output_dir: str = None, text: str = None,
+         cache: bool = False) -> tuple[str | None, str | None, bool]:
+    """(output, error, whether the puzzle has problems) of a command on one source, catching any error"""
+    try:
+        if text is None and not os.path.isfile(source):
+            raise FileNotFoundError(f'no such file: {source}')
+        puzzle = _load(source, text, cache)
+        filename = None
+        if output_dir is not None:
+            stem = 'stdin' if source == STDIN else Path(source).stem
+            filename = Path(output_dir) / f'{stem}{COMMANDS[command][1]}'
+        problems = command == 'validate' and bool(puzzle.validate())
+        return render(command, puzzle, filename), None, problems
+    except Exception as error:
+        return None, f'{type(error).__name__}: {error}', False
+
+
+def run(command: str, sources: list[str], output: TextIO, output_dir: str | Path = None, jobs: int = None,
+        stdin: TextIO = None, cache: bool = False) -> int:
+    """
+    Run a command over the sources in order, writing each output to output or
+    into output_dir. Returns the exit status: 1 if no file matched the sources,
+    any source failed or, for validate, had problems.
+
+    Args:
+        command: One of COMMANDS
+        sources: Files, directories (all .tex files in them) and glob patterns, '-' for stdin
+        output: Where outputs go without an output_dir, with a header per source when there are several
+        output_dir: Directory to write a file per source to
+        jobs: Worker processes for the files, defaults to the number of CPUs
+        stdin: Text file '-' reads from, defaults to sys.stdin
+        cache: Whether to load files through the default ParseCache
+    """
+    paths = TangramBatch._collect([source for source in sources if source != STDIN])
+    if not paths and STDIN not in sources:
+        # A glob or directory that matched nothing would otherwise succeed silently
+        print('tangram: no input files matched', file=sys.stderr)
+        return 1
+    output_dir = None if output_dir is None else str(output_dir)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    results = []
+    if STDIN in sources:
+        text = (stdin or sys.stdin).read()
+        results.append((STDIN, _run(command, STDIN, output_dir, text)))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        results.extend(zip(paths, map(_run, repeat(command), paths, repeat(output_dir), repeat(None), repeat(cache))))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(paths) // (jobs * 4))
+            results.extend(zip(paths, pool.map(_run, repeat(command), paths, repeat(output_dir), repeat(None),
+                                               repeat(cache), chunksize=chunksize)))
+
+    status = 0
+    headers = len(results) > 1
+    for source, (text, error, problems) in results:
+        if error is not None:
+            print(f'tangram: {source}: {error}', file=sys.stderr)
+            status = 1
+            continue
+        status = 1 if problems else status
+        if text is not None:
+            if headers:
+                output.write(f'==> {source} <==\n')
+            output.write(text + '\n')
+    return status
+
+
+class TangramServer:
+    """
+    Answers requests for many puzzles from one process, so the interpreter
+    starts once and parsed puzzles stay in memory between requests.
+
+    Every request is one line of JSON and gets one line of JSON back:
+    {"command": "pieces", "path": "cat.tex"} or {"command": ..., "tex": "..."}
+    for the document text itself, with an optional "output" file to write to
+    and an "id" echoed in the response. A response is {"ok": true, "output": text}
+    (or "path": the output file) or {"ok": false, "error": message}.
+
+    With a root directory, as when serving a socket other processes can reach,
+    paths are relative to it and requests for anything outside it are refused.
+    """
+    # Puzzles kept in memory, forgotten all at once when full
+    max_puzzles = 1024
+
+    def __init__(self, cache: ParseCache | bool = False, root: str | Path = None):
+        """
+        Args:
+            cache: ParseCache to keep parses in across restarts, True for the default cache, False for none
+            root: Directory every path and output must be inside, None for no restriction
+        """
+        self.cache = default_cache() if cache is True else cache or None
+        self.root = None if root is None else Path(root).resolve()
+        self.puzzles = {}
+
+    def _resolve(self, path: str) -> Path:
+        if self.root is None:
+            return Path(path)
+        resolved = (self.root / path).resolve()
+        if resolved != self.root and self.root not in resolved.parents:
+            raise PermissionError(f'outside {self.root}: {path}')
+        return resolved
+
+    def puzzle(self, content: bytes) -> TangramPuzzle:
+        """The puzzle of a document, parsed once and reused with its derived values while it is unchanged"""
+        key = ParseCache.key(content)
+        puzzle = self.puzzles.get(key)
+        if puzzle is None:
+            tangrams = self.cache.get(key) if self.cache is not None else None
+            if tangrams is None:
+                tangrams = parse_content(content)
+                if tangrams and self.cache is not None:
+                    self.cache.put(key, tangrams)
+            if not tangrams:
+                raise ValueError('no tangram pieces found')
+            if len(self.puzzles) >= self.max_puzzles:
+                self.puzzles.clear()
+            puzzle = self.puzzles[key] = TangramPuzzle(tangrams=tangrams)
+        return puzzle
+
+    def handle(self, request: dict) -> dict:
+        response = {'id': request['id']} if 'id' in request else {}
+        try:
+            command = request.get('command')
+            if command not in COMMANDS:
+                raise ValueError(f'unknown command: {command}')
+            if 'tex' in request:
+                content = request['tex'].encode()
+            elif 'path' in request:
+                with open(self._resolve(request['path']), 'rb') as file:
+                    content = file.read()
+            else:
+                raise ValueError('request needs a path or tex')
+            output = request.get('output')
+            text = render(command, self.puzzle(content), None if output is None else self._resolve(output))
+            response.update({'ok': True, 'output': text} if text is not None else {'ok': True, 'path': request['output']})
+        except Exception as error:
+            response.update({'ok': False, 'error': f'{type(error).__name__}: {error}'})
+        return response
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('request is not a JSON object')
+        except ValueError as error:
+            return json.dumps({'ok': False, 'error': f'bad request: {error}'})
+        return json.dumps(self.handle(request))
+
+    def serve_lines(self, lines: Iterable[str], output: TextIO):
+        """Answer each request line in turn, flushing after each so a pipe gets it straight away"""
+        for line in lines:
+            if not line.strip():
+                continue
+            output.write(self.handle_line(line) + '\n')
+            output.flush()
+
+    def serve_socket(self, address: str | int):
+        """Serve connections on a Unix socket path, or a TCP port on localhost, until interrupted"""
+        import socketserver
+        import threading
+
+        server = self
+        lock = threading.Lock()
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    # Connections share the puzzles, one request at a time
+                    with lock:
+                        response = server.handle_line(line.decode())
+                    self.wfile.write(response.encode() + b'\n')
+
+        if isinstance(address, int):
+            socket_server = socketserver.ThreadingTCPServer(('127.0.0.1', address), Handler)
+        else:
+            # Only a stale socket is replaced, never a file that happens to have the name
+            if os.path.lexists(address):
+                if not stat.S_ISSOCK(os.lstat(address).st_mode):
+                    raise FileExistsError(f'not a socket: {address}')
+                os.unlink(address)
+            socket_server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        socket_server.daemon_threads = True
+        print(f'tangram: serving on {socket_server.server_address}', file=sys.stderr)
+        with socket_server:
+            try:
+                socket_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                if not isinstance(address, int):
+                    os.unlink(address)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='tangram', description='Analyse and draw tangram puzzles')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command, description in [
+        ('transforms', 'print the rotation and flips of every piece'),
+        ('vertices', 'print the vertices of every piece'),
+        ('pieces', 'draw the pieces on a grid as TeX'),
+        ('outline', 'draw the outline on a grid as TeX'),
+        ('validate', 'check for wrong pieces, overlaps and holes, exiting with 1 if any are found'),
+    ]:
+        subparser = commands.add_parser(command, help=description, description=description)
+        subparser.add_argument('sources', nargs='*', default=[STDIN],
+                               help="files, directories and glob patterns, '-' or nothing for stdin")
+        subparser.add_argument('-o', '--output', default=STDIN, help="file to write to, default stdout")
+        subparser.add_argument('-d', '--output-dir', help='write a file per source to this directory instead')
+        subparser.add_argument('-j', '--jobs', type=int, help='worker processes, default the number of CPUs')
+        subparser.add_argument('--cache', action='store_true', help='load files through the on-disk parse cache')
+
+    serve = commands.add_parser('serve', help='answer JSON line requests from one warm process',
+                                description=TangramServer.__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    where = serve.add_mutually_exclusive_group()
+    where.add_argument('--socket', help='listen on this Unix socket path instead of stdin')
+    where.add_argument('--port', type=int, help='listen on this TCP port on localhost instead of stdin')
+    serve.add_argument('--root', default='.',
+                       help='with --socket or --port, the directory requests may read and write in, default the current one')
+    serve.add_argument('--cache', action='store_true', help='also keep parses in the on-disk cache')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        if args.socket is not None or args.port is not None:
+            server = TangramServer(cache=args.cache, root=args.root)
+            server.serve_socket(args.socket if args.socket is not None else args.port)
+        else:
+            TangramServer(cache=args.cache).serve_lines(sys.stdin, sys.stdout)
+        return 0
+
+    if args.output == STDIN:
+        return run(args.command, args.sources, sys.stdout, args.output_dir, args.jobs, cache=args.cache)
+    with open(args.output, 'w') as output:
+        return run(args.command, args.sources, output, args.output_dir, args.jobs, cache=args.cache)
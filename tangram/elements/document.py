@@ -1,12 +1,12 @@
 from pathlib import Path
-import sys
+import io
 from collections import deque
+from typing import Iterable, Iterator, TextIO
 
-sys.path.append((Path.cwd() / 'tangram').__str__())
-from elements.base import LatexElement
-from elements.tangram import Tangram, TangramType, TexTangram
+from .base import LatexElement
+from .tangram import Tangram, TangramType, TexTangram
 from enum import Enum, auto
-from utils.coords import arc_sort, Number
+from ..utils.coords import arc_sort, Number
 
 document_header = [
         r'\documentclass{standalone}',
@@ -21,7 +21,12 @@ document_footer = [
     r'\end{document}',
 ]
 class TangramPieces:
-    def __init__(self, grid: tuple[tuple], tangrams: list[Tangram]):
+    def __init__(self, grid: tuple[tuple], tangrams: Iterable[Tangram]):
+        """
+        Args:
+            grid: Lower left and upper right corners of the grid
+            tangrams: The pieces to draw, any iterable (it is only read once when streamed with write)
+        """
         self.origin = r'\fill[red] (0,0) circle (3pt);'
         self.grid = grid
         self.tangrams = tangrams
@@ -30,18 +35,54 @@ class TangramPieces:
     @property
     def grid_definition(self):
         return r'\draw[step=5mm] ' + str(self.grid[0]) + ' grid ' + str(self.grid[1]) + ';'
-    
-    def _generate_tangram_body(self):
-        content = ['\t'+self.grid_definition]
+
+    def _iter_body(self) -> Iterator[str]:
+        yield '\t' + self.grid_definition
         for gram in self.tangrams:
-            content.append('\t' + TexTangram(tangram=gram, type='pieces').content)
-        content.append('\t' + self.origin)
-        return '\n'.join(content)
-    
+            yield '\n\t' + TexTangram.piece(gram.vertices)
+        yield '\n\t' + self.origin
+
+    def _generate_tangram_body(self):
+        return ''.join(self._iter_body())
+
+    def iter_content(self) -> Iterator[str]:
+        """The document in pieces, header first, which joined together give generate_content()"""
+        yield '\n'.join(document_header) + '\n'
+        yield from self._iter_body()
+        yield '\n' + '\n'.join(document_footer)
+
+    def write(self, file: str | Path | TextIO, buffer_size: int = 2**20):
+        """
+        Stream the document to a path or open text file, one line at a time,
+        so the whole document is never held in memory.
+
+        Args:
+            file: Path or open text file to write to
+            buffer_size: Bytes to buffer before writing to disk, when given a path
+        """
+        if not hasattr(file, 'write'):
+            with open(file, 'w', buffering=buffer_size) as opened:
+                return self.write(opened)
+        file.writelines(self.iter_content())
+
     def generate_content(self):
-        tangram_body = self._generate_tangram_body()
-        content = '\n'.join(document_header) + '\n'
-        content += tangram_body + '\n'
-        content += '\n'.join(document_footer)
-        self.content = content
-        return content
\ No newline at end of file
+        buffer = io.StringIO()
+        self.write(buffer)
+        self.content = buffer.getvalue()
+        return self.content
+
+
+class TangramOutline(TangramPieces):
+    def __init__(self, grid: tuple[tuple], outline: list[tuple]):
+        """
+        Args:
+            grid: Lower left and upper right corners of the grid
+            outline: Vertices of the outline, clockwise
+        """
+        super().__init__(grid, tangrams=[])
+        self.outline = outline
+
+    def _iter_body(self) -> Iterator[str]:
+        yield '\t' + self.grid_definition
+        yield '\n\t' + TexTangram(tangram=self.outline, type='outline').content
+        yield '\n\t' + self.origin
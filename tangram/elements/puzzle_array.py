@@ -0,0 +1,189 @@
+
+from array import array
+from typing import Iterable, Iterator, TextIO
+
+import numpy as np
+
+from .tangram import Tangram, TangramType, normalise_transforms, oriented_vertices
+from ..parser import iter_environment_records
+from ..utils.coords import Number
+
+_TYPES = {tangram_type.value: tangram_type for tangram_type in TangramType}
+
+
+def _parts(value) -> tuple[int, int, int]:
+    return value.parts if isinstance(value, Number) else Number(value).parts
+
+
+class PieceView:
+    """
+    A single piece of a PuzzleArray. Has the same attributes as Tangram but
+    only holds the array and its row, everything else is read from the columns.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, puzzle_array: 'PuzzleArray', index: int):
+        self._array = puzzle_array
+        self._index = index
+
+    @property
+    def tangram_type(self) -> TangramType:
+        return _TYPES[int(self._array.types[self._index])]
+
+    @property
+    def rotate(self) -> int:
+        return int(self._array.rotations[self._index])
+
+    @property
+    def xflip(self) -> bool:
+        return bool(self._array.xflips[self._index])
+
+    @property
+    def yflip(self) -> bool:
+        return bool(self._array.yflips[self._index])
+
+    @property
+    def line_number(self) -> int | None:
+        line_number = int(self._array.line_numbers[self._index])
+        return None if line_number < 0 else line_number
+
+    @property
+    def base_coords(self) -> tuple[Number, Number]:
+        (xa, xb, xd), (ya, yb, yd) = self._array.coords[self._index].tolist()
+        return (Number.from_parts(xa, xb, xd), Number.from_parts(ya, yb, yd))
+
+    @property
+    def transformations(self) -> dict:
+        return {
+            'xflip': self.xflip,
+            'yflip': self.yflip,
+            'rotate': self.rotate,
+        }
+
+    @property
+    def vertices(self) -> tuple[tuple, ...]:
+        x_shift, y_shift = self.base_coords
+        return tuple((x + x_shift, y + y_shift)
+                     for x, y in oriented_vertices(self.tangram_type, self.rotate, self.xflip, self.yflip))
+
+    @property
+    def _grid(self):
+        xs = [x for x, _ in self.vertices]
+        ys = [y for _, y in self.vertices]
+        return ((min(xs), min(ys)), (max(xs), max(ys)))
+
+    def to_tangram(self) -> Tangram:
+        """A full Tangram with the same piece"""
+        return Tangram(self.tangram_type, {'rotate': self.rotate, 'xscale': -self.xflip, 'yscale': -self.yflip},
+                       self.base_coords, line_number=self.line_number)
+
+    def __repr__(self):
+        return f"PieceView (Type: {self.tangram_type}, Transforms: {{xflip: {self.xflip}, yflip: {self.yflip}, rotate: {self.rotate}}}, Base: {self.base_coords})"
+
+
+class PuzzleArray:
+    """
+    Columnar store for the pieces of many puzzles.
+
+    Each column is a typed array with one entry per piece: the TangramType
+    value, the normalised rotation, the two flips, the line number and the
+    base coordinates as the integer parts (a, b, d) of (a + b√2)/d for each
+    axis. Puzzles are contiguous runs of rows given by puzzle_offsets.
+    Indexing gives PieceView objects that quack like Tangram, so a
+    TangramPuzzle can be run over a puzzle without building Tangrams.
+    """
+
+    def __init__(self, types, rotations, xflips, yflips, coords, line_numbers=None, puzzle_sizes=None):
+        """
+        Args:
+            types: TangramType value of every piece
+            rotations: Normalised rotation of every piece (a multiple of 45 in [0, 360))
+            xflips: Whether every piece is flipped on the x-axis
+            yflips: Whether every piece is flipped on the y-axis
+            coords: (n_pieces, 2, 3) integer parts (a, b, d) of the x and y base coordinates
+            line_numbers: Line of every piece in its source, -1 when unknown
+            puzzle_sizes: Number of pieces in each puzzle, when the array holds several
+        """
+        self.types = np.asarray(types, dtype=np.uint8)
+        self.rotations = np.asarray(rotations, dtype=np.uint16)
+        self.xflips = np.asarray(xflips, dtype=bool)
+        self.yflips = np.asarray(yflips, dtype=bool)
+        self.coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2, 3)
+        if line_numbers is None:
+            line_numbers = np.full(len(self.types), -1)
+        self.line_numbers = np.asarray(line_numbers, dtype=np.int32)
+        if puzzle_sizes is None:
+            puzzle_sizes = [len(self.types)]
+        self.puzzle_offsets = np.concatenate(([0], np.cumsum(puzzle_sizes, dtype=np.int64)))
+
+    @classmethod
+    def from_records(cls, puzzles: Iterable[list[tuple]]) -> 'PuzzleArray':
+        """
+        Build the columns from (tangram_type, transform_params, base_coords, line_number)
+        records, one list per puzzle, without creating a Tangram for any piece.
+        """
+        types, rotations, xflips, yflips = array('B'), array('H'), array('B'), array('B')
+        coords, line_numbers, puzzle_sizes = array('q'), array('q'), array('q')
+        for records in puzzles:
+            for tangram_type, transform_params, (x, y), line_number in records:
+                rotate, xflip, yflip = normalise_transforms(transform_params)
+                types.append(tangram_type.value)
+                rotations.append(rotate)
+                xflips.append(xflip)
+                yflips.append(yflip)
+                coords.extend(_parts(x))
+                coords.extend(_parts(y))
+                line_numbers.append(-1 if line_number is None else line_number)
+            puzzle_sizes.append(len(records))
+        return cls(types, rotations, xflips, yflips, coords, line_numbers, puzzle_sizes)
+
+    @classmethod
+    def from_source(cls, source: str | TextIO) -> 'PuzzleArray':
+        """Parse a path or open text file, one puzzle per EnvTangramTikz environment"""
+        return cls.from_records(iter_environment_records(source))
+
+    @classmethod
+    def from_puzzles(cls, puzzles: Iterable[Iterable[Tangram]]) -> 'PuzzleArray':
+        return cls.from_records(
+            [(gram.tangram_type, {'rotate': gram.rotate, 'xscale': -gram.xflip, 'yscale': -gram.yflip},
+              gram.base_coords, gram.line_number) for gram in tangrams]
+            for tangrams in puzzles)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> PieceView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('piece index out of range')
+        return PieceView(self, index)
+
+    def __iter__(self) -> Iterator[PieceView]:
+        return (PieceView(self, index) for index in range(len(self)))
+
+    @property
+    def n_puzzles(self) -> int:
+        return len(self.puzzle_offsets) - 1
+
+    def puzzle(self, puzzle: int) -> list[PieceView]:
+        """Views of the pieces of one puzzle"""
+        start, end = self.puzzle_offsets[puzzle], self.puzzle_offsets[puzzle + 1]
+        return [PieceView(self, index) for index in range(int(start), int(end))]
+
+    def iter_puzzles(self) -> Iterator[list[PieceView]]:
+        for puzzle in range(self.n_puzzles):
+            yield self.puzzle(puzzle)
+
+    def vertex_batch(self):
+        """A VertexBatch over every piece, to compute all vertices at once"""
+        from .vertices import VertexBatch
+        return VertexBatch(self.types, self.rotations, self.xflips, self.yflips,
+                           [piece.base_coords for piece in self],
+                           puzzle_sizes=np.diff(self.puzzle_offsets))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns"""
+        return sum(column.nbytes for column in (self.types, self.rotations, self.xflips, self.yflips,
+                                                self.coords, self.line_numbers, self.puzzle_offsets))
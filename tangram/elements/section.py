@@ -1,5 +1,5 @@
 
-from base import LatexElement
+from .base import LatexElement
 
 
 class Section(LatexElement):
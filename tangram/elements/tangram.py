@@ -1,13 +1,11 @@
 
-from pathlib import Path
-import sys
 from collections import deque
+from functools import cached_property
 
-sys.path.append((Path.cwd() / 'tangram').__str__())
-from elements.base import LatexElement
+from .base import LatexElement
 from enum import Enum, auto
 from typing import Literal
-from utils.coords import arc_sort, Number
+from ..utils.coords import arc_sort, Number
 
 _TEX_OBJECTS = Literal['outline', 'pieces']
 
@@ -33,6 +31,16 @@ class TangramType(Enum):
         return f"{_smap[self]}"
 
 
+# The pieces of one tangram set
+STANDARD_SET = {
+    TangramType.TRIANGLE_LARGE: 2,
+    TangramType.TRIANGLE_MEDIUM: 1,
+    TangramType.TRIANGLE_SMALL: 2,
+    TangramType.SQUARE: 1,
+    TangramType.PARALLELOGRAM: 1,
+}
+
+
 rotation_values = {
             0: (Number(1, 0), Number(0, 0)),
             45: (Number(0, 1/2), Number(0, 1/2)),
@@ -64,8 +72,148 @@ base_shapes = {
                                 (Number(1),Number(1))],
 }
 
+def _sort_clockwise(vertices: list[tuple]) -> list[tuple]:
+    """Order vertices clockwise, starting from the topmost then leftmost vertex"""
+    topleft_vertex = max(vertices, key=lambda v: (v[1],-v[0]))
+    
+    start_idx = vertices.index(topleft_vertex)
+
+    # Rotating clockwise to find next point
+    start_vertex = vertices[start_idx]
+    angles = []
+    for vertex in vertices:
+        angles.append(-arc_sort(start_vertex, vertex))
+
+    vertices_sorted = deque([v for _, v in sorted(zip(angles, vertices), reverse=True)])
+    
+    # Ensuring the start point is the starting point
+    start_idx = vertices_sorted.index(start_vertex)
+    vertices_sorted.rotate(-start_idx)
+
+    return list(vertices_sorted)
+
+
+def _orient_shape(tangram_type: TangramType, rotate: int, xflip: bool, yflip: bool) -> tuple:
+    """Rotate and flip a base shape about the origin, then sort its vertices"""
+    vertices = base_shapes[tangram_type]
+
+    # Apply transformations based on tangram params
+    if rotate:
+        cos_theta, sin_theta = rotation_values[rotate]
+        rotated_vertices = []
+        for x, y in vertices:
+            # Rotation matrix multiplication with Number objects
+            new_x = x * cos_theta - y * sin_theta
+            new_y = x * sin_theta + y * cos_theta
+            rotated_vertices.append((new_x, new_y))
+        vertices = rotated_vertices
+    
+    if xflip:
+        vertices = [(-x, y) for x, y in vertices]
+    
+    if yflip:
+        vertices = [(x, -y) for x, y in vertices]
+
+    return tuple(_sort_clockwise(vertices))
+
+
+# Sorted local vertices keyed by (TangramType, rotate, xflip, yflip), built on first use
+orientation_table = {}
+# Maps every (TangramType, rotate, xflip, yflip) to its equivalent canonical key
+_canonical_orientations = {}
+
+
+def _build_orientation_table():
+    for tangram_type in base_shapes:
+        seen = {}
+        keys = [(tangram_type, rotate, xflip, yflip)
+                for rotate in rotation_values for xflip in (False, True) for yflip in (False, True)]
+        # normalise_transforms turns both flips into a half turn, so a key with both
+        # flips is never canonical: it maps to the equivalent key seen before it
+        keys.sort(key=lambda key: key[2] and key[3])
+        for key in keys:
+            vertices = _orient_shape(*key)
+            orientation_table[key] = vertices
+            # Symmetric pieces give the same shape (up to translation) for several
+            # orientations, so compare the vertices relative to the first one
+            start_x, start_y = vertices[0]
+            shape = frozenset((x - start_x, y - start_y) for x, y in vertices)
+            _canonical_orientations[key] = seen[shape] if key[2] and key[3] else seen.setdefault(shape, key)
+
+
+def oriented_vertices(tangram_type: TangramType, rotate: int = 0, xflip: bool = False, yflip: bool = False) -> tuple:
+    """
+    Sorted vertices of a piece rotated and flipped about the origin.
+    Translating these by a piece's base coordinates gives its vertices.
+    """
+    if not orientation_table:
+        _build_orientation_table()
+    return orientation_table[(tangram_type, rotate, xflip, yflip)]
+
+
+def canonical_orientation(tangram_type: TangramType, rotate: int = 0, xflip: bool = False, yflip: bool = False) -> tuple:
+    """
+    The equivalent orientation of a piece with the smallest rotation, then fewest flips,
+    e.g. a square rotated by 90 is an unrotated square shifted one unit left.
+
+    Returns (rotate, xflip, yflip, (dx, dy)) where (dx, dy) is added to the base
+    coordinates so the canonical orientation covers the same vertices.
+    """
+    if not orientation_table:
+        _build_orientation_table()
+    key = (tangram_type, rotate, xflip, yflip)
+    canonical = _canonical_orientations[key]
+    (x, y), (canonical_x, canonical_y) = orientation_table[key][0], orientation_table[canonical][0]
+    return (*canonical[1:], (x - canonical_x, y - canonical_y))
+
+
+def distinct_orientations(tangram_type: TangramType) -> list[tuple]:
+    """Every (rotate, xflip, yflip) of a piece that gives a different shape"""
+    if not orientation_table:
+        _build_orientation_table()
+    return [key[1:] for key, canonical in _canonical_orientations.items()
+            if key == canonical and key[0] == tangram_type]
+
+def normalise_transforms(transform_params: dict) -> tuple[int, bool, bool]:
+    """
+    Turn the xscale, yscale and rotate parameters of a piece into
+    (rotate, xflip, yflip), with rotate in [0, 360).
+    """
+    xscale = transform_params.get('xscale', 0)
+    yscale = transform_params.get('yscale', 0)
+    rotate = transform_params.get('rotate', 0)
+    
+    # Ensure all values are ints
+    if not isinstance(rotate, int):
+        raise TypeError(f'expected "int" for rotate, got ({type(rotate).__name__}) instead.')
+    
+    if not isinstance(yscale, int):
+        raise TypeError(f'expected "int" for yscale, got ({type(yscale).__name__}) instead.')
+    
+    if not isinstance(xscale, int):
+        raise TypeError(f'expected "int" for xscale, got ({type(xscale).__name__}) instead.')
+
+    # Handle cases for when object is flipped on both x- and y-axis
+    if xscale == yscale == -1:
+        rotate += 180
+        xscale = 0
+        yscale = 0
+
+    # Normalise negative rotations
+    rotate = rotate % 360
+
+    # Determining flips
+    xflip = xscale == -1
+    yflip = yscale == -1
+    
+    return rotate, xflip, yflip
+
+
 class Tangram(LatexElement):
 
+    # Values derived from the transforms and base coordinates, dropped whenever either changes
+    _cached = ('vertices', '_grid', 'transformations')
+
     def __init__(self, tangram_type: TangramType, transform_params={}, base_coords=(0,0), line_number=None, content=None):
         super().__init__(content, line_number)
         if isinstance(tangram_type, int):
@@ -74,53 +222,89 @@ class Tangram(LatexElement):
             self.tangram_type = tangram_type
         self.transforms(transform_params)
         self.base_coords = base_coords
-        self.vertices = self._find_verticies()
-        self.transformations = {
+
+    @classmethod
+    def _restore(cls, tangram_type: TangramType, rotate: int, xflip: bool, yflip: bool,
+                 base_coords: tuple, vertices: tuple = None, line_number: int = None) -> 'Tangram':
+        """Rebuild a piece from already normalised transforms, and its vertices when they are known"""
+        gram = cls.__new__(cls)
+        gram.__dict__.update(content=None, line_number=line_number, tangram_type=tangram_type,
+                             _rotate=rotate, _xflip=xflip, _yflip=yflip, _base_coords=base_coords)
+        if vertices is not None:
+            gram.__dict__['vertices'] = vertices
+        return gram
+
+    def _invalidate(self):
+        for name in self._cached:
+            self.__dict__.pop(name, None)
+
+    @property
+    def base_coords(self) -> tuple:
+        return self._base_coords
+
+    @base_coords.setter
+    def base_coords(self, base_coords: tuple):
+        self._base_coords = tuple(base_coords)
+        self._invalidate()
+
+    @property
+    def rotate(self) -> int:
+        return self._rotate
+
+    @rotate.setter
+    def rotate(self, rotate: int):
+        self._rotate = rotate
+        self._invalidate()
+
+    @property
+    def xflip(self) -> bool:
+        return self._xflip
+
+    @xflip.setter
+    def xflip(self, xflip: bool):
+        self._xflip = xflip
+        self._invalidate()
+
+    @property
+    def yflip(self) -> bool:
+        return self._yflip
+
+    @yflip.setter
+    def yflip(self, yflip: bool):
+        self._yflip = yflip
+        self._invalidate()
+
+    @cached_property
+    def vertices(self) -> tuple[tuple, ...]:
+        """Vertices after transformations, worked out on first access"""
+        return self._find_verticies()
+
+    @cached_property
+    def transformations(self) -> dict:
+        return {
             'xflip': self.xflip,
             'yflip': self.yflip,
             'rotate': self.rotate,
         }
 
-    @property
+    @cached_property
     def _grid(self):
-        min_x = min(self.vertices, key=lambda x: x[0])[0]
-        min_y = min(self.vertices, key=lambda x: x[1])[1]
-
-        max_x = max(self.vertices, key=lambda x: x[0])[0]
-        max_y = max(self.vertices, key=lambda x: x[1])[1]
+        vertices = iter(self.vertices)
+        min_x, min_y = max_x, max_y = next(vertices)
+        for x, y in vertices:
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
         return ((min_x, min_y), (max_x, max_y))
 
     def transforms(self, transform_params: dict):
-        xscale = transform_params.get('xscale', 0)
-        yscale = transform_params.get('yscale', 0)
-        rotate = transform_params.get('rotate', 0)
-        
-        # Ensure all values are ints
-        if not isinstance(rotate, int):
-            raise TypeError(f'expected "int" for rotate, got ({type(rotate).__name__}) instead.')
-        
-        if not isinstance(yscale, int):
-            raise TypeError(f'expected "int" for yscale, got ({type(yscale).__name__}) instead.')
-        
-        if not isinstance(xscale, int):
-            raise TypeError(f'expected "int" for xscale, got ({type(xscale).__name__}) instead.')
-
-        # Handle cases for when object is flipped on both x- and y-axis
-        if xscale == yscale == -1:
-            rotate += 180
-            xscale = 0
-            yscale = 0
-
-        # Normalise negative rotations
-        rotate = rotate % 360
-
-        # Determining flips
-        xflip = xscale == -1
-        yflip = yscale == -1
-        
-        self.xflip = xflip
-        self.yflip = yflip
-        self.rotate = rotate
+        self._rotate, self._xflip, self._yflip = normalise_transforms(transform_params)
+        self._invalidate()
         return
     
 
@@ -129,56 +313,13 @@ class Tangram(LatexElement):
         Find all vertices of the tangram piece after transformations.
         These vertices are sorted from leftmost topmost.
 
-        Returns list of (x,y) coordinate tuples. 
+        Returns tuple of (x,y) coordinate tuples. 
         """
-        vertices = base_shapes[self.tangram_type]
-
-        # Apply transformations based on tangram params
-        if self.rotate:
-            cos_theta, sin_theta = rotation_values[self.rotate]
-            rotated_vertices = []
-            for x, y in vertices:
-                # Rotation matrix multiplication with Number objects
-                new_x = x * cos_theta - y * sin_theta
-                new_y = x * sin_theta + y * cos_theta
-                rotated_vertices.append((new_x, new_y))
-            vertices = rotated_vertices
-        
-        if self.xflip:
-            vertices = [(-x, y) for x, y in vertices]
-        
-        if self.yflip:
-            vertices = [(x, -y) for x, y in vertices]
+        vertices = oriented_vertices(self.tangram_type, self.rotate, self.xflip, self.yflip)
 
         # Shift vertices by base coordinates
-        vertices = [(x + self.base_coords[0], y + self.base_coords[1]) 
-               for x, y in vertices]
-        
-        topleft_vertex = max(vertices, key=lambda v: (v[1],-v[0]))
-        
-        start_idx = vertices.index(topleft_vertex)
-        # start_idx = 0
-        # for idx, v in enumerate(vertices):
-        #     if v[1] == vertices[start_idx][1] and v[0] < vertices[start_idx][0]:
-        #         start_idx = idx
-            
-        #     elif v[1] > vertices[start_idx][1]:
-        #         start_idx = idx
-                
-
-        # Rotating clockwise to find next point
-        start_vertex = vertices[start_idx]
-        angles = []
-        for vertex in vertices:
-            angles.append(-arc_sort(start_vertex, vertex))
-
-        vertices_sorted = deque([v for _, v in sorted(zip(angles, vertices), reverse=True)])
-        
-        # Ensuring the start point is the starting point
-        start_idx = vertices_sorted.index(start_vertex)
-        vertices_sorted.rotate(-start_idx)
-
-        return list(vertices_sorted)
+        x_shift, y_shift = self.base_coords
+        return tuple((x + x_shift, y + y_shift) for x, y in vertices)
 
     
     def __repr__(self):
@@ -190,11 +331,18 @@ class Tangram(LatexElement):
 
 
 class TexTangram(LatexElement):
-    def __init__(self, tangram:Tangram, type:_TEX_OBJECTS):
-        self.vertices = tangram.vertices
+    def __init__(self, tangram:Tangram|list[tuple], type:_TEX_OBJECTS):
+        """
+        Args:
+            tangram: The piece (Tangram or anything with vertices) to draw, or the vertices of an outline
+            type: 'pieces' to draw a piece on one line, 'outline' to draw an outline one vertex per line
+        """
+        self.vertices = tangram.vertices if hasattr(tangram, 'vertices') else tuple(tangram)
         super().__init__(content=None, line_number=None)
         if type == 'pieces':
             self.content = self._generate_piece()
+        elif type == 'outline':
+            self.content = self._generate_outline()
 
     @staticmethod
     def _generate_coordinate(x:Number|int, y:Number|int):
@@ -210,9 +358,17 @@ class TexTangram(LatexElement):
         
 
     def _generate_piece(self) -> str:
+        return self.piece(self.vertices)
+
+    @staticmethod
+    def piece(vertices) -> str:
+        """The line drawing a piece, without building a TexTangram for it"""
+        coordinate = TexTangram._generate_coordinate
+        return r'\draw[ultra thick] ' + ' -- '.join([coordinate(x, y) for x, y in vertices]) + ' -- cycle;'
+
+    def _generate_outline(self) -> str:
         string_list = []
         for x,y in self.vertices:
             string_list.append(self._generate_coordinate(x,y))
-        string_list.append('cycle;')
-        content = r'\draw[ultra thick] ' + ' -- '.join(string_list)
-        return content
\ No newline at end of file
+        content = r'\draw[ultra thick]' + '\n\t' + ' --\n\t'.join(string_list) + ' -- cycle;'
+        return content
@@ -0,0 +1,177 @@
+
+from math import gcd
+
+import numpy as np
+
+from .tangram import Tangram, TangramType, base_shapes, rotation_values
+from ..utils.coords import Number
+
+_SQRT2 = np.sqrt(2)
+MAX_VERTICES = 4
+
+
+def _lcm(a: int, b: int) -> int:
+    return a * b // gcd(a, b)
+
+
+def _parts(value) -> tuple[int, int, int]:
+    return value.parts if isinstance(value, Number) else Number(value).parts
+
+
+def _scalar_matrix(value: Number) -> np.ndarray:
+    """
+    Matrix acting on (a, b) that multiplies a + b√2 by value,
+    scaled by 2 so the half coefficients of rotation_values stay integers.
+    """
+    a, b, d = value.parts
+    a, b = a * 2 // d, b * 2 // d
+    return np.array([[a, 2 * b], [b, a]], dtype=np.int64)
+
+
+def _transform_matrix(rotate: int, xflip: bool, yflip: bool) -> np.ndarray:
+    """4x4 integer matrix (scaled by 2) acting on the vertex form [xa, xb, ya, yb]"""
+    cos_theta, sin_theta = rotation_values[rotate]
+    c = _scalar_matrix(cos_theta)
+    s = _scalar_matrix(sin_theta)
+    matrix = np.block([[c, -s], [s, c]])
+    flips = np.array([-1 if xflip else 1] * 2 + [-1 if yflip else 1] * 2, dtype=np.int64)
+    return flips[:, None] * matrix
+
+
+# Transform matrices indexed by [rotate // 45, xflip, yflip]
+_TRANSFORMS = np.zeros((len(rotation_values), 2, 2, 4, 4), dtype=np.int64)
+for _rotate in rotation_values:
+    for _xflip in (False, True):
+        for _yflip in (False, True):
+            _TRANSFORMS[_rotate // 45, int(_xflip), int(_yflip)] = _transform_matrix(_rotate, _xflip, _yflip)
+
+# Local shape vertices in [xa, xb, ya, yb] form, padded to 4 vertices and indexed by TangramType.value
+_SHAPES = np.zeros((max(t.value for t in TangramType) + 1, MAX_VERTICES, 4), dtype=np.int64)
+_SHAPE_SIZES = np.zeros(len(_SHAPES), dtype=np.int64)
+for _type, _shape in base_shapes.items():
+    _SHAPE_SIZES[_type.value] = len(_shape)
+    for _idx, (_x, _y) in enumerate(_shape):
+        _SHAPES[_type.value, _idx] = (_x.parts[0], 0, _y.parts[0], 0)
+
+
+class VertexBatch:
+    """
+    Computes the vertices of many tangram pieces at once.
+
+    Every coordinate a + b√2 is held as integer coefficients (a, b) over one
+    shared denominator, so pieces are stored as (n_pieces, 4, 2) coefficient
+    arrays (one for a, one for b; triangles are padded to 4 vertices).
+    Rotations and flips are applied as a single batched integer matmul and
+    the clockwise-from-top-left ordering is a vectorised argsort, giving
+    the same vertices as Tangram.vertices.
+    """
+
+    def __init__(self, tangram_types, rotations, xflips, yflips, base_coords, puzzle_sizes=None):
+        """
+        Args:
+            tangram_types: TangramType (or its value) of every piece
+            rotations: Normalised rotation of every piece (a multiple of 45 in [0, 360))
+            xflips: Whether every piece is flipped on the x-axis
+            yflips: Whether every piece is flipped on the y-axis
+            base_coords: (x, y) Number translation of every piece
+            puzzle_sizes: Number of pieces in each puzzle, when the batch holds several
+        """
+        self.types = np.array([t.value if isinstance(t, TangramType) else t for t in tangram_types], dtype=np.int64)
+        self.rotations = np.array(rotations, dtype=np.int64)
+        self.xflips = np.array(xflips, dtype=bool)
+        self.yflips = np.array(yflips, dtype=bool)
+        self.sizes = _SHAPE_SIZES[self.types]
+        if puzzle_sizes is None:
+            puzzle_sizes = [len(self.types)]
+        self.puzzle_offsets = np.cumsum([0] + list(puzzle_sizes))
+
+        # Bring every base coordinate onto one shared denominator
+        coords = [(_parts(x), _parts(y)) for x, y in base_coords]
+        denominator = 2
+        for x_parts, y_parts in coords:
+            denominator = _lcm(denominator, _lcm(x_parts[2], y_parts[2]))
+        self.denominator = denominator
+        # offsets[:, axis, 0] are the a coefficients and offsets[:, axis, 1] the b coefficients
+        self.offsets = np.array([[[x[0] * (denominator // x[2]), x[1] * (denominator // x[2])],
+                                  [y[0] * (denominator // y[2]), y[1] * (denominator // y[2])]]
+                                 for x, y in coords], dtype=np.int64).reshape(-1, 2, 2)
+        self._a = None
+        self._b = None
+
+    @classmethod
+    def from_tangrams(cls, tangrams: list[Tangram]) -> 'VertexBatch':
+        return cls.from_puzzles([tangrams])
+
+    @classmethod
+    def from_puzzles(cls, puzzles: list[list[Tangram]]) -> 'VertexBatch':
+        pieces = [gram for tangrams in puzzles for gram in tangrams]
+        return cls(
+            tangram_types=[gram.tangram_type for gram in pieces],
+            rotations=[gram.rotate for gram in pieces],
+            xflips=[gram.xflip for gram in pieces],
+            yflips=[gram.yflip for gram in pieces],
+            base_coords=[gram.base_coords for gram in pieces],
+            puzzle_sizes=[len(tangrams) for tangrams in puzzles],
+        )
+
+    def __len__(self):
+        return len(self.types)
+
+    def _compute(self):
+        transforms = _TRANSFORMS[self.rotations // 45, self.xflips.astype(np.int64), self.yflips.astype(np.int64)]
+        local = _SHAPES[self.types]
+
+        # (n, 4, 4) @ (n, 4 vertices, 4) -> vertices in [xa, xb, ya, yb] form, scaled by 2
+        moved = np.einsum('nij,nvj->nvi', transforms, local)
+        moved = moved * (self.denominator // 2)
+        coefficients = moved.reshape(-1, MAX_VERTICES, 2, 2) + self.offsets[:, None, :, :]
+
+        # Order each piece clockwise, starting from the topmost then leftmost vertex
+        values = (coefficients[..., 0] + coefficients[..., 1] * _SQRT2) / self.denominator
+        x, y = values[..., 0], values[..., 1]
+        padding = np.arange(MAX_VERTICES)[None, :] >= self.sizes[:, None]
+        x = np.where(padding, np.inf, x)
+        y = np.where(padding, -np.inf, y)
+
+        start = np.lexsort((x, -y), axis=-1)[:, 0]
+        rows = np.arange(len(self.types))
+        dx = x - x[rows, start][:, None]
+        dy = y - y[rows, start][:, None]
+        with np.errstate(invalid='ignore'):
+            angles = np.mod(np.arctan2(dx, dy), 2 * np.pi)
+        angles = np.where(padding, np.inf, angles)
+        order = np.argsort(angles, axis=-1, kind='stable')
+
+        coefficients = np.take_along_axis(coefficients, order[:, :, None, None], axis=1)
+        self._a = coefficients[..., 0]
+        self._b = coefficients[..., 1]
+
+    @property
+    def a(self) -> np.ndarray:
+        """(n_pieces, 4, 2) rational coefficients of the sorted vertices"""
+        if self._a is None:
+            self._compute()
+        return self._a
+
+    @property
+    def b(self) -> np.ndarray:
+        """(n_pieces, 4, 2) √2 coefficients of the sorted vertices"""
+        if self._b is None:
+            self._compute()
+        return self._b
+
+    def piece_vertices(self, index: int) -> tuple[tuple[Number, Number], ...]:
+        """Vertices of a single piece, in the same form as Tangram.vertices"""
+        a, b, d = self.a[index], self.b[index], self.denominator
+        return tuple((Number.from_parts(int(a[v, 0]), int(b[v, 0]), d),
+                      Number.from_parts(int(a[v, 1]), int(b[v, 1]), d))
+                     for v in range(self.sizes[index]))
+
+    def vertices(self) -> list[tuple[tuple[Number, Number], ...]]:
+        """Vertices of every piece in the batch"""
+        return [self.piece_vertices(index) for index in range(len(self))]
+
+    def puzzle_vertices(self, puzzle: int) -> list[tuple[tuple[Number, Number], ...]]:
+        """Vertices of every piece in one puzzle of the batch"""
+        start, end = self.puzzle_offsets[puzzle], self.puzzle_offsets[puzzle + 1]
+        return [self.piece_vertices(index) for index in range(start, end)]
@@ -1,4 +1,5 @@
 
+from typing import Iterator, TextIO
 
 
 class FileHandler:
@@ -11,6 +12,15 @@ class FileHandler:
         except FileNotFoundError:
             return []
         
+    @staticmethod
+    def iter_lines(source: str | TextIO) -> Iterator[str]:
+        """Yield lines one at a time from a path or an open text file, raising FileNotFoundError for a missing path"""
+        if hasattr(source, 'read'):
+            yield from source
+            return
+        with open(source, 'r') as file:
+            yield from file
+
     @staticmethod
     def write_tex(content: str, filename: str):
         with open(filename, 'w') as file:
@@ -0,0 +1,189 @@
+
+from pathlib import Path
+import hashlib
+import json
+import os
+from typing import Iterable, Literal
+
+from .elements.tangram import Tangram
+from .utils.boundary import get_edges, outline
+from .utils.coords import Number
+
+_FINGERPRINT_BY = Literal['pieces', 'outline']
+
+# The 16 symmetries of the lattice of 45 degree directions: a rotation, then whether x is mirrored
+SYMMETRIES = [(rotate, mirror) for mirror in (False, True) for rotate in range(0, 360, 45)]
+
+_HALF_SQRT2 = Number(0, 1/2)
+
+
+def _rotate_45(point: tuple) -> tuple:
+    x, y = point
+    return ((x - y) * _HALF_SQRT2, (x + y) * _HALF_SQRT2)
+
+
+def _rotate_90(point: tuple) -> tuple:
+    x, y = point
+    return (-y, x)
+
+
+def transform(points: Iterable[tuple], symmetry: tuple[int, bool]) -> list[tuple]:
+    """Rotate the points about the origin, then mirror them in the y-axis if asked"""
+    rotate, mirror = symmetry
+    points = list(points)
+    if rotate % 90:
+        points = [_rotate_45(p) for p in points]
+    for _ in range(rotate // 90):
+        points = [_rotate_90(p) for p in points]
+    if mirror:
+        points = [(-x, y) for x, y in points]
+    return points
+
+
+def _orbit(shapes: list[list[tuple]]) -> Iterable[tuple[tuple, list[list[tuple]]]]:
+    """Every symmetry of the shapes, sharing the work between rotations a multiple of 90 apart"""
+    sizes = [len(shape) for shape in shapes]
+    flat = [p for shape in shapes for p in shape]
+    turned = {0: flat, 45: [_rotate_45(p) for p in flat]}
+    for rotate in range(0, 360, 45):
+        points = turned[rotate % 90] if rotate < 90 else [_rotate_90(p) for p in turned[rotate - 90]]
+        turned[rotate] = points
+        for mirror in (False, True):
+            mirrored = [(-x, y) for x, y in points] if mirror else points
+            offset = 0
+            regrouped = []
+            for size in sizes:
+                regrouped.append(mirrored[offset:offset + size])
+                offset += size
+            yield (rotate, mirror), regrouped
+
+
+def _normalise(shapes: list[list[tuple]]) -> tuple[tuple, tuple]:
+    """Shift the shapes so their bottom-left most vertex is the origin, as integer parts"""
+    anchor = min((p for shape in shapes for p in shape), key=lambda p: (float(p[0]), float(p[1])))
+    ax, ay = anchor
+    return anchor, tuple(tuple((x - ax).parts + (y - ay).parts for x, y in shape) for shape in shapes)
+
+
+class Fingerprint:
+    """
+    Canonical digest of a figure, equal for figures that differ only by a
+    translation, a rotation by a multiple of 45 degrees or a mirror image.
+    """
+    def __init__(self, digest: str, symmetry: tuple[int, bool], offset: tuple):
+        """
+        Args:
+            digest: Hex digest of the canonical form
+            symmetry: (rotate, mirror) taking the figure to its canonical form
+            offset: Point subtracted after the symmetry so the canonical form starts at the origin
+        """
+        self.digest = digest
+        self.symmetry = symmetry
+        self.offset = offset
+
+    def to_canonical(self, points: Iterable[tuple]) -> list[tuple]:
+        """Map points of this figure (its outline, say) into the canonical frame"""
+        x0, y0 = self.offset
+        return [(x - x0, y - y0) for x, y in transform(points, self.symmetry)]
+
+    def from_canonical(self, points: Iterable[tuple]) -> list[tuple]:
+        """Map points from the canonical frame back onto this figure"""
+        rotate, mirror = self.symmetry
+        x0, y0 = self.offset
+        points = [(x + x0, y + y0) for x, y in points]
+        if mirror:
+            points = [(-x, y) for x, y in points]
+        return transform(points, ((360 - rotate) % 360, False))
+
+    def __eq__(self, other):
+        return isinstance(other, Fingerprint) and self.digest == other.digest
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __str__(self):
+        return self.digest
+
+    def __repr__(self):
+        return f"Fingerprint ({self.digest[:16]}, Symmetry: {self.symmetry})"
+
+
+def _canonical(shapes: list[list[tuple]], keys: list, edges: bool) -> Fingerprint:
+    best = None
+    for symmetry, moved in _orbit(shapes):
+        anchor, normalised = _normalise(moved)
+        if edges:
+            # A loop is the same whichever vertex it starts from and whichever way round it runs
+            form = tuple(sorted(tuple(sorted(edge)) for shape in normalised for edge in get_edges(shape)))
+        else:
+            form = tuple(sorted((key, tuple(sorted(shape))) for key, shape in zip(keys, normalised)))
+        if best is None or form < best[0]:
+            best = (form, symmetry, anchor)
+    form, symmetry, anchor = best
+    digest = hashlib.blake2b(repr(form).encode(), digest_size=16).hexdigest()
+    return Fingerprint(digest, symmetry, anchor)
+
+
+def fingerprint(figure: 'TangramPuzzle | Iterable[Tangram]', by: _FINGERPRINT_BY = 'pieces') -> Fingerprint:
+    """
+    Fingerprint of a puzzle under the 16 symmetries of the lattice and translation.
+
+    Args:
+        figure: A TangramPuzzle or its pieces
+        by: 'pieces' to match the exact placement of every piece, 'outline' to match
+            any puzzles with the same silhouette however the pieces inside are laid out
+    """
+    tangrams = list(getattr(figure, 'tangrams', figure))
+    if by == 'outline':
+        loop = figure.outline if hasattr(figure, 'outline') else outline([gram.vertices for gram in tangrams])
+        return _canonical([loop], [None], edges=True)
+    return _canonical([list(gram.vertices) for gram in tangrams],
+                      [gram.tangram_type.value for gram in tangrams], edges=False)
+
+
+class FingerprintIndex:
+    """
+    Maps fingerprints to a value for the first puzzle seen with it (its path,
+    say), so duplicates are found with one dict lookup. Can be saved to and
+    loaded from a JSON file to carry over between runs.
+    """
+    def __init__(self, path: str | Path = None):
+        """
+        Args:
+            path: JSON file to load the index from and save it to, if any
+        """
+        self.path = None if path is None else Path(path)
+        self.entries = {}
+        if self.path is not None and self.path.is_file():
+            with open(self.path, 'r') as file:
+                self.entries = json.load(file)
+
+    @staticmethod
+    def _key(key: Fingerprint | str) -> str:
+        return key.digest if isinstance(key, Fingerprint) else str(key)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key: Fingerprint | str) -> bool:
+        return self._key(key) in self.entries
+
+    def get(self, key: Fingerprint | str, default=None):
+        return self.entries.get(self._key(key), default)
+
+    def add(self, key: Fingerprint | str, value):
+        """Record value for the fingerprint unless it is known. Returns the value already held, or None"""
+        key = self._key(key)
+        existing = self.entries.get(key)
+        if existing is None:
+            self.entries[key] = value
+        return existing
+
+    def save(self, path: str | Path = None):
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError('no path to save the index to')
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temporary, 'w') as file:
+            json.dump(self.entries, file)
+        os.replace(temporary, path)
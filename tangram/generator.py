@@ -0,0 +1,225 @@
+
+from pathlib import Path
+import random
+from typing import Iterator, TextIO
+
+from .analyser import piece_lines
+from .elements.tangram import STANDARD_SET, Tangram, TangramType, distinct_orientations, oriented_vertices
+from .fileHandler import FileHandler
+from .parser import TEX_NAMES
+from .utils.boundary import clockwise, edge_direction, get_edges, separated
+from .utils.coords import Number, tex_number
+from .validator import validate
+
+_PREAMBLE = '\\documentclass{standalone}\n\\usepackage{TangramTikz}\n\\begin{document}\n'
+_POSTAMBLE = '\\end{document}\n'
+
+
+def _placements(tangram_type: TangramType, orientation: tuple, placed: list) -> list[tuple]:
+    """
+    Base coordinates that put an edge of the piece against an edge of a placed
+    piece, running the other way along the same line and sharing an end.
+    """
+    shape = oriented_vertices(tangram_type, *orientation)
+    bases = []
+    for vertices in placed:
+        for a, b in get_edges(vertices):
+            direction = edge_direction(b, a)
+            for p, q in get_edges(shape):
+                if edge_direction(p, q) != direction:
+                    continue
+                # Either the start of the new edge meets the end of the placed one, or the other way round
+                bases.append((b[0] - p[0], b[1] - p[1]))
+                bases.append((a[0] - q[0], a[1] - q[1]))
+    return bases
+
+
+def random_arrangement(rng: random.Random, pieces: dict[TangramType, int] = None,
+                       max_attempts: int = 100) -> list[Tangram]:
+    """
+    A valid figure (no overlaps, no holes) of the pieces, built by laying each
+    piece in turn edge to edge against the ones already placed, at a random
+    orientation and position. The first piece sits at the origin, so every
+    coordinate is an exact a + b*sqrt(2).
+
+    Args:
+        rng: Source of randomness, the same seed gives the same figure
+        pieces: Number of each TangramType, defaults to one tangram set
+        max_attempts: Figures to try before giving up
+    """
+    pieces = STANDARD_SET if pieces is None else pieces
+    types = [tangram_type for tangram_type, count in sorted(pieces.items(), key=lambda item: item[0].value)
+             for _ in range(count)]
+    for _ in range(max_attempts):
+        rng.shuffle(types)
+        placed, tangrams = [], []
+        for tangram_type in types:
+            orientations = distinct_orientations(tangram_type)
+            rng.shuffle(orientations)
+            for orientation in orientations:
+                bases = _placements(tangram_type, orientation, placed) if placed else [(Number(0), Number(0))]
+                rng.shuffle(bases)
+                shape = oriented_vertices(tangram_type, *orientation)
+                for base in bases:
+                    vertices = clockwise((x + base[0], y + base[1]) for x, y in shape)
+                    if all(separated(vertices, other) for other in placed):
+                        break
+                else:
+                    continue
+                break
+            else:
+                break
+            rotate, xflip, yflip = orientation
+            placed.append(vertices)
+            tangrams.append(Tangram(tangram_type, {'rotate': rotate, 'xscale': -1 if xflip else 0,
+                                                   'yscale': -1 if yflip else 0}, base))
+        # Pieces laid round a gap can enclose it, start again rather than fill it
+        if len(tangrams) == len(types) and not validate(tangrams, pieces):
+            return tangrams
+    raise ValueError(f'no valid figure found in {max_attempts} attempts')
+
+
+def environment(lines: list[str], indent: str = '    ') -> str:
+    body = ''.join(f'{indent}{line}\n' for line in lines)
+    return f'\\begin{{EnvTangramTikz}}\n{body}\\end{{EnvTangramTikz}}\n'
+
+
+def _template(tangrams: list[Tangram]) -> list[tuple[str, Number, Number, str]]:
+    """Each piece line split around its base coordinates, so moved copies only format two numbers"""
+    template = []
+    for line, gram in zip(piece_lines(tangrams), tangrams):
+        head, _, _ = line.rpartition('>(')
+        template.append((f'{head}>(', *gram.base_coords, f'){{{TEX_NAMES[gram.tangram_type]}}}'))
+    return template
+
+
+def iter_environments(n_puzzles: int, seed: int = 0, distinct: int = 64, spread: int = 50) -> Iterator[str]:
+    """
+    Yield n_puzzles EnvTangramTikz environments one at a time. The first
+    distinct figures are generated, the rest reuse one of them at random moved
+    by a random whole number of units, so long runs stay cheap to make.
+
+    Args:
+        n_puzzles: Environments to yield
+        seed: Seed for the random figures and offsets
+        distinct: Figures to generate before reusing them
+        spread: Largest offset in either direction
+    """
+    rng = random.Random(seed)
+    templates = []
+    # Moved copies keep landing on the same coordinates, so their text is worked out once
+    texts = {}
+
+    def tex(value: Number) -> str:
+        text = texts.get(value)
+        if text is None:
+            text = texts[value] = tex_number(value)
+        return text
+
+    for _ in range(n_puzzles):
+        if len(templates) < distinct:
+            tangrams = random_arrangement(rng)
+            templates.append(_template(tangrams))
+            yield environment(piece_lines(tangrams))
+        else:
+            template = rng.choice(templates)
+            dx, dy = rng.randint(-spread, spread), rng.randint(-spread, spread)
+            yield environment([f'{head}{{{tex(x + dx)}}}, {{{tex(y + dy)}}}{tail}' for head, x, y, tail in template])
+
+
+def write_corpus(file: str | Path | TextIO, n_puzzles: int, seed: int = 0, distinct: int = 64,
+                 per_document: int = None) -> int:
+    """
+    Stream a corpus of n_puzzles figures to a file, holding one environment in
+    memory at a time. Returns the number of pieces written.
+
+    Args:
+        file: Path or open text file to write to
+        n_puzzles: Environments to write
+        seed: Seed for the random figures
+        distinct: Figures to generate before reusing them, see iter_environments
+        per_document: Environments per standalone document, defaults to all of them in one
+    """
+    if not hasattr(file, 'write'):
+        with open(file, 'w') as opened:
+            return write_corpus(opened, n_puzzles, seed, distinct, per_document)
+
+    per_document = per_document or max(n_puzzles, 1)
+    n_pieces = 0
+    for idx, text in enumerate(iter_environments(n_puzzles, seed, distinct)):
+        if idx % per_document == 0:
+            if idx:
+                file.write(_POSTAMBLE)
+            file.write(_PREAMBLE)
+        file.write(text)
+        n_pieces += sum(STANDARD_SET.values())
+    if n_puzzles:
+        file.write(_POSTAMBLE)
+    return n_pieces
+
+
+def write_puzzle(tangrams: list[Tangram], filename: str | Path):
+    """Write a single figure as a document like the examples"""
+    FileHandler.write_tex(content=_PREAMBLE + environment(piece_lines(tangrams)) + _POSTAMBLE, filename=filename)
+
+
+# Variations the parser has to see through, each keeping the same pieces
+
+def _spaced(rng: random.Random, line: str) -> str:
+    """Random spaces, tabs and line breaks between every token"""
+    tokens = line.replace('<', ' < ').replace('>', ' > ').replace('(', ' ( ').replace(')', ' ) ').split()
+    return ''.join(token + rng.choice([' ', '\t', '\n', '  \n\t', '']) for token in tokens)
+
+
+def _unspaced_number(text: str) -> str:
+    # 1.5 * sqrt(2) can also be written 1.5sqrt(2)
+    return text.replace(' ', '').replace('*sqrt', 'sqrt')
+
+
+def _adversarial_lines(rng: random.Random, tangrams: list[Tangram], kind: str) -> str:
+    lines = piece_lines(tangrams)
+    if kind == 'whitespace':
+        return '\n'.join(_spaced(rng, line) for line in lines)
+    if kind == 'comments':
+        decoys = [f'% {line}' for line in lines]
+        out = []
+        for line, decoy in zip(lines, decoys):
+            out.append(decoy)
+            out.append(f'{line} % 50\\% of a {TEX_NAMES[TangramType.SQUARE]} \\PieceTangram[TangSol]({{0}},{{0}}){{TangCar}}')
+        out.append('\\% not a comment, so this line still counts')
+        return '\n'.join(out)
+    if kind == 'one_line':
+        return ' '.join(lines)
+    if kind == 'crlf':
+        return '\r\n'.join(lines)
+    if kind == 'params':
+        out = []
+        for gram in tangrams:
+            x, y = (_unspaced_number(tex_number(value)) for value in gram.base_coords)
+            if gram.xflip or gram.yflip:
+                params = f"{'xscale=-1,' if gram.xflip else ''}{'yscale=-1,' if gram.yflip else ''}rotate={gram.rotate - 360}"
+            else:
+                # Flipping both ways is a half turn
+                params = f'xscale = -1 , yscale = -1 , rotate = {gram.rotate - 180}'
+            out.append(f'\\PieceTangram[TangSol]<{params}>({{{x}}},{{{y}}}){{{TEX_NAMES[gram.tangram_type]}}}')
+        return '\n'.join(out)
+    raise ValueError(f'unknown kind: {kind}')
+
+
+ADVERSARIAL_KINDS = ('whitespace', 'comments', 'one_line', 'crlf', 'params')
+
+
+def adversarial_documents(seed: int = 0) -> Iterator[tuple[str, str, list[Tangram]]]:
+    """
+    Yield (kind, text, tangrams) of documents that stress the parser: tokens
+    split over lines, commented out decoys, everything on one line, CRLF line
+    endings and unusual but equivalent parameters and numbers. Parsing text
+    should give pieces with the same vertices as tangrams.
+    """
+    rng = random.Random(seed)
+    for kind in ADVERSARIAL_KINDS:
+        tangrams = random_arrangement(rng)
+        body = _adversarial_lines(rng, tangrams, kind)
+        newline = '\r\n' if kind == 'crlf' else '\n'
+        text = _PREAMBLE.replace('\n', newline) + f'\\begin{{EnvTangramTikz}}{newline}{body}{newline}\\end{{EnvTangramTikz}}{newline}' + _POSTAMBLE.replace('\n', newline)
+        yield kind, text, tangrams
@@ -1,144 +1,261 @@
 
-from pathlib import Path
-import sys
+import io
 import re
-import numpy as np
+import warnings
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterator, TextIO
 
-sys.path.append((Path.cwd() / 'tangram').__str__())
+from .elements.tangram import Tangram, TangramType, normalise_transforms
+from .fileHandler import FileHandler
+from .utils.coords import Number
 
-from elements.tangram import Tangram, TangramType
-from fileHandler import FileHandler
-from utils.coords import Number
+# Bump when parsing changes what pieces a file gives, so cached parses are not reused
+PARSER_VERSION = 3
 
-test = Path.cwd() / 'tests' / 'cat.tex'
+# A TeX comment (so commented out pieces are skipped), an EnvTangramTikz boundary or a whole piece
+# (based on TangramTikz package): \PieceTangram[TangSol]<params>({x},{y}){Type}, with whitespace
+# allowed between every token
+_TOKEN_PATTERN = re.compile(
+    r'(?P<comment>(?<!\\)%[^\n]*)'
+    r'|(?P<begin>\\begin\s*\{\s*EnvTangramTikz\s*\})'
+    r'|(?P<end>\\end\s*\{\s*EnvTangramTikz\s*\})'
+    r'|\\PieceTangram\s*\[\s*TangSol[^\]]*\]'
+        r'\s*(?:<(?P<params>[^>]*)>)?'
+        r'\s*\(\s*\{(?P<x>[^}]*)\}\s*,\s*\{(?P<y>[^}]*)\}\s*\)'
+        r'\s*\{\s*(?P<type>Tang(?:GrandTri|MoyTri|PetTri|Car|Para))\s*\}'
+)
+
+_COMMENT_START = re.compile(r'(?<!\\)%')
+
+_TYPE_MAP = {
+    'TangGrandTri': TangramType.TRIANGLE_LARGE,
+    'TangMoyTri': TangramType.TRIANGLE_MEDIUM,
+    'TangPetTri': TangramType.TRIANGLE_SMALL,
+    'TangCar': TangramType.SQUARE,
+    'TangPara': TangramType.PARALLELOGRAM
+}
+
+# The TangramTikz name of every piece, for writing \PieceTangram lines
+TEX_NAMES = {tangram_type: name for name, tangram_type in _TYPE_MAP.items()}
 
 
 class LatexTangramParser:
     def __init__(self, raw_text: str):
         self.raw_text = raw_text
-        self.lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
         self.tangrams = []
 
     def parse(self) -> list[Tangram]:
-        for line_number, line in enumerate(self.lines, 1):
-            tangram = self._parse_line(line)
-            if tangram is not None:
-                self.tangrams.append(tangram)
+        self.tangrams.extend(self._scan(self.raw_text))
         return self.tangrams
 
+    @classmethod
+    def _scan(cls, text: str, line_number: int = 1) -> Iterator[Tangram]:
+        """Single sweep over the text, yielding every tangram outside of comments"""
+        for kind, match, match_line in cls._tokens(text, line_number):
+            if kind == 'piece':
+                yield cls._build(match, match_line)
+
+    @staticmethod
+    def _tokens(text: str, line_number: int = 1) -> Iterator[tuple[str, re.Match, int]]:
+        """Yield ('piece' | 'begin' | 'end', match, line number) for every token outside of comments"""
+        position = 0
+        for match in _TOKEN_PATTERN.finditer(text):
+            if match.group('comment') is not None:
+                continue
+            line_number += text.count('\n', position, match.start())
+            position = match.start()
+            if match.group('begin') is not None:
+                yield 'begin', match, line_number
+            elif match.group('end') is not None:
+                yield 'end', match, line_number
+            else:
+                yield 'piece', match, line_number
+
+    @classmethod
+    def _stream_tokens(cls, source: str | TextIO, max_pending_lines: int = 64) -> Iterator[tuple[str, re.Match, int]]:
+        """
+        Tokens of a file read one line at a time. Only the text of a piece that
+        is split over several lines is held back until the piece is complete,
+        for up to max_pending_lines lines. A piece still unfinished then is
+        dropped with a RuntimeWarning; parsing the whole text would still find it.
+        """
+        pending = ''
+        pending_line = 1
+        pending_count = 0
+        line_number = 0
+        for line in FileHandler.iter_lines(source):
+            line_number += 1
+            if not pending:
+                pending_line = line_number
+            pending += line
+            pending_count += 1
+
+            end = 0
+            for token in cls._tokens(pending, pending_line):
+                end = token[1].end()
+                yield token
+
+            # Keep an unfinished piece (outside of a comment) for the next line
+            start = pending.find('\\PieceTangram', end)
+            if start != -1 and not _COMMENT_START.search(pending, pending.rfind('\n', 0, start) + 1, start):
+                piece_line = pending_line + pending.count('\n', 0, start)
+                if pending_count < max_pending_lines:
+                    pending_line = piece_line
+                    pending = pending[start:]
+                    pending_count = pending.count('\n') + 1
+                    continue
+                warnings.warn(f'line {piece_line}: \\PieceTangram not finished within {max_pending_lines} lines, '
+                              f'skipped', RuntimeWarning)
+            pending = ''
+            pending_count = 0
+
 
     def _parse_line(self, line: str) -> Tangram | None:
         """Parse a single line to determine if there is a Tangram present"""
-        # Regex to find a tangram and coords (based on TangramTikz package)
-        pattern = re.compile(
-                r'\[TangSol.*'
-                r'(?P<params>(?<=\]<).*(?=>)|(?:(?=\]\()))'
-                    r'.*'
-                r'(?P<coords>'
-                    r'(?P<x>(?<=({)).*)(?=(},))'
-                        r'.*'
-                    r'(?P<y>(?<=(,{)).*)(?=(}\))))'
-                r'.*(?P<type>Tang(?:GrandTri|MoyTri|PetTri|Car|Para))'
-            )
-        # Pattern to match the params because I cannot for the life of me 
-        # find a fucking pattern that works for both at once
-        pattern_params = re.compile(
-            r'((?P<params>(?<=<)[^>]*(?=>))*)'
-        )
-        line = re.sub(r'\s','',line)
-        matches = pattern.search(line)
-
-        if matches is None:
-            return None
-        
-        # Parse type
-        type_map = {
-            'TangGrandTri': TangramType.TRIANGLE_LARGE,
-            'TangMoyTri': TangramType.TRIANGLE_MEDIUM,
-            'TangPetTri': TangramType.TRIANGLE_SMALL,
-            'TangCar': TangramType.SQUARE,
-            'TangPara': TangramType.PARALLELOGRAM
-        }
+        return next(self._scan(line), None)
 
-        tangram_type = type_map[matches.group('type')]
+    @staticmethod
+    def _record(match: re.Match, line_number: int = None) -> tuple[TangramType, dict, tuple, int]:
+        """The (tangram_type, transform_params, base_coords, line_number) of a piece, without building it"""
+        tangram_type = _TYPE_MAP[match.group('type')]
 
         # Parse transform parameters
-        transform_params = {}
-        if matches.group('params'):
-            params = matches.group('params').split(',')
-            for param in params:
-                key, value = param.split('=')
-                transform_params[key.strip()] = int(value.strip())
+        params = match.group('params')
+        transform_params = dict(_parse_params(params)) if params else {}
 
         # Parse coordinates
-        x_rat, x_irrat = CoordParser.parse(matches.group('x'))
-        x_coord = Number(x_rat, x_irrat)
-        y_rat, y_irrat = CoordParser.parse(matches.group('y'))
-        y_coord = Number(y_rat, y_irrat)
+        x_coord = CoordParser.number(match.group('x'))
+        y_coord = CoordParser.number(match.group('y'))
+
+        return tangram_type, transform_params, (x_coord, y_coord), line_number
+
+    @staticmethod
+    def _build(match: re.Match, line_number: int = None) -> Tangram:
+        # Same piece as Tangram(**record), but with the transforms normalised once per parameter string
+        params, x, y, tangram_type = match.group('params', 'x', 'y', 'type')
+        rotate, xflip, yflip = _orientation(params) if params else (0, False, False)
+        return Tangram._restore(_TYPE_MAP[tangram_type], rotate, xflip, yflip,
+                                (CoordParser.number(x), CoordParser.number(y)), line_number=line_number)
+
+
+def iter_tangrams(source: str | TextIO) -> Iterator[Tangram]:
+    """
+    Yield tangrams from a path or open text file as it is read, so
+    arbitrarily large inputs are parsed in constant memory.
+    """
+    for kind, match, line_number in LatexTangramParser._stream_tokens(source):
+        if kind == 'piece':
+            yield LatexTangramParser._build(match, line_number)
+
+
+def iter_environments(source: str | TextIO) -> Iterator[list[Tangram]]:
+    """
+    Yield the tangrams of each EnvTangramTikz environment in a path or open
+    text file as it is read, so several puzzles concatenated in one file are
+    processed one puzzle at a time. Pieces outside of any environment are
+    grouped together.
+    """
+    return _iter_groups(source, LatexTangramParser._build)
+
+
+def iter_environment_records(source: str | TextIO) -> Iterator[list[tuple]]:
+    """
+    Like iter_environments, but yields the (tangram_type, transform_params,
+    base_coords, line_number) records of the pieces instead of Tangrams.
+    """
+    return _iter_groups(source, LatexTangramParser._record)
+
 
-        return Tangram(tangram_type=tangram_type, transform_params=transform_params, base_coords=(x_coord, y_coord))
+def parse_content(content: bytes) -> list[Tangram]:
+    """
+    Tangrams of the raw bytes of a document, parsed exactly as iter_tangrams
+    parses the file they were read from (pending-line cap included), so
+    cached and uncached loads give the same pieces.
+    """
+    return list(iter_tangrams(io.StringIO(content.decode(), newline=None)))
+
+
+def _iter_groups(source: str | TextIO, build) -> Iterator[list]:
+    group = []
+    for kind, match, line_number in LatexTangramParser._stream_tokens(source):
+        if kind == 'piece':
+            group.append(build(match, line_number))
+        elif group:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+@lru_cache(maxsize=1024)
+def _parse_params(params: str) -> tuple[tuple[str, int]]:
+    """Parse 'key=value' transform parameters, which repeat a lot across a document"""
+    transform_params = []
+    for param in params.split(','):
+        key, value = param.split('=')
+        transform_params.append((key.strip(), int(value.strip())))
+    return tuple(transform_params)
+
+
+@lru_cache(maxsize=1024)
+def _orientation(params: str) -> tuple[int, bool, bool]:
+    """The normalised (rotate, xflip, yflip) of transform parameters"""
+    return normalise_transforms(dict(_parse_params(params)))
 
 
 
 class CoordParser:
     pattern = re.compile(
-        r'(?P<a_sign>[+-]?)'
-            r'(?P<a>\d+(?:\.\d+)?|\.\d+)?'
-        r'(?P<b_part>'
-            r'(?P<b_sign>[+-]*)'
-            r'(?:(?P<b>\d+(?:\.\d+)?|\.\d+)\*)?'
-            r'sqrt\(2\)'
-        r')?$')
+        r'(?P<a_part>^('    # Groups all 'a' matches into group
+            r'(?P<a_sign>[+-]?)'    # Determines sign of 'a'
+            r'(?P<a>(\d+/\d+|\d+|\d+\.\d+|\.\d+))'  # 'a' value, decimal or fraction
+        r')(?=[+-]|$))' # Anchoring 'a' to either "+","-" or end of string
+        r'?'    # Flag to match 0 or 1 times
+        r'(?P<b_part>'  # Groups all 'b' matches into group
+            r'(?P<b_sign>[+-]?)'    # Determines sign of 'b'
+            r'(?P<b>(\d+/\d+|\d+|\d+\.\d+|\.\d+)?)' # 'b' value, decimal or fraction
+        r'\*?sqrt\(2\)$)'   # Anchors 'b' to either "sqrt(2)" or "*sqrt(2)"
+        r'?'    # Flag to match 0 or 1 times
+    )
 
     @staticmethod
-    def parse(expression: str) -> tuple[float, float]:
-        a_re = (
-            r'(?P<a_part>^('    # Groups all 'a' matches into group
-                r'(?P<a_sign>[+-]?)'    # Determines sign of 'a'
-                r'(?P<a>(\d+|\d+\.\d+|\.\d+))'  # 'a' value
-            r')(?=[+-]|$))' # Anchoring 'a' to either "+","-" or end of string
-            r'?'    # Flag to match 0 or 1 times
-        )
-        b_re = (
-            r'(?P<b_part>'  # Groups all 'b' matches into group
-                r'(?P<b_sign>[+-]?)'    # Determines sign of 'b'
-                r'(?P<b>(\d+|\d+\.\d+|\.\d+)?)' # 'b' value
-            r'\*?sqrt\(2\)$)'   # Anchors 'b' to either "sqrt(2)" or "*sqrt(2)"
-            r'?'    # Flag to match 0 or 1 times
-        )
-        pattern = re.compile(a_re + b_re)
+    @lru_cache(maxsize=4096)
+    def number(expression: str) -> Number:
+        """Parse an expression straight into a Number (Numbers are immutable, so they are shared)"""
+        return Number(*CoordParser.parse(expression))
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse(expression: str) -> tuple[Fraction, Fraction]:
         # Clean expression of whitespaces
-        expression = re.sub(r'\s','',expression)
+        expression = ''.join(expression.split())
 
-        match = pattern.match(expression)
+        match = CoordParser.pattern.match(expression)
 
         if not match:
             return None
         
         # Parsing a
-        rational = 0.0
+        rational = Fraction(0)
         if match.group('a_part'):
-            a_value = match.group('a')
-            a_sign = match.group('a_sign')
-            a_value = float(a_value)
-            if a_sign == '-':
+            a_value = Fraction(match.group('a'))
+            if match.group('a_sign') == '-':
                 a_value = -a_value
             rational = a_value
 
         # Parsing b
-        irrational = 0.0
+        irrational = Fraction(0)
         if match.group('b_part'):
             b_value = match.group('b')
-            b_sign = match.group('b_sign')
             if b_value:
-                b_value = float(b_value)
+                b_value = Fraction(b_value)
             else:
-                b_value = 1.0
-            if b_sign == '-':
+                b_value = Fraction(1)
+            if match.group('b_sign') == '-':
                 b_value = -b_value
 
             irrational = b_value
             
 
-        return (rational, irrational)
\ No newline at end of file
+        return (rational, irrational)
@@ -0,0 +1,208 @@
+
+from pathlib import Path
+import sys
+import importlib
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def _length(result, *args) -> int:
+    return len(result)
+
+
+def _one(result, *args) -> int:
+    return 1
+
+
+def _pieces(result, puzzle, *args) -> int:
+    return len(puzzle.tangrams)
+
+
+def _polygons(result, polygons, *args) -> int:
+    return len(polygons)
+
+
+# (module, attribute path, stage, count of items a call handled from its result and arguments)
+STAGES = [
+    ('parser', 'LatexTangramParser.parse', 'parse', _length),
+    ('parser', 'LatexTangramParser._record', 'parse_piece', _one),
+    ('parser', 'LatexTangramParser._build', 'parse_piece', _one),
+    ('utils.coords', 'arc_sort', 'arc_sort', _one),
+    ('elements.tangram', 'Tangram.__init__', 'tangram_init', _one),
+    ('elements.tangram', 'Tangram._restore', 'tangram_init', _one),
+    ('TangramPuzzle', 'TangramPuzzle._sort', 'sort', _pieces),
+    ('TangramPuzzle', 'TangramPuzzle._transforms', 'transforms', _pieces),
+    ('elements.document', 'TangramPieces.generate_content', 'tex', None),
+    ('elements.document', 'TangramPieces.write', 'tex_write', None),
+    ('utils.boundary', 'find_boundary', 'find_boundary', _polygons),
+    ('utils.boundary', 'boundary_loops', 'boundary_loops', _polygons),
+    ('utils.boundary', 'split_edges', 'split_edges', None),
+    ('utils.boundary', 'trace_loops', 'trace_loops', None),
+    ('utils.boundary', 'outline', 'outline', _polygons),
+    ('utils.boundary', 'outer_boundary', 'outer_boundary_shapely', _polygons),
+    ('utils.boundary', 'OutlineBuilder.add', 'outline_builder_add', _one),
+    ('utils.boundary', 'OutlineBuilder.outline', 'outline_builder_outline', None),
+    ('validator', 'validate', 'validate', None),
+]
+
+
+class StageStats:
+    """Totals for one stage, nested stages are counted in their callers too"""
+    __slots__ = ('calls', 'seconds', 'items', 'allocated_bytes')
+
+    def __init__(self, calls: int = 0, seconds: float = 0.0, items: int = 0, allocated_bytes: int = 0):
+        self.calls = calls
+        self.seconds = seconds
+        self.items = items
+        self.allocated_bytes = allocated_bytes
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"StageStats (Calls: {self.calls}, Seconds: {self.seconds:.6f}, Items: {self.items})"
+
+
+class Profiler:
+    """
+    Opt-in timing of the pipeline stages in STAGES. While disabled nothing is
+    wrapped, so the stages run exactly as without it. enable() swaps each
+    stage for a wrapper recording its wall time, calls, items handled and,
+    with allocations, the net memory it allocated according to tracemalloc.
+    """
+    def __init__(self, allocations: bool = False):
+        """
+        Args:
+            allocations: Whether to trace allocations, which slows everything down noticeably
+        """
+        self.allocations = allocations
+        self.stages = {}
+        self._patches = []
+        self._started_tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patches)
+
+    def _wrap(self, func: Callable, stage: str, count: Callable | None) -> Callable:
+        stats = self.stages.setdefault(stage, StageStats())
+        allocations = self.allocations
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            before = tracemalloc.get_traced_memory()[0] if allocations else 0
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                stats.seconds += time.perf_counter() - start
+                stats.calls += 1
+                if allocations:
+                    stats.allocated_bytes += tracemalloc.get_traced_memory()[0] - before
+            if count is not None:
+                stats.items += count(result, *args)
+            return result
+        return wrapper
+
+    def _set(self, owner, name: str, value):
+        self._patches.append((owner, name, vars(owner)[name]))
+        setattr(owner, name, value)
+
+    def enable(self):
+        if self.enabled:
+            return
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        for module_name, path, stage, count in STAGES:
+            module = importlib.import_module(f'.{module_name}', __package__)
+            *owners, name = path.split('.')
+            owner = module
+            for attribute in owners:
+                owner = getattr(owner, attribute)
+            original = vars(owner)[name]
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapper = type(original)(self._wrap(original.__func__, stage, count))
+            else:
+                wrapper = self._wrap(original, stage, count)
+            self._set(owner, name, wrapper)
+            if owner is module:
+                # Functions imported by name elsewhere (from utils.boundary import outline) are patched there too
+                for other in list(sys.modules.values()):
+                    if other is not module and getattr(other, name, None) is original \
+                            and _PACKAGE_DIR in Path(getattr(other, '__file__', None) or '/').resolve().parents:
+                        self._set(other, name, wrapper)
+
+    def disable(self):
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        for stats in self.stages.values():
+            stats.calls, stats.seconds, stats.items, stats.allocated_bytes = 0, 0.0, 0, 0
+
+    def snapshot(self) -> dict[str, dict]:
+        """Plain dict of every stage that was called, so it pickles and merges cheaply"""
+        return {stage: stats.as_dict() for stage, stats in self.stages.items() if stats.calls}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'tangram') -> str:
+        return to_prometheus(self.snapshot(), prefix)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+
+def merge(snapshots) -> dict[str, dict]:
+    """Add up snapshots, e.g. from the workers of a batch run"""
+    merged = {}
+    for snapshot in snapshots:
+        for stage, stats in (snapshot or {}).items():
+            totals = merged.setdefault(stage, dict.fromkeys(stats, 0))
+            for name, value in stats.items():
+                totals[name] += value
+    return merged
+
+
+_METRICS = [
+    ('calls', 'calls_total', 'Calls of each stage'),
+    ('seconds', 'seconds_total', 'Wall time spent in each stage, including stages it calls'),
+    ('items', 'items_total', 'Items (pieces, polygons) handled by each stage'),
+    ('allocated_bytes', 'allocated_bytes_total', 'Net bytes allocated by each stage, when tracing allocations'),
+]
+
+
+def to_prometheus(snapshot: dict[str, dict], prefix: str = 'tangram') -> str:
+    """The snapshot in the Prometheus text exposition format"""
+    lines = []
+    for key, suffix, description in _METRICS:
+        metric = f'{prefix}_stage_{suffix}'
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} counter')
+        for stage, stats in sorted(snapshot.items()):
+            lines.append(f'{metric}{{stage="{stage}"}} {stats[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def profile(allocations: bool = False) -> Iterator[Profiler]:
+    """Profile the stages for the duration of the with block"""
+    profiler = Profiler(allocations)
+    with profiler:
+        yield profiler
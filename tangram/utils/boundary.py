@@ -1,9 +1,11 @@
 import math
 from collections import defaultdict, Counter
-from shapely.geometry import Polygon
-from shapely.ops import unary_union
 
 def outer_boundary(tangrams):
+    """Outer boundary of the tangrams through shapely, in floats (see outline for the exact version)"""
+    from shapely.geometry import Polygon
+    from shapely.ops import unary_union
+
     polygons = [Polygon(t) for t in tangrams]
 
     merged = unary_union(polygons)
@@ -82,7 +84,56 @@ def point_on_segment(p, a, b, tol=1e-8):
     squared_len = (bx - ax)**2 + (by - ay)**2
     return dot <= squared_len
 
-def split_edges(boundaries):
+class PointGrid:
+    """
+    Uniform grid over a set of points, so the points near a segment can be
+    found without testing every point. Cells are keyed on the float value of
+    the coordinates, while membership is still decided exactly by the caller.
+    """
+    def __init__(self, points, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        for p in points:
+            x, y = float(p[0]), float(p[1])
+            self.cells[(math.floor(x / cell_size), math.floor(y / cell_size))].append((p, x, y))
+
+    def near_segment(self, a, b, tol: float = 1e-9, line: bool = False):
+        """
+        Points inside the bounding box of segment ab, padded by tol for rounding.
+        With line set, points clearly off the line through a and b are skipped too.
+        """
+        ax, ay, bx, by = float(a[0]), float(a[1]), float(b[0]), float(b[1])
+        dx, dy = bx - ax, by - ay
+        line_tol = tol * 1e3 * (abs(dx) + abs(dy) + 1) if line else math.inf
+        min_x, max_x = min(ax, bx) - tol, max(ax, bx) + tol
+        min_y, max_y = min(ay, by) - tol, max(ay, by) + tol
+        size = self.cell_size
+        cell_x = range(math.floor(min_x / size), math.floor(max_x / size) + 1)
+        cell_y = range(math.floor(min_y / size), math.floor(max_y / size) + 1)
+        if len(cell_x) * len(cell_y) > len(self.cells):
+            # Long segments cover more cells than are occupied, so walk the occupied ones instead
+            cells = (points for (cx, cy), points in self.cells.items() if cx in cell_x and cy in cell_y)
+        else:
+            cells = (self.cells[(cx, cy)] for cx in cell_x for cy in cell_y if (cx, cy) in self.cells)
+        for points in cells:
+            for p, x, y in points:
+                if min_x <= x <= max_x and min_y <= y <= max_y \
+                        and abs(dx * (y - ay) - dy * (x - ax)) <= line_tol:
+                    yield p
+
+
+def _mean_edge_length(edges) -> float:
+    total = sum(math.dist((float(a[0]), float(a[1])), (float(b[0]), float(b[1]))) for a, b in edges)
+    return total / len(edges) if total else 1.0
+
+
+def split_edges(boundaries, cell_size: float = None):
+    """
+    Split every edge of the boundaries at the boundary points that lie on it.
+
+    Points are looked up in a PointGrid, so each edge is only tested against
+    points near it rather than every point.
+    """
     edges = []
     for boundary in boundaries:
         n = len(boundary)
@@ -91,22 +142,24 @@ def split_edges(boundaries):
             b = boundary[(i + 1) % n]
             edges.append((a, b))
 
+    if not edges:
+        return []
+
     # Collect all points
     points = set(p for edge in edges for p in edge)
+    grid = PointGrid(points, cell_size or _mean_edge_length(edges))
 
     # New edges after splitting
     split_edges = []
 
     for a, b in edges:
         # Find intermediate points on segment (a, b)
-        on_seg = [p for p in points if p != a and p != b and point_on_segment(p, a, b)]
+        on_seg = [p for p in grid.near_segment(a, b, line=True) if p != a and p != b and point_on_segment(p, a, b)]
         if not on_seg:
             split_edges.append((a, b))
         else:
             # Sort points along segment
-            def dist(p1, p2):
-                return (p1[0] - p2[0])**2 + (p1[1] - p2[1])**2
-            all_points = [a] + sorted(on_seg, key=lambda p: dist(a, p)) + [b]
+            all_points = [a] + sorted(on_seg, key=lambda p: (p[0] - a[0])**2 + (p[1] - a[1])**2) + [b]
             for i in range(len(all_points) - 1):
                 split_edges.append((all_points[i], all_points[i+1]))
 
@@ -147,3 +200,250 @@ def trace_outer_boundary(graph):
         current = next_point
 
     return path
+
+
+def _unshared_edges(directed_edges):
+    """Edges that no other polygon shares, keyed by their (unordered) end points"""
+    edge_counter = Counter(frozenset(edge) for edge in directed_edges)
+    return [edge for edge in directed_edges if edge_counter[frozenset(edge)] == 1]
+
+def _is_clockwise(polygon) -> bool:
+    """Orientation from the float shoelace sum, which is plenty for a non-degenerate polygon"""
+    points = [(float(x), float(y)) for x, y in polygon]
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])) <= 0
+
+def clockwise(polygon) -> list:
+    """The vertices of a polygon in clockwise order"""
+    polygon = list(polygon)
+    return polygon if _is_clockwise(polygon) else polygon[::-1]
+
+def separated(first, second) -> bool:
+    """
+    Whether two clockwise convex polygons have disjoint interiors, i.e. some edge
+    of one has the whole of the other on or beyond it. Exact, and much cheaper
+    than clipping for pieces that only touch, where the shared edge separates them.
+    """
+    for polygon, other in ((first, second), (second, first)):
+        for a, b in get_edges(polygon):
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            if all(dx * (p[1] - a[1]) - dy * (p[0] - a[0]) >= 0 for p in other):
+                return True
+    return False
+
+# Every tangram edge points along a multiple of 45 degrees, numbered anticlockwise from +x
+_DIRECTIONS = {(1, 0): 0, (1, 1): 1, (0, 1): 2, (-1, 1): 3, (-1, 0): 4, (-1, -1): 5, (0, -1): 6, (1, -1): 7}
+
+def _sign(value) -> int:
+    return (value > 0) - (value < 0)
+
+def edge_direction(a, b) -> int | None:
+    """Direction of the edge from a to b, None when it is not a multiple of 45 degrees"""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx and dy and abs(dx) != abs(dy):
+        return None
+    return _DIRECTIONS.get((_sign(dx), _sign(dy)))
+
+def signed_area(polygon):
+    """Exact shoelace area, positive for counter-clockwise polygons"""
+    total = 0
+    for (x1, y1), (x2, y2) in get_edges(polygon):
+        total = total + (x1 * y2 - x2 * y1)
+    return total / 2
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+def remove_collinear(loop):
+    """Drop the vertices of a closed loop that lie on a straight run between their neighbours"""
+    points = list(loop)
+    changed = True
+    while changed and len(points) > 3:
+        changed = False
+        kept = []
+        n = len(points)
+        for i in range(n):
+            prev = kept[-1] if kept else points[i - 1]
+            if _cross(prev, points[i], points[(i + 1) % n]) == 0:
+                changed = True
+                continue
+            kept.append(points[i])
+        points = kept
+    return points
+
+def _left_turn(incoming, outgoing) -> float:
+    """Counter-clockwise angle turned from the incoming to the outgoing direction, a U-turn being the least (-pi)"""
+    turn = math.atan2(float(outgoing[1]), float(outgoing[0])) - math.atan2(float(incoming[1]), float(incoming[0]))
+    return (turn + math.pi) % (2 * math.pi) - math.pi
+
+def trace_loops(edges):
+    """
+    Join directed boundary edges into closed loops. Where a vertex has more
+    than one way out (polygons touching at a corner) the sharpest left turn is
+    taken, which keeps the loop on the outside of the shape, so shapes that
+    touch at a corner come out as one loop passing through it twice.
+    """
+    outgoing = defaultdict(list)
+    for a, b in edges:
+        outgoing[a].append(b)
+
+    loops = []
+    for start, first in edges:
+        if first not in outgoing[start]:
+            continue
+        outgoing[start].remove(first)
+        loop = [start]
+        previous, current = start, first
+        while True:
+            candidates = outgoing[current]
+            if not candidates:
+                break
+            # Coming back to the start only closes the loop once no edge leaves it
+            loop.append(current)
+            incoming = (current[0] - previous[0], current[1] - previous[1])
+            following = max(candidates, key=lambda p: _left_turn(incoming, (p[0] - current[0], p[1] - current[1])))
+            candidates.remove(following)
+            previous, current = current, following
+        if current != start:
+            loop.append(current)
+        loops.append(loop)
+    return loops
+
+def boundary_loops(polygons):
+    """
+    Every boundary loop of the union of the polygons, in exact coordinates.
+
+    Edges are split wherever a vertex of another polygon touches them (so
+    collinear T-junctions line up), edges shared by two polygons cancel out,
+    and what is left is traced into loops: clockwise loops are outer
+    boundaries and counter-clockwise loops are holes.
+    """
+    # Orient every polygon clockwise so shared edges run in opposite directions
+    polygons = [list(p) if _is_clockwise(p) else list(p)[::-1] for p in polygons]
+    edges = _unshared_edges(split_edges(polygons))
+    return [remove_collinear(loop) for loop in trace_loops(edges)]
+
+def _outer_loop(loops):
+    """The largest clockwise loop, starting from its topmost then leftmost vertex"""
+    if not loops:
+        return []
+    outer = min(loops, key=signed_area)
+    start = outer.index(max(outer, key=lambda v: (v[1], -v[0])))
+    return outer[start:] + outer[:start]
+
+def outline(polygons):
+    """
+    Exact outer boundary of the polygons, as a clockwise list of vertices
+    starting from the topmost then leftmost vertex (the same form as
+    Tangram.vertices). Holes and collinear vertices are left out.
+    """
+    return _outer_loop(boundary_loops(polygons))
+
+
+class _BucketGrid:
+    """Uniform grid of cells holding keys by the float bounding box they cover"""
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+
+    def _cells(self, points):
+        xs = [float(p[0]) for p in points]
+        ys = [float(p[1]) for p in points]
+        size = self.cell_size
+        # Padded by a cell so values rounding across a cell border are still found
+        for cx in range(math.floor(min(xs) / size) - 1, math.floor(max(xs) / size) + 2):
+            for cy in range(math.floor(min(ys) / size) - 1, math.floor(max(ys) / size) + 2):
+                yield (cx, cy)
+
+    def add(self, key, points):
+        for cell in self._cells(points):
+            self.cells[cell].add(key)
+
+    def remove(self, key, points):
+        for cell in self._cells(points):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query(self, points) -> set:
+        found = set()
+        for cell in self._cells(points):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+
+class OutlineBuilder:
+    """
+    Merges polygons one at a time into a running set of boundary edges, so
+    the outline can be read after every step without re-unioning everything.
+
+    Adding a polygon only touches the boundary edges and vertices near it
+    (found through grids of cell_size), so merging N pieces of k edges each
+    costs O(N·k) rather than O(N²).
+    """
+    def __init__(self, cell_size: float = 1.0):
+        self.edges = {}     # frozenset of the end points -> directed edge
+        self._edge_grid = _BucketGrid(cell_size)
+        self._point_grid = _BucketGrid(cell_size)
+        self._point_count = Counter()
+
+    def __len__(self):
+        return len(self.edges)
+
+    def _split_at(self, edge, points):
+        """Split a directed edge at the given points that lie strictly inside it"""
+        a, b = edge
+        on_seg = [p for p in points if p != a and p != b and point_on_segment(p, a, b)]
+        if not on_seg:
+            return [edge]
+        all_points = [a] + sorted(on_seg, key=lambda p: (p[0] - a[0])**2 + (p[1] - a[1])**2) + [b]
+        return list(zip(all_points, all_points[1:]))
+
+    def _insert(self, edge):
+        self.edges[frozenset(edge)] = edge
+        self._edge_grid.add(edge, edge)
+        for p in edge:
+            if not self._point_count[p]:
+                self._point_grid.add(p, (p,))
+            self._point_count[p] += 1
+
+    def _remove(self, edge):
+        del self.edges[frozenset(edge)]
+        self._edge_grid.remove(edge, edge)
+        for p in edge:
+            self._point_count[p] -= 1
+            if not self._point_count[p]:
+                del self._point_count[p]
+                self._point_grid.remove(p, (p,))
+
+    def add(self, polygon):
+        """Merge a polygon into the boundary"""
+        polygon = list(polygon) if _is_clockwise(polygon) else list(polygon)[::-1]
+
+        # Boundary edges that one of the new vertices lands in the middle of are split first
+        for edge in self._edge_grid.query(polygon):
+            pieces = self._split_at(edge, polygon)
+            if len(pieces) > 1:
+                self._remove(edge)
+                for piece in pieces:
+                    self._insert(piece)
+
+        # New edges are split at the boundary vertices on them, then cancel against shared edges
+        for edge in get_edges(polygon):
+            for piece in self._split_at(edge, self._point_grid.query(edge)):
+                shared = self.edges.get(frozenset(piece))
+                if shared is not None:
+                    self._remove(shared)
+                else:
+                    self._insert(piece)
+
+    def loops(self):
+        """Every boundary loop so far, clockwise for outer boundaries and counter-clockwise for holes"""
+        return [remove_collinear(loop) for loop in trace_loops(list(self.edges.values()))]
+
+    def outline(self):
+        """Outer boundary so far, in the same form as outline()"""
+        return _outer_loop(self.loops())
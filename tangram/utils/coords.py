@@ -1,29 +1,119 @@
 
 from collections import defaultdict
-from functools import total_ordering
 from fractions import Fraction
-import numpy as np
+import math
+from math import gcd
 
 def arc_sort(x: tuple[float], y: tuple[float], offset: float = 0.0):
     dx = y[0] - x[0]
     dy = y[1] - x[1]
-    theta = np.arctan2(float(dx), float(dy))
-    return (theta + offset)%(2*np.pi)
+    theta = math.atan2(float(dx), float(dy))
+    return (theta + offset)%(2*math.pi)
+
+
+_SQRT2 = pow(2, 0.5)
+_new = object.__new__
+# Coordinate strings by the parts (a, b, d) of their Number, tangram coordinates come from few values
+_COORDINATE_FORMATS = {}
+_MAX_COORDINATE_FORMATS = 1 << 16
+
+
+def _as_fraction(value) -> Fraction:
+    """Exact fraction for an int/Fraction, closest small fraction for a float"""
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, float):
+        return Fraction(value).limit_denominator()
+    return Fraction(value)
+
+
+def _sign(x: int, y: int) -> int:
+    """Exact sign of x + y√2 for integers x and y"""
+    if y == 0:
+        return (x > 0) - (x < 0)
+    if x >= 0 and y > 0:
+        return 1
+    if x <= 0 and y < 0:
+        return -1
+    # Opposite signs, √2 is irrational so x² can never equal 2y²
+    if x * x > 2 * y * y:
+        return 1 if x > 0 else -1
+    return 1 if y > 0 else -1
+
 
-@total_ordering
 class Number:
+    """
+    An exact number in the form: (a + b√2) / d
+
+    The integers a, b and d are always kept normalised (d > 0 and
+    gcd(a, b, d) == 1) so equal values share one representation, which
+    makes __eq__ and __hash__ exact and consistent with each other.
+    """
+    __slots__ = ('_a', '_b', '_d', '_hash')
+
     def __init__(self, rational: float = 0, irrational: float = 0):
         """
         Create a number in the form: rational + irrational*√2
         
         Args:
-            rational (float): The rational part of the number
-            irrational (float): The coefficient of √2
+            rational (int | Fraction | float): The rational part of the number
+            irrational (int | Fraction | float): The coefficient of √2
         """
-        self.rational = float(rational)
-        self.irrational = float(irrational)
+        self._hash = None
+        if isinstance(rational, Number) and not irrational:
+            self._a, self._b, self._d = rational._a, rational._b, rational._d
+            return
+        if type(rational) is int and type(irrational) is int:
+            self._a, self._b, self._d = rational, irrational, 1
+            return
+        r = _as_fraction(rational)
+        i = _as_fraction(irrational)
+        d = r.denominator * i.denominator // gcd(r.denominator, i.denominator)
+        self._a = r.numerator * (d // r.denominator)
+        self._b = i.numerator * (d // i.denominator)
+        self._d = d
+
+    @staticmethod
+    def from_parts(a: int, b: int, d: int = 1) -> 'Number':
+        """Create the number (a + b√2) / d from its integer parts"""
+        if d < 0:
+            a, b, d = -a, -b, -d
+        return _make(a, b, d)
+
+    @classmethod
+    def _coerce(cls, other) -> 'Number':
+        if isinstance(other, Number):
+            return other
+        if isinstance(other, (int, float, Fraction)):
+            return cls(other)
+        return NotImplemented
+
+    @property
+    def rational(self) -> Fraction:
+        """The rational part of the number"""
+        return Fraction(self._a, self._d)
+
+    @property
+    def irrational(self) -> Fraction:
+        """The coefficient of √2"""
+        return Fraction(self._b, self._d)
+
+    @property
+    def parts(self) -> tuple[int, int, int]:
+        """The normalised integer parts (a, b, d) of (a + b√2) / d"""
+        return (self._a, self._b, self._d)
 
     def coordinate_format(self) -> str:
+        """The number as TeX coordinate text, e.g. 1-1/2*sqrt(2)"""
+        key = (self._a, self._b, self._d)
+        coordinate = _COORDINATE_FORMATS.get(key)
+        if coordinate is None:
+            if len(_COORDINATE_FORMATS) >= _MAX_COORDINATE_FORMATS:
+                _COORDINATE_FORMATS.clear()
+            coordinate = _COORDINATE_FORMATS[key] = _half_coordinate_format(*key) or self._coordinate_format()
+        return coordinate
+
+    def _coordinate_format(self) -> str:
         coordinate = self.__repr__()
         coordinate = coordinate.replace('(','').replace(')','').replace(' ','')
         if abs(self.irrational) == 1:
@@ -39,59 +129,136 @@ class Number:
             return str(fraction.numerator)
         return f"{fraction.numerator}/{fraction.denominator}"
 
+    def _compare(self, other) -> int:
+        """Exact sign of (self - other), or NotImplemented"""
+        if isinstance(other, float):
+            # Floats are usually far apart enough to decide without exact arithmetic
+            difference = self.__float__() - other
+            if abs(difference) > 1e-9 * max(1.0, abs(other)):
+                return 1 if difference > 0 else -1
+            other = Fraction(other)
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+        d1, d2 = self._d, other._d
+        return _sign(self._a * d2 - other._a * d1, self._b * d2 - other._b * d1)
+
     def __eq__(self, other):
         if isinstance(other, Number):
-            if self.rational == other.rational and self.irrational == other.irrational:
-                return True
-            else:
-                self.__float__() == other.__float__()
-        return self.__float__() == other.__float__()
+            return self._a == other._a and self._b == other._b and self._d == other._d
+        if isinstance(other, (int, float, Fraction)):
+            # Only a number without a √2 part can equal a rational value
+            return self._b == 0 and Fraction(self._a, self._d) == other
+        return NotImplemented
 
     def __lt__(self, other):
-        return self.__float__() < other.__float__()
+        cmp = self._compare(other)
+        return cmp if cmp is NotImplemented else cmp < 0
+
+    def __le__(self, other):
+        cmp = self._compare(other)
+        return cmp if cmp is NotImplemented else cmp <= 0
+
+    def __gt__(self, other):
+        cmp = self._compare(other)
+        return cmp if cmp is NotImplemented else cmp > 0
+
+    def __ge__(self, other):
+        cmp = self._compare(other)
+        return cmp if cmp is NotImplemented else cmp >= 0
+
+    def __bool__(self):
+        return self._a != 0 or self._b != 0
     
     def __neg__(self):
         """Handle negation (-x)"""
-        return Number(-self.rational, -self.irrational)
+        return _raw(-self._a, -self._b, self._d)
     
     def __pos__(self):
         """Handle unary plus (+x)"""
         return self
     
     def __add__(self, other):
-        if isinstance(other, (int, float)):
-            return Number(self.rational + other, self.irrational)
-        return Number(self.rational + other.rational, self.irrational + other.irrational)
+        if type(other) is Number:
+            d1, d2 = self._d, other._d
+            if d1 == 1 and d2 == 1:
+                return _raw(self._a + other._a, self._b + other._b, 1)
+        elif type(other) is int:
+            # Adding a multiple of d keeps the parts normalised
+            return _raw(self._a + other * self._d, self._b, self._d)
+        else:
+            other = self._coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+            d1, d2 = self._d, other._d
+        if d1 == d2:
+            return _make(self._a + other._a, self._b + other._b, d1)
+        return _make(self._a * d2 + other._a * d1, self._b * d2 + other._b * d1, d1 * d2)
     
     def __radd__(self, other):
         """Handle right addition (other + self)"""
         return self.__add__(other)
     
     def __sub__(self, other):
-        if isinstance(other, (int, float)):
-            return Number(self.rational - other, self.irrational)
-        return Number(self.rational - other.rational, self.irrational - other.irrational)
+        if type(other) is Number:
+            d1, d2 = self._d, other._d
+            if d1 == 1 and d2 == 1:
+                return _raw(self._a - other._a, self._b - other._b, 1)
+        elif type(other) is int:
+            return _raw(self._a - other * self._d, self._b, self._d)
+        else:
+            other = self._coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+            d1, d2 = self._d, other._d
+        if d1 == d2:
+            return _make(self._a - other._a, self._b - other._b, d1)
+        return _make(self._a * d2 - other._a * d1, self._b * d2 - other._b * d1, d1 * d2)
     
     def __rsub__(self, other):
         """Handle right subtraction (other - self)"""
-        return Number(other, 0) - self
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return other.__sub__(self)
     
     def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            return Number(self.rational * other, self.irrational * other)
+        if type(other) is not Number:
+            if type(other) is int:
+                return _make(self._a * other, self._b * other, self._d)
+            other = self._coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
         # (a + b√2)(c + d√2) = (ac + 2bd) + (ad + bc)√2
-        return Number(
-            self.rational * other.rational + 2 * self.irrational * other.irrational,
-            self.rational * other.irrational + self.irrational * other.rational
-        )
+        a, b, c, d = self._a, self._b, other._a, other._b
+        return _make(a * c + 2 * b * d, a * d + b * c, self._d * other._d)
     
     def __rmul__(self, other):
         """Handle right multiplication (other * self)"""
         return self.__mul__(other)
+
+    def __truediv__(self, other):
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+        # 1 / (a + b√2) = (a - b√2) / (a² - 2b²)
+        a, b = other._a, other._b
+        norm = a * a - 2 * b * b
+        if norm == 0:
+            raise ZeroDivisionError('division by zero')
+        if norm < 0:
+            a, b, norm = -a, -b, -norm
+        return self * _make(other._d * a, -other._d * b, norm)
+
+    def __rtruediv__(self, other):
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return other.__truediv__(self)
     
     def __float__(self):
         """Convert to floating point number"""
-        return float(self.rational) + float(self.irrational * pow(2,0.5))
+        return (self._a + self._b * _SQRT2) / self._d
     
     def __mod__(self, other):
         """Handles the modulus operator"""
@@ -99,14 +266,30 @@ class Number:
             return self.__float__() % other
         
     def __hash__(self):
-        return hash(self.__float__())
+        if self._hash is None:
+            if self._b != 0:
+                self._hash = hash((self._a, self._b, self._d))
+            elif self._d == 1:
+                self._hash = hash(self._a)
+            else:
+                # Matches the hash of the equal int/float/Fraction
+                self._hash = hash(Fraction(self._a, self._d))
+        return self._hash
     
     def __abs__(self):
-        return abs(self.__float__())
+        return -self if _sign(self._a, self._b) < 0 else self
     
     def __pow__(self, other):
+        if isinstance(other, int) and other >= 0:
+            result = _raw(1, 0, 1)
+            for _ in range(other):
+                result = result * self
+            return result
         if isinstance(other, (int, float)):
             return pow(self.__float__(), other)
+
+    def __reduce__(self):
+        return (_make, (self._a, self._b, self._d))
     
     
     def __repr__(self):
@@ -157,6 +340,76 @@ class Number:
         return "".join(parts)
     
 
+def _half_format(n: int, d: int) -> str:
+    return str(n // d) if n % d == 0 else f'{n}/{d}'
+
+
+def _half_coordinate_format(a: int, b: int, d: int) -> str | None:
+    """
+    coordinate_format of (a + b√2) / d without Fractions, for whole and half
+    coefficients (d of 1 or 2), following __repr__ case by case. None otherwise.
+    """
+    if d > 2:
+        return None
+    if b == 0:
+        return _half_format(a, d)
+    if abs(b) == d:
+        if a == 0:
+            return 'sqrt(2)' if b > 0 else '-sqrt(2)'
+        return f"{_half_format(a, d)}{'+' if b > 0 else '-'}sqrt(2)"
+    if a == 0:
+        # __repr__ drops the sign of a whole coefficient when there is no rational part
+        return f'{_half_format(abs(b) if b % d == 0 else b, d)}*sqrt(2)'
+    return f"{_half_format(a, d)}{'+' if b > 0 else '-'}{_half_format(abs(b), d)}*sqrt(2)"
+
+
+def tex_number(value: Number) -> str:
+    """
+    A coordinate in the form the parser reads, e.g. 2 - 1.5 * sqrt(2). Coefficients
+    without an exact decimal fall back to Number.coordinate_format, e.g. 1/3-2/3*sqrt(2).
+    """
+    def decimal(fraction: Fraction) -> str | None:
+        text = str(fraction.numerator) if fraction.denominator == 1 else str(float(fraction))
+        return text if Fraction(text) == fraction else None
+
+    rational, irrational = value.rational, value.irrational
+    rational_text, irrational_text = decimal(rational), decimal(abs(irrational))
+    if rational_text is None or irrational_text is None:
+        return value.coordinate_format()
+    if not irrational:
+        return rational_text
+    sqrt = 'sqrt(2)' if abs(irrational) == 1 else f'{irrational_text} * sqrt(2)'
+    if not rational:
+        return sqrt if irrational > 0 else f'-{sqrt}'
+    return f"{rational_text} {'+' if irrational > 0 else '-'} {sqrt}"
+
+
+def _make(a: int, b: int, d: int) -> Number:
+    """Build a Number from integer parts, normalising by the common divisor"""
+    if d != 1:
+        g = gcd(a, b, d)
+        if g != 1:
+            a //= g
+            b //= g
+            d //= g
+    num = _new(Number)
+    num._a = a
+    num._b = b
+    num._d = d
+    num._hash = None
+    return num
+
+
+def _raw(a: int, b: int, d: int) -> Number:
+    """Build a Number from integer parts that are already normalised"""
+    num = _new(Number)
+    num._a = a
+    num._b = b
+    num._d = d
+    num._hash = None
+    return num
+
+
 def canonical_edge(a, b):
     """Sort edge vertices so direction doesnt matter"""
     return tuple(sorted([a, b]))
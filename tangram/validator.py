@@ -0,0 +1,140 @@
+
+from collections import Counter
+from typing import Iterable
+
+from .elements.tangram import STANDARD_SET, Tangram, TangramType
+from .utils.boundary import boundary_loops, clockwise, get_edges, separated, signed_area
+from .utils.coords import Number
+
+# Bounding boxes closer than this are treated as overlapping, so the exact test decides
+_EPSILON = 1e-9
+
+
+class Diagnostic:
+    """A problem found in a piece layout, with the source lines of the pieces involved"""
+    def __init__(self, kind: str, message: str, line_numbers: Iterable[int] = (),
+                 pieces: Iterable[int] = (), area: Number = None):
+        """
+        Args:
+            kind: 'count', 'overlap', 'hole' or 'disconnected'
+            message: Description of the problem
+            line_numbers: Source lines of the pieces involved, where known
+            pieces: Indexes of the pieces involved
+            area: Area of the overlap or hole
+        """
+        self.kind = kind
+        self.message = message
+        self.line_numbers = tuple(line for line in line_numbers if line is not None)
+        self.pieces = tuple(pieces)
+        self.area = area
+
+    def __repr__(self):
+        lines = f", Lines: {list(self.line_numbers)}" if self.line_numbers else ''
+        return f"Diagnostic ({self.kind}: {self.message}{lines})"
+
+    def __str__(self):
+        lines = ', '.join(str(line) for line in self.line_numbers)
+        return f"{'line ' + lines + ': ' if lines else ''}{self.message}"
+
+
+def intersection_area(first, second) -> Number:
+    """
+    Exact area of the intersection of two convex polygons, by clipping the
+    first against every edge of the second (Sutherland-Hodgman).
+    """
+    clipped = clockwise(first)
+    for a, b in get_edges(clockwise(second)):
+        if len(clipped) < 3:
+            return Number(0)
+        # Inside of a clockwise edge is on its right, where the cross product is negative
+        sides = [(b[0] - a[0]) * (p[1] - a[1]) - (b[1] - a[1]) * (p[0] - a[0]) for p in clipped]
+        result = []
+        for idx, point in enumerate(clipped):
+            following = clipped[(idx + 1) - len(clipped)]
+            side, following_side = sides[idx], sides[(idx + 1) - len(clipped)]
+            if side <= 0:
+                result.append(point)
+            if (side < 0 < following_side) or (following_side < 0 < side):
+                t = side / (side - following_side)
+                result.append((point[0] + (following[0] - point[0]) * t, point[1] + (following[1] - point[1]) * t))
+        clipped = result
+    if len(clipped) < 3:
+        return Number(0)
+    return -signed_area(clipped)
+
+
+def _overlapping_pairs(tangrams: list) -> list[tuple[int, int]]:
+    """
+    Pairs of pieces whose bounding boxes overlap, from a sweep along x over
+    Tangram._grid so only pieces whose x ranges overlap are compared.
+    """
+    boxes = []
+    for idx, gram in enumerate(tangrams):
+        (min_x, min_y), (max_x, max_y) = gram._grid
+        boxes.append((float(min_x), float(min_y), float(max_x), float(max_y), idx))
+    boxes.sort()
+
+    pairs = []
+    active = []
+    for min_x, min_y, max_x, max_y, idx in boxes:
+        active = [box for box in active if box[2] > min_x + _EPSILON]
+        for other in active:
+            if other[1] < max_y - _EPSILON and min_y < other[3] - _EPSILON:
+                pairs.append((min(idx, other[4]), max(idx, other[4])))
+        active.append((min_x, min_y, max_x, max_y, idx))
+    return sorted(pairs)
+
+
+def _count_diagnostics(tangrams: list, pieces: dict[TangramType, int]) -> list[Diagnostic]:
+    counts = Counter(gram.tangram_type for gram in tangrams)
+    diagnostics = []
+    for tangram_type in TangramType:
+        expected, found = pieces.get(tangram_type, 0), counts.get(tangram_type, 0)
+        if expected != found:
+            indexes = [idx for idx, gram in enumerate(tangrams) if gram.tangram_type == tangram_type]
+            diagnostics.append(Diagnostic(
+                'count', f'expected {expected} {tangram_type} piece(s), found {found}',
+                [tangrams[idx].line_number for idx in indexes], indexes))
+    return diagnostics
+
+
+def validate(tangrams: Iterable[Tangram], pieces: dict[TangramType, int] = None) -> list[Diagnostic]:
+    """
+    Check that the pieces form a valid tangram: the right number of each piece,
+    no two pieces overlapping and no holes left between them.
+
+    Args:
+        tangrams: The pieces, anything with the attributes of Tangram
+        pieces: Number of each TangramType expected, defaults to one tangram set
+
+    Returns list of Diagnostic, empty when the layout is valid.
+    """
+    tangrams = list(tangrams)
+    diagnostics = _count_diagnostics(tangrams, STANDARD_SET if pieces is None else pieces)
+
+    overlaps = False
+    for first, second in _overlapping_pairs(tangrams):
+        first_vertices, second_vertices = clockwise(tangrams[first].vertices), clockwise(tangrams[second].vertices)
+        if separated(first_vertices, second_vertices):
+            continue
+        area = intersection_area(first_vertices, second_vertices)
+        if area > 0:
+            overlaps = True
+            diagnostics.append(Diagnostic(
+                'overlap', f'{tangrams[first].tangram_type} and {tangrams[second].tangram_type} overlap by {area}',
+                (tangrams[first].line_number, tangrams[second].line_number), (first, second), area))
+
+    # Tracing the boundary is only meaningful when no pieces overlap
+    if tangrams and not overlaps:
+        loops = [(loop, signed_area(loop)) for loop in boundary_loops([gram.vertices for gram in tangrams])]
+        outer = [loop for loop, area in loops if area < 0]
+        for loop, area in loops:
+            if area > 0:
+                corners = set(loop)
+                indexes = [idx for idx, gram in enumerate(tangrams) if corners.intersection(gram.vertices)]
+                diagnostics.append(Diagnostic(
+                    'hole', f'gap of area {area} enclosed by the pieces',
+                    [tangrams[idx].line_number for idx in indexes], indexes, area))
+        if len(outer) > 1:
+            diagnostics.append(Diagnostic('disconnected', f'pieces form {len(outer)} separate shapes'))
+    return diagnostics
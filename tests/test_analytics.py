@@ -0,0 +1,122 @@
+"""
+Tests of CorpusAnalytics against the same figures worked out piece by piece
+from Tangrams. Run from the repository root:
+
+    python -m pytest -q tests/test_analytics.py
+"""
+from collections import Counter
+from pathlib import Path
+import io
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.analyser import CorpusAnalytics
+from tangram.elements.puzzle_array import PuzzleArray
+from tangram.elements.tangram import TangramType
+from tangram.generator import random_arrangement
+from tangram.utils.boundary import get_edges, signed_area
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+SQRT2 = Number(0, 1)
+
+
+@pytest.fixture(scope='module')
+def puzzles():
+    return [TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams for name in NAMES] + \
+        [random_arrangement(random.Random(seed)) for seed in range(12)]
+
+
+@pytest.fixture(scope='module')
+def analytics(puzzles):
+    return CorpusAnalytics(PuzzleArray.from_puzzles(puzzles))
+
+
+def _pieces(puzzles):
+    return [gram for tangrams in puzzles for gram in tangrams]
+
+
+def _perimeter(vertices) -> Number:
+    perimeter = Number(0)
+    for (x1, y1), (x2, y2) in get_edges(vertices):
+        dx, dy = abs(x2 - x1), abs(y2 - y1)
+        perimeter += dx * SQRT2 if dx and dy else dx + dy
+    return perimeter
+
+
+def test_group_by(analytics, puzzles):
+    pieces = _pieces(puzzles)
+    assert analytics.group_by() == Counter((gram.tangram_type, gram.rotate, gram.xflip, gram.yflip) for gram in pieces)
+    assert analytics.group_by('rotate', 'type') == Counter((gram.rotate, gram.tangram_type) for gram in pieces)
+    assert analytics.group_by('yflip') == Counter((gram.yflip,) for gram in pieces)
+    groups = analytics.group_by('type', 'xflip')
+    assert all(isinstance(tangram_type, TangramType) and isinstance(xflip, bool) for tangram_type, xflip in groups)
+    with pytest.raises(ValueError, match='unknown columns: colour'):
+        analytics.group_by('type', 'colour')
+
+
+def test_rotation_histogram(analytics, puzzles):
+    expected = {}
+    for gram in _pieces(puzzles):
+        counts = expected.setdefault(gram.tangram_type, {})
+        counts[gram.rotate] = counts.get(gram.rotate, 0) + 1
+    assert analytics.rotation_histogram() == expected
+
+
+def test_flip_rates(analytics, puzzles):
+    pieces = Counter(gram.tangram_type for gram in _pieces(puzzles))
+    flipped = Counter(gram.tangram_type for gram in _pieces(puzzles) if gram.xflip or gram.yflip)
+    rates = analytics.flip_rates()
+    assert set(rates) == set(pieces)
+    for tangram_type, count in pieces.items():
+        assert rates[tangram_type] == pytest.approx(flipped[tangram_type] / count)
+
+
+def test_measures(analytics, puzzles):
+    expected = {}
+    for gram in _pieces(puzzles):
+        totals = expected.setdefault(gram.tangram_type, {'pieces': 0, 'area': Number(0), 'perimeter': Number(0)})
+        totals['pieces'] += 1
+        totals['area'] += abs(signed_area(gram.vertices))
+        totals['perimeter'] += _perimeter(gram.vertices)
+    assert analytics.measures() == expected
+
+
+def test_puzzle_areas(analytics, puzzles):
+    expected = Counter(sum((abs(signed_area(gram.vertices)) for gram in tangrams), Number(0)) for tangrams in puzzles)
+    assert analytics.puzzle_areas() == expected == {Number(8): len(puzzles)}
+
+
+def test_bounding_boxes(analytics, puzzles):
+    expected = Counter()
+    for tangrams in puzzles:
+        xs = [x for gram in tangrams for x, _ in gram.vertices]
+        ys = [y for gram in tangrams for _, y in gram.vertices]
+        expected[(max(xs) - min(xs), max(ys) - min(ys))] += 1
+    boxes = analytics.bounding_boxes()
+    assert boxes == expected
+    assert all(isinstance(side, Number) for box in boxes for side in box)
+
+
+def test_from_source_with_empty_environment():
+    text = ''.join(r'\begin{EnvTangramTikz}' + '\n' + (EXAMPLES / f'{name}.tex').read_text() + '\n'
+                   + r'\end{EnvTangramTikz}' + '\n' for name in NAMES)
+    text += r'\begin{EnvTangramTikz}' + '\n' + r'\end{EnvTangramTikz}' + '\n'
+    analytics = CorpusAnalytics.from_source(io.StringIO(text))
+    expected = CorpusAnalytics(PuzzleArray.from_puzzles(TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams
+                                                         for name in NAMES))
+    assert analytics.group_by() == expected.group_by()
+    assert analytics.puzzle_areas() == expected.puzzle_areas() == {Number(8): 3}
+    assert analytics.bounding_boxes() == expected.bounding_boxes()
+
+
+def test_empty_corpus():
+    analytics = CorpusAnalytics.from_source(io.StringIO('no pieces here\n'))
+    assert analytics.group_by() == {}
+    assert analytics.flip_rates() == analytics.measures() == {}
+    assert analytics.puzzle_areas() == analytics.bounding_boxes() == {}
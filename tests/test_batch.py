@@ -0,0 +1,76 @@
+"""
+Tests of TangramBatch: file order, error capture, sources and outputs.
+Run from the repository root:
+
+    python -m pytest -q tests/test_batch.py
+"""
+from pathlib import Path
+import shutil
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.batch import TangramBatch
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for idx in range(9):
+        shutil.copy(EXAMPLES / f'{NAMES[idx % 3]}.tex', tmp_path / f'{idx:02}_{NAMES[idx % 3]}.tex')
+    (tmp_path / '03_empty.tex').write_text('\\begin{document}\n\\end{document}\n')
+    (tmp_path / '05_broken.tex').write_text(r'\PieceTangram[TangSol]<rotate=x>({0},{0}){TangCar}')
+    (tmp_path / '07_overlap.tex').write_text('\n'.join([r'\PieceTangram[TangSol]({0},{0}){TangCar}',
+                                                        r'\PieceTangram[TangSol]({0.5},{0}){TangCar}']))
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs, chunksize', [(1, None), (2, None), (3, 1), (2, 5)])
+def test_results_in_file_order(corpus, jobs, chunksize):
+    batch = TangramBatch(corpus, jobs=jobs, chunksize=chunksize)
+    results = batch.run()
+    assert [result.path for result in results] == batch.paths == sorted(str(path) for path in corpus.glob('*.tex'))
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_outputs_match_puzzle(corpus, jobs):
+    for result in TangramBatch(corpus, jobs=jobs).run():
+        if not result.ok or result.diagnostics:
+            continue
+        puzzle = TangramPuzzle(result.path)
+        assert result.transformations == puzzle.transformations
+        assert result.vertices == str(puzzle)
+        assert result.tex == puzzle.draw_pieces('', writeout=False)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_errors_are_captured(corpus, jobs):
+    missing = str(corpus / 'missing.tex')
+    batch = TangramBatch([corpus, missing], jobs=jobs)
+    batch.run()
+    errors = {Path(result.path).name: result.error for result in batch.errors}
+    assert set(errors) == {'03_empty.tex', '05_broken.tex', 'missing.tex'}
+    assert errors['03_empty.tex'] == 'ValueError: no tangram pieces found'
+    assert errors['missing.tex'].startswith('FileNotFoundError')
+    assert [Path(result.path).name for result in batch.invalid] == ['07_overlap.tex']
+    assert sum(result.ok for result in batch.results) == len(batch.paths) - 3
+
+
+def test_sources(corpus):
+    everything = TangramBatch(corpus).paths
+    assert TangramBatch(str(corpus / '*_cat.tex')).paths == [path for path in everything if path.endswith('_cat.tex')]
+    assert TangramBatch([corpus / '01_cat.tex', corpus / '00_kangaroo.tex']).paths == \
+        [str(corpus / '01_cat.tex'), str(corpus / '00_kangaroo.tex')]
+    assert len(TangramBatch(corpus)) == 12
+
+
+def test_options(corpus, tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp('out')
+    results = TangramBatch(corpus / '00_kangaroo.tex', jobs=1, output_dir=output_dir).run()
+    assert (output_dir / '00_kangaroo_pieces_on_grid.tex').read_text() == results[0].tex
+
+    result = TangramBatch(corpus / '07_overlap.tex', jobs=1, draw=False, validate=False).run()[0]
+    assert result.ok and result.tex is None and result.diagnostics == []
+    assert 'ok' in repr(result)
@@ -0,0 +1,99 @@
+"""
+Tests of ParseCache hits, misses and damaged entries. Run from the repository root:
+
+    python -m pytest -q tests/test_cache.py
+"""
+from pathlib import Path
+import warnings
+
+import pytest
+
+from tangram.cache import ParseCache
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.cli import TangramServer
+from tangram.parser import LatexTangramParser, iter_tangrams
+
+EXAMPLE = Path(__file__).resolve().parents[1] / 'examples' / 'kangaroo.tex'
+
+
+def _summary(tangrams) -> list:
+    return [(gram.tangram_type, gram.vertices, gram.line_number) for gram in tangrams]
+
+
+@pytest.fixture
+def expected():
+    return _summary(LatexTangramParser(EXAMPLE.read_text()).parse())
+
+
+def _entry(cache: ParseCache) -> Path:
+    return cache._path(cache.key(EXAMPLE.read_bytes()))
+
+
+def test_miss_then_hit(tmp_path, expected):
+    cache = ParseCache(tmp_path)
+    assert _summary(cache.load(EXAMPLE)) == expected
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert _entry(cache).is_file()
+
+    # A fresh instance reads the entry written by the first
+    cache = ParseCache(tmp_path)
+    assert _summary(cache.load(EXAMPLE)) == expected
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_changed_content_misses(tmp_path):
+    cache = ParseCache(tmp_path)
+    content = EXAMPLE.read_bytes()
+    assert cache.key(content) != cache.key(content + b'\n')
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:10],
+    lambda data: b'',
+    lambda data: data[:-1] + bytes([data[-1] ^ 0xff]),
+    lambda data: data[:20] + b'\xff' * (len(data) - 20),
+    lambda data: b'not a cache entry at all',
+], ids=['truncated', 'header only', 'empty', 'last byte', 'garbage body', 'garbage'])
+def test_damaged_entry_is_a_miss(tmp_path, expected, damage):
+    ParseCache(tmp_path).load(EXAMPLE)
+    entry = _entry(ParseCache(tmp_path))
+    entry.write_bytes(damage(entry.read_bytes()))
+
+    cache = ParseCache(tmp_path)
+    assert cache.get(cache.key(EXAMPLE.read_bytes())) is None
+    assert not entry.exists()
+    assert _summary(cache.load(EXAMPLE)) == expected
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert entry.is_file()
+
+
+def test_unwritable_directory(tmp_path, expected):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    cache = ParseCache(blocker / 'cache')
+    assert _summary(cache.load(EXAMPLE)) == expected
+    assert _summary(cache.load(EXAMPLE)) == expected
+    assert cache.misses == 2
+
+
+def test_eviction(tmp_path):
+    cache = ParseCache(tmp_path, max_bytes=1)
+    cache.load(EXAMPLE)
+    assert cache.size <= 1
+
+
+def test_same_parse_as_uncached(tmp_path):
+    # A piece split over more lines than the streaming parser waits for is skipped
+    # whether or not the cache is used; the whole-text parser would keep it
+    path = tmp_path / 'split.tex'
+    path.write_bytes(b'\\PieceTangram[TangSol]({0},{0}){TangCar}\r\n\\PieceTangram[TangSol]'
+                     + b'\r\n' * 70 + b'({1},{1}){TangCar}\r\n')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        expected = _summary(iter_tangrams(str(path)))
+        assert len(expected) == 1
+        assert _summary(TangramPuzzle(path).tangrams) == expected
+        assert _summary(ParseCache(tmp_path / 'cache').load(path)) == expected
+        assert _summary(ParseCache(tmp_path / 'cache').load(path)) == expected
+        assert _summary(TangramServer().puzzle(path.read_bytes()).tangrams) == expected
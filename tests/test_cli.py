@@ -0,0 +1,142 @@
+"""
+Tests of the command-line tool's outputs and exit codes, and of the JSON
+line server. Run from the repository root:
+
+    python -m pytest -q tests/test_cli.py
+"""
+from pathlib import Path
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tangram.cli import TangramServer, main
+
+ROOT = Path(__file__).resolve().parents[1]
+KANGAROO = str(ROOT / 'examples' / 'kangaroo.tex')
+OVERLAP = '\n'.join([r'\PieceTangram[TangSol]({0},{0}){TangCar}', r'\PieceTangram[TangSol]({0.5},{0}){TangCar}'])
+
+
+@pytest.fixture
+def invalid(tmp_path):
+    path = tmp_path / 'overlap.tex'
+    path.write_text(OVERLAP)
+    return str(path)
+
+
+@pytest.mark.parametrize('command', ['transforms', 'vertices', 'pieces', 'outline', 'validate'])
+def test_commands_succeed(capsys, command):
+    assert main([command, KANGAROO]) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() and not err
+
+
+def test_validate_valid(capsys):
+    assert main(['validate', KANGAROO]) == 0
+    assert capsys.readouterr().out == 'valid\n'
+
+
+def test_validate_invalid(capsys, invalid):
+    assert main(['validate', invalid]) == 1
+    out, _ = capsys.readouterr()
+    assert 'overlap' in out and 'line 1, 2' in out
+
+
+def test_invalid_layout_still_draws(capsys, invalid):
+    # Only validate reports problems through the exit code
+    assert main(['pieces', invalid]) == 0
+
+
+def test_missing_file(capsys, tmp_path):
+    assert main(['transforms', str(tmp_path / 'missing.tex')]) == 1
+    out, err = capsys.readouterr()
+    assert not out and 'no such file' in err
+
+
+@pytest.mark.parametrize('pattern', ['*.tex', 'missing/*.tex', ''])
+def test_nothing_matched(capsys, tmp_path, pattern):
+    output_dir = tmp_path / 'out'
+    assert main(['transforms', '-d', str(output_dir), str(tmp_path / pattern)]) == 1
+    out, err = capsys.readouterr()
+    assert not out and err == 'tangram: no input files matched\n'
+    assert not output_dir.exists()
+
+
+def test_no_pieces(capsys, tmp_path):
+    path = tmp_path / 'empty.tex'
+    path.write_text('\\begin{document}\n\\end{document}\n')
+    assert main(['vertices', str(path)]) == 1
+    assert 'no tangram pieces found' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_one_failure_fails_the_run(capsys, tmp_path, jobs):
+    assert main(['transforms', '-j', jobs, KANGAROO, str(tmp_path / 'missing.tex')]) == 1
+    out, err = capsys.readouterr()
+    assert f'==> {KANGAROO} <==' in out and 'missing.tex' in err
+
+
+def test_stdin(capsys, monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(Path(KANGAROO).read_text()))
+    assert main(['transforms']) == 0
+    stdin_out = capsys.readouterr().out
+    assert main(['transforms', KANGAROO]) == 0
+    assert capsys.readouterr().out == stdin_out
+
+
+def test_output_dir(tmp_path):
+    assert main(['outline', '-d', str(tmp_path), KANGAROO]) == 0
+    assert (tmp_path / 'kangaroo_outline_on_grid.tex').is_file()
+
+
+def test_usage_errors(capsys):
+    with pytest.raises(SystemExit) as raised:
+        main(['unknown'])
+    assert raised.value.code == 2
+    with pytest.raises(SystemExit) as raised:
+        main(['serve', '--socket', 'a', '--port', '1'])
+    assert raised.value.code == 2
+
+
+def test_module_entry_point(invalid):
+    completed = subprocess.run([sys.executable, '-m', 'tangram', 'validate', invalid],
+                               cwd=ROOT, capture_output=True, text=True)
+    assert completed.returncode == 1
+    assert 'overlap' in completed.stdout
+
+
+def test_serve_stdin(capsys, monkeypatch, invalid):
+    requests = [{'command': 'validate', 'path': KANGAROO, 'id': 1},
+                {'command': 'validate', 'tex': OVERLAP},
+                {'command': 'nothing', 'path': KANGAROO}]
+    lines = [json.dumps(request) + '\n' for request in requests] + ['\n', 'not json\n']
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(''.join(lines)))
+    assert main(['serve']) == 0
+    responses = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert responses[0] == {'id': 1, 'ok': True, 'output': 'valid'}
+    assert responses[1]['ok'] and 'overlap' in responses[1]['output']
+    assert not responses[2]['ok'] and 'unknown command' in responses[2]['error']
+    assert not responses[3]['ok'] and responses[3]['error'].startswith('bad request')
+    assert len(responses) == 4
+
+
+def test_server_root(tmp_path):
+    (tmp_path / 'kangaroo.tex').write_text(Path(KANGAROO).read_text())
+    server = TangramServer(root=tmp_path)
+    assert server.handle({'command': 'validate', 'path': 'kangaroo.tex'}) == {'ok': True, 'output': 'valid'}
+    for request in [{'command': 'validate', 'path': KANGAROO},
+                    {'command': 'validate', 'path': '../kangaroo.tex'},
+                    {'command': 'pieces', 'path': 'kangaroo.tex', 'output': str(tmp_path.parent / 'out.tex')}]:
+        response = server.handle(request)
+        assert not response['ok'] and response['error'].startswith('PermissionError')
+    assert not (tmp_path.parent / 'out.tex').exists()
+
+
+def test_socket_path_guard(tmp_path):
+    path = tmp_path / 'not_a_socket'
+    path.write_text('keep me')
+    with pytest.raises(FileExistsError):
+        TangramServer().serve_socket(str(path))
+    assert path.read_text() == 'keep me'
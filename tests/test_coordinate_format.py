@@ -0,0 +1,70 @@
+"""
+Tests that the memoised Number.coordinate_format and its whole/half fast
+path give the same text as the original __repr__ based formatting.
+Run from the repository root:
+
+    python -m pytest -q tests/test_coordinate_format.py
+"""
+from fractions import Fraction
+from pathlib import Path
+import random
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils import coords
+from tangram.utils.coords import Number, _half_coordinate_format
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+HALVES = [Fraction(n, 2) for n in range(-9, 10)]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    coords._COORDINATE_FORMATS.clear()
+    yield
+    coords._COORDINATE_FORMATS.clear()
+
+
+def test_whole_and_half_coefficients():
+    for rational in HALVES:
+        for irrational in HALVES:
+            value = Number(rational, irrational)
+            assert _half_coordinate_format(*value.parts) == value._coordinate_format(), value.parts
+            assert value.coordinate_format() == value._coordinate_format()
+
+
+@pytest.mark.parametrize('denominator', [3, 4, 5, 8, 1000])
+def test_other_denominators(denominator):
+    for rational in range(-7, 8):
+        for irrational in range(-7, 8):
+            value = Number(Fraction(rational, denominator), Fraction(irrational, denominator))
+            assert value.coordinate_format() == value._coordinate_format(), value.parts
+
+
+def test_random_values():
+    rng = random.Random(0)
+    for _ in range(2000):
+        value = Number(Fraction(rng.randint(-10**6, 10**6), rng.choice([1, 2, 3, 4, 8, 10, 7919])),
+                       Fraction(rng.randint(-10**6, 10**6), rng.choice([1, 2, 3, 4, 8, 10, 7919])))
+        assert value.coordinate_format() == value._coordinate_format(), value.parts
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_example_coordinates(name):
+    for gram in TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams:
+        for point in gram.vertices:
+            for value in point:
+                assert value.coordinate_format() == value._coordinate_format()
+
+
+def test_cached(monkeypatch):
+    value = Number(Fraction(1, 3), Fraction(-2, 3))
+    first = value.coordinate_format()
+    assert coords._COORDINATE_FORMATS[value.parts] is first
+    assert Number(Fraction(2, 6), Fraction(-4, 6)).coordinate_format() is first
+
+    monkeypatch.setattr(coords, '_MAX_COORDINATE_FORMATS', 4)
+    for n in range(10):
+        assert Number(n, 1).coordinate_format() == Number(n, 1)._coordinate_format()
+    assert len(coords._COORDINATE_FORMATS) <= 4
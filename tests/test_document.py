@@ -0,0 +1,87 @@
+"""
+Tests of the streamed pieces and outline documents: the same text whether
+written to a path, an open file or a string, and against the q3 goldens.
+Run from the repository root:
+
+    python -m pytest -q tests/test_document.py
+"""
+from pathlib import Path
+import io
+import json
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.document import TangramOutline, TangramPieces
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+
+
+@pytest.fixture(scope='module')
+def goldens():
+    with open(ROOT / 'tests' / 'expected_outputs.json') as file:
+        return json.load(file)['q3']
+
+
+def _pieces(name: str) -> TangramPieces:
+    puzzle = TangramPuzzle(EXAMPLES / f'{name}.tex')
+    return TangramPieces(puzzle.grid_size, puzzle.sorted_tangrams)
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_matches_golden(goldens, name):
+    content = _pieces(name).generate_content()
+    assert content.splitlines() == [line.rstrip('\n') for line in goldens[name]]
+    assert content == ''.join(_pieces(name).iter_content())
+
+
+@pytest.mark.parametrize('buffer_size', [1, 64, 2**20])
+def test_write_to_path(tmp_path, buffer_size):
+    path = tmp_path / 'pieces.tex'
+    _pieces('cat').write(path, buffer_size=buffer_size)
+    assert path.read_text() == _pieces('cat').generate_content()
+
+
+def test_write_to_open_file(tmp_path):
+    buffer = io.StringIO()
+    _pieces('goose').write(buffer)
+    assert buffer.getvalue() == _pieces('goose').generate_content()
+    with open(tmp_path / 'pieces.tex', 'w') as file:
+        _pieces('goose').write(file)
+    assert (tmp_path / 'pieces.tex').read_text() == buffer.getvalue()
+
+
+def test_draw_pieces(tmp_path):
+    puzzle = TangramPuzzle(EXAMPLES / 'kangaroo.tex')
+    puzzle.draw_pieces(tmp_path / 'kangaroo_pieces_on_grid.tex')
+    assert (tmp_path / 'kangaroo_pieces_on_grid.tex').read_text() == puzzle.draw_pieces('', writeout=False)
+
+
+def test_streams_pieces_once():
+    puzzle = TangramPuzzle(EXAMPLES / 'cat.tex')
+    read = []
+
+    def pieces():
+        for gram in puzzle.sorted_tangrams:
+            read.append(gram)
+            yield gram
+
+    chunks = TangramPieces(puzzle.grid_size, pieces()).iter_content()
+    next(chunks), next(chunks)
+    # Only the header and grid are out, no piece has been read yet
+    assert read == []
+    next(chunks)
+    assert len(read) == 1
+    assert ''.join(chunks) and len(read) == len(puzzle.tangrams)
+
+
+def test_outline_document():
+    puzzle = TangramPuzzle(EXAMPLES / 'goose.tex')
+    document = TangramOutline(puzzle.grid_size, puzzle.outline)
+    assert document.generate_content() == ''.join(document.iter_content()) == \
+        puzzle.draw_outline('', writeout=False)
+    buffer = io.StringIO()
+    document.write(buffer)
+    assert buffer.getvalue() == document.content
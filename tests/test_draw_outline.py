@@ -0,0 +1,65 @@
+"""
+Tests of draw_outline against the q4 goldens, and of the incremental
+OutlineBuilder against outline(). Run from the repository root:
+
+    python -m pytest -q tests/test_draw_outline.py
+"""
+from pathlib import Path
+import json
+import random
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.generator import random_arrangement
+from tangram.utils.boundary import OutlineBuilder, outline
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT / 'examples'
+
+
+def _unindented(lines) -> list[str]:
+    # The q4 goldens were converted from space to tab indentation by hand, so only the text is compared
+    return [line.strip() for line in lines]
+
+
+@pytest.fixture(scope='module')
+def goldens():
+    with open(ROOT / 'tests' / 'expected_outputs.json') as file:
+        return json.load(file)['q4']
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_matches_golden(goldens, name):
+    actual = TangramPuzzle(EXAMPLES / f'{name}.tex').draw_outline('', writeout=False).splitlines()
+    assert _unindented(actual) == _unindented(goldens[name])
+
+
+def test_written_file(tmp_path, goldens):
+    puzzle = TangramPuzzle(EXAMPLES / 'kangaroo.tex')
+    puzzle.draw_outline(tmp_path / 'kangaroo_outline_on_grid.tex')
+    written = (tmp_path / 'kangaroo_outline_on_grid.tex').read_text()
+    assert written.splitlines() == puzzle.draw_outline('', writeout=False).splitlines()
+    assert _unindented(written.splitlines()) == _unindented(goldens['kangaroo'])
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_builder_matches_outline(name):
+    puzzle = TangramPuzzle(EXAMPLES / f'{name}.tex')
+    steps = list(puzzle.iter_outlines())
+    assert len(steps) == len(puzzle.tangrams)
+    for count, step in enumerate(steps, start=1):
+        assert step == outline([gram.vertices for gram in puzzle.tangrams[:count]])
+    assert steps[-1] == puzzle.outline
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_builder_any_order(seed):
+    tangrams = random_arrangement(random.Random(seed))
+    polygons = [gram.vertices for gram in tangrams]
+    expected = outline(polygons)
+    random.Random(seed).shuffle(polygons)
+    builder = OutlineBuilder()
+    for polygon in polygons:
+        builder.add(polygon)
+    assert builder.outline() == expected
@@ -0,0 +1,121 @@
+"""
+Tests of fingerprint() invariance under the 16 symmetries and translation,
+and of deduplication in TangramBatch. Run from the repository root:
+
+    python -m pytest -q tests/test_fingerprint.py
+"""
+from pathlib import Path
+from types import SimpleNamespace
+import random
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.batch import TangramBatch
+from tangram.elements.tangram import Tangram
+from tangram.fingerprint import SYMMETRIES, FingerprintIndex, fingerprint, transform
+from tangram.generator import random_arrangement, write_puzzle
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _moved(tangrams, symmetry, offset=(Number(0), Number(0))) -> list:
+    """Stand-ins for the pieces after a symmetry and a translation, with only what fingerprint reads"""
+    dx, dy = offset
+    return [SimpleNamespace(tangram_type=gram.tangram_type,
+                            vertices=tuple((x + dx, y + dy) for x, y in transform(gram.vertices, symmetry)))
+            for gram in tangrams]
+
+
+def _translated(tangrams, dx, dy) -> list[Tangram]:
+    return [Tangram(gram.tangram_type, {'rotate': gram.rotate, 'xscale': -1 if gram.xflip else 0,
+                                        'yscale': -1 if gram.yflip else 0},
+                    (gram.base_coords[0] + dx, gram.base_coords[1] + dy))
+            for gram in tangrams]
+
+
+@pytest.fixture(scope='module')
+def kangaroo():
+    return TangramPuzzle(EXAMPLES / 'kangaroo.tex')
+
+
+def test_symmetries():
+    assert len(SYMMETRIES) == 16
+    assert len(set(SYMMETRIES)) == 16
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES, ids=[f'{rotate}{"m" if mirror else ""}' for rotate, mirror in SYMMETRIES])
+def test_pieces_invariant(kangaroo, symmetry):
+    offset = (Number(3, -1), Number(-2, 1))
+    assert fingerprint(_moved(kangaroo.tangrams, symmetry, offset)) == fingerprint(kangaroo)
+
+
+@pytest.mark.parametrize('symmetry', SYMMETRIES, ids=[f'{rotate}{"m" if mirror else ""}' for rotate, mirror in SYMMETRIES])
+def test_outline_invariant(kangaroo, symmetry):
+    assert fingerprint(_moved(kangaroo.tangrams, symmetry), by='outline') == fingerprint(kangaroo, by='outline')
+
+
+def test_canonical_frame_round_trip(kangaroo):
+    key = fingerprint(kangaroo)
+    points = [point for gram in kangaroo.tangrams for point in gram.vertices]
+    assert key.from_canonical(key.to_canonical(points)) == points
+
+
+def test_different_figures_differ(kangaroo):
+    keys = {fingerprint(TangramPuzzle(EXAMPLES / f'{name}.tex')) for name in ('kangaroo', 'cat', 'goose')}
+    assert len(keys) == 3
+    assert fingerprint(random_arrangement(random.Random(0))) != fingerprint(kangaroo)
+
+
+def test_index(tmp_path, kangaroo):
+    path = tmp_path / 'index.json'
+    index = FingerprintIndex(path)
+    key = fingerprint(kangaroo)
+    assert index.add(key, 'kangaroo.tex') is None
+    assert index.add(key, 'copy.tex') == 'kangaroo.tex'
+    index.save()
+    assert FingerprintIndex(path).get(key) == 'kangaroo.tex'
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_dedup(tmp_path, jobs):
+    tangrams = random_arrangement(random.Random(5))
+    write_puzzle(tangrams, tmp_path / 'a.tex')
+    write_puzzle(_translated(tangrams, Number(4), Number(0, 1)), tmp_path / 'b.tex')
+    write_puzzle(random_arrangement(random.Random(6)), tmp_path / 'c.tex')
+
+    batch = TangramBatch(tmp_path, jobs=jobs, draw=False, dedup=True)
+    batch.run()
+    assert [Path(result.path).name for result in batch.results] == ['a.tex', 'b.tex', 'c.tex']
+    assert [Path(result.path).name for result in batch.duplicates] == ['b.tex']
+    assert Path(batch.duplicates[0].duplicate_of).name == 'a.tex'
+    assert batch.results[0].transformations and batch.results[2].transformations
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_dedup_skips_processing(tmp_path, jobs):
+    first, second, output_dir = tmp_path / 'first', tmp_path / 'second', tmp_path / 'out'
+    for directory in (first, second, output_dir):
+        directory.mkdir()
+    tangrams = random_arrangement(random.Random(5))
+    write_puzzle(tangrams, first / 'a.tex')
+    write_puzzle(_translated(tangrams, Number(4), Number(0, 1)), first / 'b.tex')
+    (first / 'c.tex').write_text('no pieces here\n')
+    index = tmp_path / 'index.json'
+
+    batch = TangramBatch(first, jobs=jobs, output_dir=output_dir, dedup=index, profile=True)
+    batch.run()
+    assert sorted(path.name for path in output_dir.iterdir()) == ['a_pieces_on_grid.tex']
+    assert [result.duplicate_of is not None for result in batch.results] == [False, True, False]
+    assert batch.results[0].fingerprint == batch.results[1].fingerprint
+    assert batch.results[2].error == 'ValueError: no tangram pieces found' and batch.results[2].fingerprint is None
+    assert batch.profile
+
+    # A later run against the saved index writes nothing for a puzzle it already holds
+    write_puzzle(_translated(tangrams, Number(0, 2), Number(1)), second / 'd.tex')
+    batch = TangramBatch(second, jobs=jobs, output_dir=output_dir, dedup=index)
+    batch.run()
+    assert batch.results[0].duplicate_of == str(first / 'a.tex')
+    assert batch.results[0].tex is None and batch.results[0].diagnostics == []
+    assert sorted(path.name for path in output_dir.iterdir()) == ['a_pieces_on_grid.tex']
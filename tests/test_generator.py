@@ -0,0 +1,67 @@
+"""
+Tests that generated figures and corpora parse back and pass validate().
+Run from the repository root:
+
+    python -m pytest -q tests/test_generator.py
+"""
+from fractions import Fraction
+import io
+import random
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.tangram import STANDARD_SET, TangramType
+from tangram.generator import iter_environments, random_arrangement, write_corpus, write_puzzle
+from tangram.parser import CoordParser, LatexTangramParser
+from tangram.parser import iter_environments as parse_environments
+from tangram.utils.coords import Number, tex_number
+from tangram.validator import validate
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_arrangement_is_valid(seed):
+    tangrams = random_arrangement(random.Random(seed))
+    assert validate(tangrams) == []
+    assert random_arrangement(random.Random(seed))[0].vertices == tangrams[0].vertices
+
+
+def test_other_piece_sets():
+    pieces = {TangramType.SQUARE: 2, TangramType.TRIANGLE_SMALL: 4}
+    tangrams = random_arrangement(random.Random(0), pieces)
+    assert validate(tangrams, pieces) == []
+
+
+def test_written_puzzle_is_valid(tmp_path):
+    tangrams = random_arrangement(random.Random(1))
+    write_puzzle(tangrams, tmp_path / 'figure.tex')
+    puzzle = TangramPuzzle(tmp_path / 'figure.tex')
+    assert puzzle.validate() == []
+    assert [gram.vertices for gram in puzzle.tangrams] == [gram.vertices for gram in tangrams]
+
+
+def test_environments_are_valid():
+    # Past the distinct figures, environments are moved copies written from templates
+    texts = list(iter_environments(12, seed=2, distinct=4))
+    assert len(texts) == 12
+    for text in texts:
+        assert validate(LatexTangramParser(text).parse()) == []
+
+
+def test_corpus_parses_back():
+    file = io.StringIO()
+    n_pieces = write_corpus(file, 10, seed=3, distinct=3, per_document=4)
+    file.seek(0)
+    environments = list(parse_environments(file))
+    assert len(environments) == 10
+    assert sum(len(tangrams) for tangrams in environments) == n_pieces == 10 * sum(STANDARD_SET.values())
+    assert all(validate(tangrams) == [] for tangrams in environments)
+
+
+@pytest.mark.parametrize('rational, irrational', [
+    (0, 0), (2, -1), (Fraction(3, 2), Fraction(-1, 2)), (0, -2), (Fraction(-5, 4), 1),
+    (Fraction(1, 3), 0), (0, Fraction(-1, 3)), (Fraction(1, 3), Fraction(-2, 3)), (1, Fraction(1, 7)),
+])
+def test_coordinates_parse_back(rational, irrational):
+    value = Number(rational, irrational)
+    assert CoordParser.number(tex_number(value)) == value
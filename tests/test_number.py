@@ -0,0 +1,87 @@
+"""
+Tests of the exact Q(√2) Number: normalisation, equality, hashing,
+ordering and arithmetic. Run from the repository root:
+
+    python -m pytest -q tests/test_number.py
+"""
+from fractions import Fraction
+import math
+import pickle
+
+import pytest
+
+from tangram.utils.coords import Number
+
+SQRT2 = Number(0, 1)
+
+
+def test_parts_are_normalised():
+    assert Number(Fraction(1, 2), Fraction(1, 2)).parts == (1, 1, 2)
+    assert Number(Fraction(2, 4), Fraction(-3, 6)).parts == (1, -1, 2)
+    assert Number.from_parts(2, 4, 6).parts == (1, 2, 3)
+    assert Number.from_parts(1, 1, -2).parts == (-1, -1, 2)
+    assert (Number(1, 1) / 2 * 2).parts == (1, 1, 1)
+
+
+def test_exact_equality():
+    assert SQRT2 * SQRT2 == 2
+    assert Number(0.5) == Fraction(1, 2) == Number(Fraction(1, 2))
+    assert Number(1, 1) / Number(1, 1) == 1
+    # 0.1 + 0.2 is not 0.3 in floats, but it is exactly here
+    assert Number(Fraction(1, 10)) + Number(Fraction(2, 10)) == Number(Fraction(3, 10))
+    assert Number(1, 1) != Number(1, -1)
+    assert SQRT2 != math.sqrt(2)
+
+
+def test_hash_matches_equality():
+    assert hash(Number(3)) == hash(3)
+    assert hash(Number(Fraction(1, 2))) == hash(Fraction(1, 2)) == hash(0.5)
+    assert len({Number(1, 1), Number(2, 2) / 2, Number.from_parts(2, 2, 2), Number(1, -1)}) == 2
+    assert {Number(2): 'two'}[SQRT2 * SQRT2] == 'two'
+
+
+@pytest.mark.parametrize('value', [
+    Number(0), Number(1, -1), Number(Fraction(-3, 2), Fraction(1, 2)), Number(7, 5), Number(-1, 0),
+    Number(Fraction(1, 3), Fraction(-2, 3)), Number(1, -Fraction(7071, 10000)),
+])
+def test_ordering_matches_floats(value):
+    for other in [Number(0), Number(1, -1), Number(Fraction(1, 2)), Number(-2, 1), Number(3, -2)]:
+        if value != other:
+            assert (value < other) == (float(value) < float(other))
+            assert (value > other) == (float(value) > float(other))
+        assert (value <= other) == (float(value) <= float(other) or value == other)
+
+
+def test_ordering_close_values():
+    # 1.4142 against √2, and 99/70 (a close rational approximation) against √2
+    assert Number(Fraction(14142, 10000)) < SQRT2 < Number(Fraction(99, 70))
+    assert Number(3, -2) > 0
+    assert sorted([SQRT2, Number(1), Number(-1, 1), Number(Fraction(3, 2))]) == \
+        [Number(-1, 1), Number(1), SQRT2, Number(Fraction(3, 2))]
+
+
+def test_arithmetic():
+    a, b = Number(1, 2), Number(Fraction(1, 2), -1)
+    assert a + b == Number(Fraction(3, 2), 1)
+    assert a - b == Number(Fraction(1, 2), 3)
+    assert a * b == Number(Fraction(1, 2) - 4, -1 + 1)
+    assert (a / b) * b == a
+    assert -a == Number(-1, -2) and abs(-a) == a and abs(Number(1, -1)) == Number(-1, 1)
+    assert 1 + a == a + 1 == Number(2, 2)
+    assert 3 - a == Number(2, -2)
+    assert a ** 2 == a * a
+    assert float(a) == pytest.approx(1 + 2 * math.sqrt(2))
+    with pytest.raises(ZeroDivisionError):
+        a / Number(0)
+
+
+def test_pickle_round_trip():
+    values = [Number(0), Number(Fraction(-3, 2), Fraction(5, 2)), SQRT2]
+    restored = pickle.loads(pickle.dumps(values))
+    assert restored == values
+    assert [value.parts for value in restored] == [value.parts for value in values]
+
+
+def test_repr():
+    assert repr(Number(1, 1)) == '1 + √2'
+    assert repr(Number(0)) == '0'
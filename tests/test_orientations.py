@@ -0,0 +1,56 @@
+"""
+Tests of the precomputed orientation table and canonical orientations.
+Run from the repository root:
+
+    python -m pytest -q tests/test_orientations.py
+"""
+import pytest
+
+from tangram.elements.tangram import (Tangram, TangramType, canonical_orientation, distinct_orientations,
+                                      normalise_transforms, oriented_vertices, rotation_values)
+from tangram.utils.coords import Number
+
+ORIENTATIONS = [(rotate, xflip, yflip) for rotate in rotation_values for xflip in (False, True) for yflip in (False, True)]
+
+
+def _params(rotate: int, xflip: bool, yflip: bool) -> dict:
+    return {'rotate': rotate, 'xscale': -1 if xflip else 0, 'yscale': -1 if yflip else 0}
+
+
+@pytest.mark.parametrize('tangram_type', TangramType)
+def test_table_matches_tangram(tangram_type):
+    for orientation in ORIENTATIONS:
+        gram = Tangram(tangram_type, _params(*orientation), (Number(0), Number(0)))
+        assert oriented_vertices(tangram_type, gram.rotate, gram.xflip, gram.yflip) == gram.vertices
+
+
+@pytest.mark.parametrize('tangram_type', TangramType)
+def test_canonical_orientation_is_normalised(tangram_type):
+    for orientation in ORIENTATIONS:
+        rotate, xflip, yflip, (dx, dy) = canonical_orientation(tangram_type, *orientation)
+        # A state normalise_transforms produces, so the rest of the code can hold it
+        assert normalise_transforms(_params(rotate, xflip, yflip)) == (rotate, xflip, yflip)
+        assert not (xflip and yflip)
+        moved = {(x + dx, y + dy) for x, y in oriented_vertices(tangram_type, rotate, xflip, yflip)}
+        assert moved == set(oriented_vertices(tangram_type, *orientation))
+
+
+@pytest.mark.parametrize('tangram_type, count', [
+    (TangramType.TRIANGLE_LARGE, 8), (TangramType.TRIANGLE_MEDIUM, 8), (TangramType.TRIANGLE_SMALL, 8),
+    (TangramType.SQUARE, 2), (TangramType.PARALLELOGRAM, 8),
+])
+def test_distinct_orientations(tangram_type, count):
+    orientations = distinct_orientations(tangram_type)
+    assert len(orientations) == count
+    assert all(not (xflip and yflip) for _, xflip, yflip in orientations)
+    assert orientations[0] == (0, False, False)
+    shapes = set()
+    for orientation in orientations:
+        vertices = oriented_vertices(tangram_type, *orientation)
+        x0, y0 = vertices[0]
+        shapes.add(frozenset((x - x0, y - y0) for x, y in vertices))
+    assert len(shapes) == count
+
+
+def test_square_quarter_turn():
+    assert canonical_orientation(TangramType.SQUARE, 90) == (0, False, False, (Number(-1), Number(0)))
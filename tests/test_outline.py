@@ -0,0 +1,80 @@
+"""
+Tests of the exact outline engine against shapely and on holes, corners
+and collinear vertices. Run from the repository root:
+
+    python -m pytest -q tests/test_outline.py
+"""
+from pathlib import Path
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils.boundary import boundary_loops, outline, remove_collinear, signed_area
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _square(x: int, y: int, size: int = 1) -> list:
+    return [(Number(x), Number(y + size)), (Number(x + size), Number(y + size)),
+            (Number(x + size), Number(y)), (Number(x), Number(y))]
+
+
+def _rounded(points) -> set:
+    return {(round(float(x), 6), round(float(y), 6)) for x, y in points}
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_matches_shapely(name):
+    shapely = pytest.importorskip('shapely')
+    polygons = [gram.vertices for gram in TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams]
+    exact = outline(polygons)
+    # Pieces touching only at a corner make shapely's union a MultiPolygon
+    union = shapely.unary_union([shapely.Polygon([(float(x), float(y)) for x, y in polygon]) for polygon in polygons])
+    parts = getattr(union, 'geoms', [union])
+    floats = [point for part in parts for point in remove_collinear(list(part.exterior.coords)[:-1])]
+    assert _rounded(exact) == _rounded(floats)
+    assert float(-signed_area(exact)) == pytest.approx(union.area)
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_outline_form(name):
+    loop = outline([gram.vertices for gram in TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams])
+    # Clockwise from the topmost then leftmost vertex, like Tangram.vertices
+    assert loop[0] == max(loop, key=lambda v: (v[1], -v[0]))
+    assert all(isinstance(value, Number) for point in loop for value in point)
+    assert signed_area(loop) < 0
+
+
+def test_collinear_vertices_are_dropped():
+    assert outline([_square(0, 0), _square(1, 0)]) == \
+        [(Number(0), Number(1)), (Number(2), Number(1)), (Number(2), Number(0)), (Number(0), Number(0))]
+
+
+def test_t_junction():
+    loop = outline([_square(0, 0, 2), _square(2, 0)])
+    assert len(loop) == 6
+    assert signed_area(loop) == -5
+
+
+def test_hole():
+    ring = [_square(x, y) for x in range(3) for y in range(3) if (x, y) != (1, 1)]
+    loops = boundary_loops(ring)
+    assert sorted(signed_area(loop) for loop in loops) == [-9, 1]
+    assert signed_area(outline(ring)) == -9
+
+
+def test_touching_corners():
+    loops = boundary_loops([_square(0, 0), _square(1, 1)])
+    assert len(loops) == 1 and len(loops[0]) == 8
+    assert signed_area(loops[0]) == -2
+
+
+def test_separate_shapes():
+    loops = boundary_loops([_square(0, 0), _square(3, 0, 2)])
+    assert sorted(signed_area(loop) for loop in loops) == [-4, -1]
+    assert signed_area(outline([_square(0, 0), _square(3, 0, 2)])) == -4
+
+
+def test_empty():
+    assert outline([]) == []
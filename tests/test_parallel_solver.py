@@ -0,0 +1,82 @@
+"""
+Tests of the solver split over worker processes: the same solutions as the
+serial search, timeouts and cancellation. Run from the repository root:
+
+    python -m pytest -q tests/test_parallel_solver.py
+"""
+from pathlib import Path
+import multiprocessing
+
+import pytest
+
+from tangram import analyser
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.analyser import TangramSolver
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+SQRT2 = Number(0, 1)
+SQUARE = [(0, 0), (0, 2 * SQRT2), (2 * SQRT2, 2 * SQRT2), (2 * SQRT2, 0)]
+DIAMOND = [(0, 0), (2, 2), (4, 0), (2, -2)]
+
+
+def _key(solution) -> tuple:
+    return tuple(sorted((gram.tangram_type.value, tuple(sorted(gram.vertices))) for gram in solution))
+
+
+@pytest.fixture(scope='module')
+def serial():
+    return {_key(solution) for solution in TangramSolver(SQUARE).iter_solutions()}
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_solve(name):
+    target = TangramPuzzle(EXAMPLES / f'{name}.tex').outline
+    solution = TangramSolver(target, jobs=2).solve()
+    assert TangramPuzzle(tangrams=solution).outline == target
+    assert multiprocessing.active_children() == []
+
+
+def test_same_solutions_as_serial(serial):
+    parallel = [_key(solution) for solution in TangramSolver(SQUARE, jobs=3).iter_solutions()]
+    assert len(parallel) == len(set(parallel)) == len(serial) == 8
+    assert set(parallel) == serial
+
+
+def test_stopping_early_shuts_the_pool_down():
+    solutions = TangramSolver(DIAMOND, jobs=2).iter_solutions()
+    next(solutions)
+    solutions.close()
+    assert multiprocessing.active_children() == []
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_timeout(jobs):
+    # Enumerating every solution of the diamond takes over a second
+    solver = TangramSolver(DIAMOND, jobs=jobs, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        list(solver.iter_solutions())
+    assert multiprocessing.active_children() == []
+    assert TangramSolver(DIAMOND, jobs=jobs, timeout=60).solve() is not None
+
+
+def test_cancelled_branch_stops():
+    solver = TangramSolver(DIAMOND)
+    branch = solver._branches(4)[0]
+    assert analyser._search_branch(solver.target, solver.pieces, branch, False, None)
+    cancel = multiprocessing.Event()
+    cancel.set()
+    analyser._init_worker(cancel)
+    try:
+        assert analyser._search_branch(solver.target, solver.pieces, branch, False, None) == []
+    finally:
+        analyser._init_worker(None)
+
+
+def test_branches_cover_the_search(serial):
+    solver = TangramSolver(SQUARE)
+    branches = solver._branches(8)
+    assert len(branches) >= 8
+    found = [_key(analyser._to_tangram(*placement) for placement in solution)
+             for branch in branches for solution in solver._resume(branch, first_only=False)]
+    assert len(found) == len(serial) and set(found) == serial
@@ -0,0 +1,64 @@
+"""
+Tests of LatexTangramParser on comments, tokens split over lines and the
+adversarial documents of the generator. Run from the repository root:
+
+    python -m pytest -q tests/test_parser.py
+"""
+
+import pytest
+
+from tangram.elements.tangram import TangramType
+from tangram.generator import ADVERSARIAL_KINDS, adversarial_documents
+from tangram.parser import CoordParser, LatexTangramParser
+
+
+def _parse(text: str) -> list:
+    return LatexTangramParser(text).parse()
+
+
+def test_piece_fields():
+    tangrams = _parse(r'\PieceTangram[TangSol]<rotate=-45, xscale=-1>({1-1.5*sqrt(2)},{.50*sqrt(2)}){TangGrandTri}')
+    assert len(tangrams) == 1
+    gram = tangrams[0]
+    assert gram.tangram_type == TangramType.TRIANGLE_LARGE
+    assert gram.line_number == 1
+    assert gram.base_coords == (CoordParser.number('1-1.5*sqrt(2)'), CoordParser.number('0.5*sqrt(2)'))
+
+
+def test_commented_pieces_are_skipped():
+    text = '\n'.join([
+        r'% \PieceTangram[TangSol]({0},{0}){TangCar}',
+        r'\PieceTangram[TangSol]({0},{0}){TangCar} % \PieceTangram[TangSol]({1},{1}){TangPetTri}',
+        r'50\% \PieceTangram[TangSol]({2},{0}){TangPara}',
+    ])
+    tangrams = _parse(text)
+    assert [gram.tangram_type for gram in tangrams] == [TangramType.SQUARE, TangramType.PARALLELOGRAM]
+    assert [gram.line_number for gram in tangrams] == [2, 3]
+
+
+def test_piece_split_over_lines():
+    text = 'before\n\\PieceTangram[TangSol]\n  <rotate=90>\n  ({0},\n   {sqrt(2)})\n  {TangMoyTri}\nafter'
+    tangrams = _parse(text)
+    assert len(tangrams) == 1
+    assert tangrams[0].line_number == 2
+    assert tangrams[0].tangram_type == TangramType.TRIANGLE_MEDIUM
+    assert tangrams[0].base_coords[1] == CoordParser.number('sqrt(2)')
+
+
+@pytest.mark.parametrize('kind', ADVERSARIAL_KINDS)
+def test_adversarial_documents(kind):
+    documents = {document_kind: (text, tangrams) for document_kind, text, tangrams in adversarial_documents(seed=1)}
+    text, expected = documents[kind]
+    parsed = _parse(text)
+    assert [sorted(gram.vertices) for gram in parsed] == [sorted(gram.vertices) for gram in expected]
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('+0+1*sqrt(2)', (0, 1)),
+    ('-1.5000*sqrt(2)', (0, -1.5)),
+    ('.50*sqrt(2)', (0, 0.5)),
+    ('-000.500', (-0.5, 0)),
+    ('-0.5-sqrt(2)', (-0.5, -1)),
+])
+def test_coordinates(expression, expected):
+    assert tuple(float(part) for part in CoordParser.parse(expression)) == pytest.approx(expected)
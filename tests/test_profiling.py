@@ -0,0 +1,125 @@
+"""
+Tests of the stage profiler: what it records, that it leaves nothing patched
+once disabled, and its JSON and Prometheus output. Run from the repository root:
+
+    python -m pytest -q tests/test_profiling.py
+"""
+from pathlib import Path
+import json
+import re
+import tracemalloc
+
+import pytest
+
+from tangram import TangramPuzzle as puzzle_module
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.batch import TangramBatch
+from tangram.parser import LatexTangramParser
+from tangram.profiling import Profiler, merge, profile, to_prometheus
+from tangram.utils import boundary
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+SAMPLE = re.compile(r'^tangram_stage_(?P<metric>\w+)\{stage="(?P<stage>\w+)"\} (?P<value>\S+)$')
+
+
+def _workload(name: str = 'cat') -> TangramPuzzle:
+    puzzle = TangramPuzzle(EXAMPLES / f'{name}.tex')
+    puzzle.draw_pieces('', writeout=False)
+    puzzle.outline
+    puzzle.transformations
+    puzzle.validate()
+    return puzzle
+
+
+def test_records_stages():
+    with Profiler() as profiler:
+        puzzle = _workload()
+    snapshot = profiler.snapshot()
+    n_pieces = len(puzzle.tangrams)
+    assert snapshot['parse_piece']['calls'] == snapshot['parse_piece']['items'] == n_pieces
+    assert snapshot['tangram_init']['calls'] == n_pieces
+    assert snapshot['sort']['items'] == snapshot['transforms']['items'] == n_pieces
+    assert snapshot['outline']['calls'] == 1 and snapshot['outline']['items'] == n_pieces
+    assert snapshot['validate']['calls'] == snapshot['tex']['calls'] == 1
+    assert all(stats['seconds'] >= 0 and stats['allocated_bytes'] == 0 for stats in snapshot.values())
+    # Stages that were never called are left out
+    assert 'outer_boundary_shapely' not in snapshot
+
+
+def test_disabled_restores_everything():
+    originals = (vars(LatexTangramParser)['_build'], boundary.outline, puzzle_module.outline)
+    with Profiler() as profiler:
+        assert profiler.enabled
+        assert boundary.outline is not originals[1] and puzzle_module.outline is boundary.outline
+    assert not profiler.enabled
+    assert (vars(LatexTangramParser)['_build'], boundary.outline, puzzle_module.outline) == originals
+
+    before = profiler.snapshot()
+    _workload()
+    assert profiler.snapshot() == before
+
+
+def test_allocations():
+    assert not tracemalloc.is_tracing()
+    with Profiler(allocations=True) as profiler:
+        assert tracemalloc.is_tracing()
+        _workload()
+    assert not tracemalloc.is_tracing()
+    assert any(stats['allocated_bytes'] for stats in profiler.snapshot().values())
+
+
+def test_reset_and_context_manager():
+    with profile() as profiler:
+        _workload()
+        profiler.reset()
+        assert profiler.snapshot() == {}
+        _workload('goose')
+    assert profiler.snapshot()['parse_piece']['calls'] == len(TangramPuzzle(EXAMPLES / 'goose.tex').tangrams)
+
+
+def test_merge():
+    snapshots = []
+    for name in NAMES:
+        with Profiler() as profiler:
+            _workload(name)
+        snapshots.append(profiler.snapshot())
+    merged = merge(snapshots + [None, {}])
+    assert merged['parse_piece']['calls'] == sum(snapshot['parse_piece']['calls'] for snapshot in snapshots)
+    assert merged['outline']['seconds'] == pytest.approx(sum(snapshot['outline']['seconds'] for snapshot in snapshots))
+    assert set(merged) == set().union(*snapshots)
+
+
+def test_json():
+    with Profiler() as profiler:
+        _workload()
+    assert json.loads(profiler.to_json()) == profiler.snapshot()
+
+
+def test_prometheus():
+    with Profiler() as profiler:
+        _workload()
+    snapshot = profiler.snapshot()
+    text = profiler.to_prometheus()
+    assert text == to_prometheus(snapshot) and text.endswith('\n')
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            assert re.match(r'^# (HELP tangram_stage_\w+_total .+|TYPE tangram_stage_\w+_total counter)$', line)
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        samples[match['metric'], match['stage']] = float(match['value'])
+    for stage, stats in snapshot.items():
+        for name, value in stats.items():
+            assert samples[f'{name}_total', stage] == pytest.approx(value)
+    assert to_prometheus(snapshot, prefix='puzzles').startswith('# HELP puzzles_stage_calls_total')
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_profile(jobs):
+    batch = TangramBatch([EXAMPLES / f'{name}.tex' for name in NAMES], jobs=jobs, profile=True)
+    results = batch.run()
+    assert all(result.profile for result in results)
+    assert batch.profile == merge(result.profile for result in results)
+    assert batch.profile['parse_piece']['calls'] == sum(len(TangramPuzzle(result.path).tangrams) for result in results)
@@ -0,0 +1,81 @@
+"""
+Tests that PuzzleArray piece views match the Tangrams they were built from.
+Run from the repository root:
+
+    python -m pytest -q tests/test_puzzle_array.py
+"""
+from pathlib import Path
+import io
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.puzzle_array import PuzzleArray
+from tangram.generator import random_arrangement
+from tangram.parser import iter_environments
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+ATTRIBUTES = ['tangram_type', 'rotate', 'xflip', 'yflip', 'line_number', 'base_coords',
+              'transformations', 'vertices', '_grid']
+
+
+def _assert_same(view, gram):
+    for name in ATTRIBUTES:
+        assert getattr(view, name) == getattr(gram, name), name
+
+
+@pytest.fixture(scope='module')
+def puzzles():
+    return [TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams for name in NAMES] + \
+        [random_arrangement(random.Random(seed)) for seed in range(3)]
+
+
+def test_views_match_tangrams(puzzles):
+    puzzle_array = PuzzleArray.from_puzzles(puzzles)
+    assert puzzle_array.n_puzzles == len(puzzles)
+    assert len(puzzle_array) == sum(len(tangrams) for tangrams in puzzles)
+    for views, tangrams in zip(puzzle_array.iter_puzzles(), puzzles, strict=True):
+        assert len(views) == len(tangrams)
+        for view, gram in zip(views, tangrams):
+            _assert_same(view, gram)
+            _assert_same(view.to_tangram(), gram)
+
+
+def test_indexing(puzzles):
+    puzzle_array = PuzzleArray.from_puzzles(puzzles)
+    flat = [gram for tangrams in puzzles for gram in tangrams]
+    _assert_same(puzzle_array[-1], flat[-1])
+    assert [view.vertices for view in puzzle_array] == [gram.vertices for gram in flat]
+    with pytest.raises(IndexError):
+        puzzle_array[len(flat)]
+
+
+def test_from_source():
+    text = ''.join(r'\begin{EnvTangramTikz}' + '\n' + (EXAMPLES / f'{name}.tex').read_text() + '\n'
+                   + r'\end{EnvTangramTikz}' + '\n' for name in NAMES)
+    puzzle_array = PuzzleArray.from_source(io.StringIO(text))
+    expected = list(iter_environments(io.StringIO(text)))
+    assert puzzle_array.n_puzzles == len(expected) == 3
+    for views, tangrams in zip(puzzle_array.iter_puzzles(), expected):
+        for view, gram in zip(views, tangrams, strict=True):
+            _assert_same(view, gram)
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_puzzle_over_views(name):
+    expected = TangramPuzzle(EXAMPLES / f'{name}.tex')
+    puzzle = TangramPuzzle(tangrams=PuzzleArray.from_puzzles([expected.tangrams]).puzzle(0))
+    assert puzzle.transformations == expected.transformations
+    assert puzzle.outline == expected.outline
+    assert str(puzzle) == str(expected)
+
+
+def test_vertex_batch(puzzles):
+    puzzle_array = PuzzleArray.from_puzzles(puzzles)
+    batch = puzzle_array.vertex_batch()
+    assert batch.vertices() == [gram.vertices for tangrams in puzzles for gram in tangrams]
+    assert batch.puzzle_vertices(1) == [gram.vertices for gram in puzzles[1]]
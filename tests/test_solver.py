@@ -0,0 +1,98 @@
+"""
+Tests of the tangram solver on the outlines of the examples, on outlines
+with several or no solutions, and of reading outlines back from TeX.
+Run from the repository root:
+
+    python -m pytest -q tests/test_solver.py
+"""
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.analyser import TangramSolver, parse_expression, piece_lines, read_outline, solve
+from tangram.elements.tangram import TangramType
+from tangram.parser import LatexTangramParser
+from tangram.utils.boundary import outline
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+NAMES = ['kangaroo', 'cat', 'goose']
+SQRT2 = Number(0, 1)
+SQUARE = [(0, 0), (0, 2 * SQRT2), (2 * SQRT2, 2 * SQRT2), (2 * SQRT2, 0)]
+
+
+def _pieces(tangrams) -> list:
+    return sorted((gram.tangram_type.value, tuple(sorted(gram.vertices))) for gram in tangrams)
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_finds_example_solution(name):
+    puzzle = TangramPuzzle(EXAMPLES / f'{name}.tex')
+    solution = solve(puzzle.outline)
+    assert TangramPuzzle(tangrams=solution).outline == puzzle.outline
+    # The examples only have one solution, so it is the one they were drawn from
+    assert _pieces(solution) == _pieces(puzzle.tangrams)
+
+
+def test_outline_file():
+    target = read_outline(EXAMPLES / 'kangaroo_outline_on_grid.tex')
+    assert target == TangramPuzzle(EXAMPLES / 'kangaroo.tex').outline
+    solution = TangramSolver(EXAMPLES / 'kangaroo_outline_on_grid.tex').solve()
+    assert TangramPuzzle(tangrams=solution).outline == target
+
+
+def test_anticlockwise_target():
+    target = TangramPuzzle(EXAMPLES / 'cat.tex').outline
+    assert TangramPuzzle(tangrams=solve(target[::-1])).outline == target
+
+
+def test_every_solution():
+    solver = TangramSolver(SQUARE)
+    solutions = list(solver.iter_solutions())
+    assert len(solutions) == len({tuple(_pieces(solution)) for solution in solutions}) == 8
+    for solution in solutions:
+        assert sorted(gram.tangram_type.value for gram in solution) == \
+            sorted(tangram_type.value for tangram_type, count in solver.pieces.items() for _ in range(count))
+        assert TangramPuzzle(tangrams=solution).outline == outline([solver.target])
+
+
+def test_no_solution():
+    # Right area, but a strip one unit wide cannot fit the large triangles
+    strip = [(0, 0), (0, 1), (8, 1), (8, 0)]
+    solver = TangramSolver(strip)
+    assert solver.solve() is None
+    assert list(solver.iter_solutions()) == []
+    # Wrong area is rejected before searching
+    solver = TangramSolver([(0, 0), (0, 1), (1, 1), (1, 0)])
+    assert solver.solve() is None and solver.nodes == 0
+
+
+def test_custom_pieces():
+    solution = TangramSolver([(0, 0), (0, 2), (2, 2), (2, 0)], pieces={TangramType.TRIANGLE_LARGE: 2}).solve()
+    assert [gram.tangram_type for gram in solution] == [TangramType.TRIANGLE_LARGE] * 2
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_piece_lines_round_trip(name):
+    solution = solve(TangramPuzzle(EXAMPLES / f'{name}.tex').outline)
+    parsed = LatexTangramParser('\n'.join(piece_lines(solution))).parse()
+    assert _pieces(parsed) == _pieces(solution)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('2', Number(2)),
+    ('1.5 + 0.5 * sqrt(2)', Number(Fraction(3, 2), Fraction(1, 2))),
+    ('2-1/2*sqrt(2)', Number(2, Fraction(-1, 2))),
+    ('-sqrt(2)', Number(0, -1)),
+    ('1/3-2/3*sqrt(2)', Number(Fraction(1, 3), Fraction(-2, 3))),
+])
+def test_parse_expression(expression, expected):
+    assert parse_expression(expression) == expected
+
+
+@pytest.mark.parametrize('expression', ['x', '1 +', 'sqrt(3)', '2 * 3'])
+def test_parse_expression_errors(expression):
+    with pytest.raises(ValueError):
+        parse_expression(expression)
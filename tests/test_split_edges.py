@@ -0,0 +1,67 @@
+"""
+Tests that the grid indexed split_edges matches the quadratic splitter it
+replaced. Run from the repository root:
+
+    python -m pytest -q tests/test_split_edges.py
+"""
+from pathlib import Path
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.utils.boundary import PointGrid, point_on_segment, split_edges
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _naive_split_edges(boundaries):
+    edges = [(boundary[i], boundary[(i + 1) % len(boundary)]) for boundary in boundaries for i in range(len(boundary))]
+    points = set(p for edge in edges for p in edge)
+    result = []
+    for a, b in edges:
+        on_seg = sorted((p for p in points if p != a and p != b and point_on_segment(p, a, b)),
+                        key=lambda p: (p[0] - a[0])**2 + (p[1] - a[1])**2)
+        path = [a] + on_seg + [b]
+        result.extend(zip(path, path[1:]))
+    return result
+
+
+def _polygons(name: str, copies: int = 1) -> list:
+    tangrams = TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams
+    return [[(x + 3 * copy, y + Number(0, copy)) for x, y in gram.vertices]
+            for copy in range(copies) for gram in tangrams]
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+@pytest.mark.parametrize('cell_size', [None, 0.1, 1.0, 100.0])
+def test_matches_naive(name, cell_size):
+    polygons = _polygons(name)
+    assert split_edges(polygons, cell_size) == _naive_split_edges(polygons)
+
+
+def test_overlapping_copies():
+    # Copies shifted by less than their size touch and cross, giving many points on edges
+    polygons = _polygons('kangaroo', copies=6)
+    assert split_edges(polygons) == _naive_split_edges(polygons)
+
+
+def test_t_junction():
+    big = [(Number(0), Number(2)), (Number(2), Number(2)), (Number(2), Number(0)), (Number(0), Number(0))]
+    small = [(Number(2), Number(1)), (Number(3), Number(1)), (Number(3), Number(0)), (Number(2), Number(0))]
+    edges = split_edges([big, small])
+    assert ((Number(2), Number(2)), (Number(2), Number(1))) in edges
+    assert ((Number(2), Number(1)), (Number(2), Number(0))) in edges
+    assert ((Number(2), Number(2)), (Number(2), Number(0))) not in edges
+    assert len(edges) == 9
+
+
+def test_empty():
+    assert split_edges([]) == []
+
+
+def test_point_grid_long_segment():
+    points = [(Number(x), Number(0)) for x in range(5)] + [(Number(2), Number(1))]
+    grid = PointGrid(points, cell_size=0.01)
+    near = set(grid.near_segment(points[0], points[4], line=True))
+    assert near == set(points[:5])
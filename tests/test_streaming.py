@@ -0,0 +1,91 @@
+"""
+Tests of the streaming parser API: line numbers, environments, the
+pending-line cap and missing files. Run from the repository root:
+
+    python -m pytest -q tests/test_streaming.py
+"""
+from pathlib import Path
+import io
+import warnings
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.tangram import TangramType
+from tangram.generator import adversarial_documents
+from tangram.parser import LatexTangramParser, iter_environment_records, iter_environments, iter_tangrams
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+PIECE = r'\PieceTangram[TangSol]({0},{0}){TangCar}'
+SPLIT = '\\PieceTangram[TangSol]\n<rotate=90>\n({1},\n{0})\n{TangPetTri}'
+
+
+def _summary(tangrams) -> list:
+    return [(gram.tangram_type, gram.vertices, gram.line_number) for gram in tangrams]
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_matches_whole_text_parse(name):
+    path = EXAMPLES / f'{name}.tex'
+    expected = _summary(LatexTangramParser(path.read_text()).parse())
+    assert _summary(iter_tangrams(str(path))) == expected
+    with open(path) as file:
+        assert _summary(iter_tangrams(file)) == expected
+
+
+def test_adversarial_documents():
+    for kind, text, _ in adversarial_documents(seed=2):
+        assert _summary(iter_tangrams(io.StringIO(text))) == _summary(LatexTangramParser(text).parse()), kind
+
+
+def test_line_numbers():
+    text = '\n'.join(['% ' + PIECE, PIECE, '', SPLIT, 'text ' + PIECE + ' ' + PIECE])
+    tangrams = list(iter_tangrams(io.StringIO(text)))
+    assert [gram.line_number for gram in tangrams] == [2, 4, 9, 9]
+    assert tangrams[1].tangram_type == TangramType.TRIANGLE_SMALL and tangrams[1].rotate == 90
+
+
+def test_is_lazy():
+    file = io.StringIO(PIECE + '\n' + PIECE + '\n')
+    tangrams = iter_tangrams(file)
+    assert next(tangrams).line_number == 1
+    # The second line has not been read yet
+    assert file.tell() == len(PIECE) + 1
+
+
+def test_environments():
+    text = '\n'.join([PIECE, r'\begin{EnvTangramTikz}', PIECE, PIECE, r'\end{EnvTangramTikz}',
+                      r'\begin{EnvTangramTikz}', SPLIT, r'\end{EnvTangramTikz}'])
+    groups = list(iter_environments(io.StringIO(text)))
+    assert [len(group) for group in groups] == [1, 2, 1]
+    records = list(iter_environment_records(io.StringIO(text)))
+    assert [[record[3] for record in group] for group in records] == [[1], [3, 4], [7]]
+    assert [len(puzzle.tangrams) for puzzle in TangramPuzzle.iter_puzzles(io.StringIO(text))] == [1, 2, 1]
+
+
+def test_split_piece_within_cap():
+    text = '\\PieceTangram[TangSol]' + '\n' * 60 + '({0},{0}){TangCar}\n' + PIECE
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert [gram.line_number for gram in iter_tangrams(io.StringIO(text))] == [1, 62]
+
+
+def test_split_piece_past_cap_warns():
+    text = PIECE + '\n\\PieceTangram[TangSol]' + '\n' * 70 + '({0},{0}){TangCar}\n' + PIECE
+    with pytest.warns(RuntimeWarning, match='line 2'):
+        tangrams = list(iter_tangrams(io.StringIO(text)))
+    assert [gram.line_number for gram in tangrams] == [1, 73]
+
+
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        list(iter_tangrams(str(EXAMPLES / 'missing.tex')))
+    with pytest.raises(FileNotFoundError):
+        TangramPuzzle(EXAMPLES / 'missing.tex')
+
+
+def test_empty_puzzle():
+    puzzle = TangramPuzzle(io.StringIO('no pieces here\n'))
+    assert puzzle.tangrams == []
+    with pytest.raises(ValueError, match='no tangram pieces'):
+        puzzle.grid_size
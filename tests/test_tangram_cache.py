@@ -0,0 +1,69 @@
+"""
+Tests that the values cached on Tangram and TangramPuzzle are dropped when
+the transforms, base coordinates or pieces change. Run from the repository root:
+
+    python -m pytest -q tests/test_tangram_cache.py
+"""
+from pathlib import Path
+import pickle
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.tangram import Tangram, TangramType
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _fresh(tangram_type, rotate=0, xflip=False, yflip=False, base_coords=(0, 0)) -> Tangram:
+    params = {'rotate': rotate, 'xscale': -1 if xflip else 1, 'yscale': -1 if yflip else 1}
+    return Tangram(tangram_type, params, base_coords)
+
+
+def _warm(gram: Tangram) -> Tangram:
+    gram.vertices, gram._grid, gram.transformations
+    return gram
+
+
+@pytest.mark.parametrize('name, value', [('rotate', 90), ('xflip', True), ('yflip', True)])
+def test_assigning_a_transform(name, value):
+    gram = _warm(Tangram(TangramType.PARALLELOGRAM, {}, (1, 2)))
+    setattr(gram, name, value)
+    expected = _fresh(TangramType.PARALLELOGRAM, base_coords=(1, 2), **{name: value})
+    assert gram.vertices == expected.vertices
+    assert gram._grid == expected._grid
+    assert gram.transformations == expected.transformations
+
+
+def test_transforms_and_base_coords():
+    gram = _warm(Tangram(TangramType.TRIANGLE_LARGE, {}))
+    gram.transforms({'rotate': 135, 'xscale': -1})
+    assert gram.vertices == _fresh(TangramType.TRIANGLE_LARGE, 135, True).vertices
+    assert gram.transformations == {'xflip': True, 'yflip': False, 'rotate': 135}
+    gram.base_coords = (Number(0, 1), 3)
+    assert gram.vertices == _fresh(TangramType.TRIANGLE_LARGE, 135, True, base_coords=(Number(0, 1), 3)).vertices
+
+
+def test_restore_and_pickle():
+    gram = _warm(_fresh(TangramType.TRIANGLE_MEDIUM, 225, yflip=True, base_coords=(2, 1)))
+    restored = Tangram._restore(gram.tangram_type, gram.rotate, gram.xflip, gram.yflip, gram.base_coords)
+    assert restored.vertices == gram.vertices
+    restored.rotate = 0
+    assert restored.vertices == _fresh(TangramType.TRIANGLE_MEDIUM, 0, yflip=True, base_coords=(2, 1)).vertices
+    copy = pickle.loads(pickle.dumps(gram))
+    assert (copy.rotate, copy.xflip, copy.yflip, copy.vertices) == (225, False, True, gram.vertices)
+
+
+def test_puzzle_invalidate():
+    puzzle = TangramPuzzle(EXAMPLES / 'cat.tex')
+    before = puzzle.outline, puzzle.transformations, puzzle.grid_size
+    puzzle.tangrams[0].rotate = (puzzle.tangrams[0].rotate + 90) % 360
+    # The puzzle keeps its own values until told the pieces changed
+    assert (puzzle.outline, puzzle.transformations, puzzle.grid_size) == before
+    puzzle.invalidate()
+    assert puzzle.transformations == TangramPuzzle(tangrams=puzzle.tangrams).transformations != before[1]
+    assert puzzle.outline != before[0]
+
+    puzzle.tangrams = TangramPuzzle(EXAMPLES / 'cat.tex').tangrams
+    assert (puzzle.outline, puzzle.transformations, puzzle.grid_size) == before
@@ -0,0 +1,83 @@
+"""
+Tests of validate() on the examples and on layouts with wrong counts,
+overlaps and holes. Run from the repository root:
+
+    python -m pytest -q tests/test_validator.py
+"""
+from fractions import Fraction
+from pathlib import Path
+import random
+
+import pytest
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.tangram import Tangram, TangramType
+from tangram.generator import random_arrangement
+from tangram.parser import LatexTangramParser
+from tangram.utils.coords import Number
+from tangram.validator import validate
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _square(x, y, rotate: int = 0) -> Tangram:
+    return Tangram(TangramType.SQUARE, {'rotate': rotate, 'xscale': 0, 'yscale': 0}, (Number(x), Number(y)))
+
+
+def _kinds(diagnostics) -> list[str]:
+    return [diagnostic.kind for diagnostic in diagnostics]
+
+
+@pytest.mark.parametrize('name', ['kangaroo', 'cat', 'goose'])
+def test_examples_are_valid(name):
+    assert TangramPuzzle(EXAMPLES / f'{name}.tex').validate() == []
+
+
+def test_generated_arrangement_is_valid():
+    assert validate(random_arrangement(random.Random(3))) == []
+
+
+def test_missing_and_extra_pieces():
+    diagnostics = validate([_square(0, 0), _square(1, 0)])
+    counts = {diagnostic.message for diagnostic in diagnostics if diagnostic.kind == 'count'}
+    assert f'expected 1 {TangramType.SQUARE} piece(s), found 2' in counts
+    assert f'expected 2 {TangramType.TRIANGLE_LARGE} piece(s), found 0' in counts
+
+
+def test_overlap():
+    diagnostics = validate([_square(0, 0), _square(Fraction(1, 2), 0)], {TangramType.SQUARE: 2})
+    assert _kinds(diagnostics) == ['overlap']
+    assert diagnostics[0].pieces == (0, 1)
+    assert diagnostics[0].area == Fraction(1, 2)
+
+
+def test_overlap_of_rotated_piece():
+    diagnostics = validate([_square(0, 0), _square(Fraction(1, 2), 0, rotate=45)], {TangramType.SQUARE: 2})
+    assert _kinds(diagnostics) == ['overlap']
+    assert diagnostics[0].area > 0
+
+
+@pytest.mark.parametrize('x, y', [(1, 0), (0, 1), (1, 1)])
+def test_touching_is_not_overlap(x, y):
+    assert validate([_square(0, 0), _square(x, y)], {TangramType.SQUARE: 2}) == []
+
+
+def test_hole():
+    # A ring of eight squares round an empty middle one
+    ring = [_square(x, y) for x in range(3) for y in range(3) if (x, y) != (1, 1)]
+    diagnostics = validate(ring, {TangramType.SQUARE: 8})
+    assert _kinds(diagnostics) == ['hole']
+    assert diagnostics[0].area == 1
+
+
+def test_disconnected():
+    diagnostics = validate([_square(0, 0), _square(3, 0)], {TangramType.SQUARE: 2})
+    assert _kinds(diagnostics) == ['disconnected']
+
+
+def test_line_numbers_are_reported():
+    text = '\n'.join([r'\PieceTangram[TangSol]({0},{0}){TangCar}', '',
+                      r'\PieceTangram[TangSol]({0.5},{0.5}){TangCar}'])
+    diagnostics = validate(LatexTangramParser(text).parse(), {TangramType.SQUARE: 2})
+    assert _kinds(diagnostics) == ['overlap']
+    assert diagnostics[0].line_numbers == (1, 3)
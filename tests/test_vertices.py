@@ -0,0 +1,50 @@
+"""
+Tests that VertexBatch gives the same vertices as Tangram.vertices.
+Run from the repository root:
+
+    python -m pytest -q tests/test_vertices.py
+"""
+from fractions import Fraction
+from pathlib import Path
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from tangram.TangramPuzzle import TangramPuzzle
+from tangram.elements.tangram import Tangram, TangramType, rotation_values
+from tangram.elements.vertices import VertexBatch
+from tangram.utils.coords import Number
+
+EXAMPLES = Path(__file__).resolve().parents[1] / 'examples'
+
+
+def _every_orientation() -> list[Tangram]:
+    coords = [Number(0), Number(Fraction(-3, 2), 1), Number(2, Fraction(1, 2)), Number(Fraction(1, 3))]
+    rng = random.Random(0)
+    return [Tangram(tangram_type, {'rotate': rotate, 'xscale': -1 if xflip else 0, 'yscale': -1 if yflip else 0},
+                    (rng.choice(coords), rng.choice(coords)))
+            for tangram_type in TangramType for rotate in rotation_values
+            for xflip in (False, True) for yflip in (False, True)]
+
+
+def test_every_orientation():
+    tangrams = _every_orientation()
+    batch = VertexBatch.from_tangrams(tangrams)
+    assert len(batch) == len(tangrams)
+    assert batch.vertices() == [gram.vertices for gram in tangrams]
+
+
+def test_puzzles():
+    puzzles = [TangramPuzzle(EXAMPLES / f'{name}.tex').tangrams for name in ('kangaroo', 'cat', 'goose')]
+    batch = VertexBatch.from_puzzles(puzzles)
+    for idx, tangrams in enumerate(puzzles):
+        assert batch.puzzle_vertices(idx) == [gram.vertices for gram in tangrams]
+
+
+def test_shared_denominator():
+    tangrams = _every_orientation()
+    batch = VertexBatch.from_tangrams(tangrams)
+    assert batch.denominator % 6 == 0
+    assert batch.a.shape == batch.b.shape == (len(tangrams), 4, 2)
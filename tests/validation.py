@@ -21,7 +21,7 @@ with open('tests/expected_outputs.json', 'w') as file:
 """
 
 
-sys.path.append((Path.cwd()).__str__())
+sys.path.append(Path(__file__).resolve().parents[1].__str__())
 
 from tangram.TangramPuzzle import *
 